@@ -1,9 +1,6 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
@@ -11,12 +8,11 @@ import time
 import getpass
 import os
 
+from ismisDriver import LazyDriver
+from ismisSession import BASE_URL
+
 # Configurations
-options = Options()
-options.headless = False  # Runs browser visibly
-options.add_experimental_option("excludeSwitches", ["enable-logging"])  # Disables DevTools logs
-ser = Service("./chromedriver.exe")
-browser = webdriver.Chrome(service=ser, options=options)
+browser = LazyDriver()  # Chrome is only launched the first time a function uses the browser
 
 clear = lambda: os.system('cls' if os.name == 'nt' else 'clear')  # Clears terminal
 
@@ -66,7 +62,7 @@ def check_site_crash_after_login():
 
 def login_attempt(username_input, password_input):
     """Attempts to log into the ISMIS website."""
-    browser.get("https://ismis.usc.edu.ph")
+    browser.get(BASE_URL)
 
     # Ensure the login page is loaded properly
     while check_site_crash_login_page():
@@ -248,7 +244,7 @@ def press_advised_course():
 
 def navigate_to_block_advising():
     """Navigates to the Block Advising section."""
-    browser.get("https://ismis.usc.edu.ph/advisedcourse")
+    browser.get(f"{BASE_URL}/advisedcourse")
 
     # Ensure the page is loaded
     while check_site_crash_after_login():
@@ -260,7 +256,7 @@ def navigate_to_block_advising():
 
 def navigate_to_view_lacking():
     """Navigates to the View Lacking section."""
-    browser.get("https://ismis.usc.edu.ph/advisedcourse")
+    browser.get(f"{BASE_URL}/advisedcourse")
 
     # Ensure the page is loaded
     while check_site_crash_after_login():
@@ -273,7 +269,7 @@ def navigate_to_view_lacking():
     
 def navigate_to_advise_course():
     """Navigates to the Advised Course section and verifies it has loaded properly."""
-    browser.get("https://ismis.usc.edu.ph/advisedcourse")
+    browser.get(f"{BASE_URL}/advisedcourse")
 
     # Ensure the page is loaded
     while check_site_crash_after_login():
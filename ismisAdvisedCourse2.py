@@ -1,9 +1,6 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
@@ -11,12 +8,26 @@ import time
 import getpass
 import os
 
+from ismisDriver import LazyDriver, create_driver
+from ismisSession import BASE_URL, http_login, copy_cookies_to_browser
+from ismisTrace import tracer
+from ismisExtract import extract_schedule_rows, print_schedule_rows
+from ismisPool import fetch_schedules
+from ismisAsyncAdvise import advise_courses, print_advise_outcomes
+from ismisModal import ModalState, FINAL_STATES, RETRY_STATES, handle_modal, modal_timings
+from ismisCapture import ModalResponseCapture, handle_captured_modal
+
 # Configurations
-options = Options()
-options.headless = False  # Runs browser visibly
-options.add_experimental_option("excludeSwitches", ["enable-logging"])  # Disables DevTools logs
-ser = Service("./chromedriver.exe")
-browser = webdriver.Chrome(service=ser, options=options)
+USE_HTTP_LOGIN = True  # Logs in over plain HTTP first, the browser form is only a fallback
+USE_NETWORK_CAPTURE = True  # Reads advise outcomes from the AJAX responses instead of polling #modal2Body
+ADVISE_COURSES = ["CPE 2301", "CPE 2302", "CPE 2303L"]  # Courses to advise, e.g. "CPE 2303L" or "GE-FEL ESUR"
+ADVISE_CONCURRENCY = 4  # Number of advise requests in flight at the same time
+GE_FEL_SLOT = "GE-FREELEC 2"  # GE-FEL courses are opened from this free elective slot
+SCHEDULE_COURSES = ["CPE 2301", "CPE 2302", "CPE 2303L"]  # Courses whose schedules are printed after advising
+SCHEDULE_PARALLELISM = 3  # Number of browsers fetching schedules at the same time
+browser = LazyDriver(lambda: create_driver(capture_network=USE_NETWORK_CAPTURE))  # Chrome is only launched the first time a function uses the browser
+http_session = None  # Set when the HTTP login succeeds
+modal_capture = None  # ModalResponseCapture once first used, False when the driver cannot capture
 
 clear = lambda: os.system('cls' if os.name == 'nt' else 'clear')  # Clears terminal
 
@@ -39,8 +50,10 @@ def load_credentials(file_path="credentials.txt"):
         return username, password
 
 
+@tracer.traced()
 def wait_for_element(by, identifier, timeout=5):
     """Waits for an element to be present."""
+    tracer.annotate(selector=identifier)
     return WebDriverWait(browser, timeout).until(EC.presence_of_element_located((by, identifier)))
 
 
@@ -64,12 +77,13 @@ def check_site_crash_after_login():
         return True  # Crash detected
 
 
+@tracer.traced()
 def login_attempt(username_input, password_input):
     """Attempts to log into the ISMIS website with retry logic for connection timeouts."""
     while True:
         try:
             print("Attempting to load ISMIS website...")
-            browser.get("https://ismis.usc.edu.ph")
+            browser.get(BASE_URL)
 
             # Wait for the login button to appear
             while check_site_crash_login_page():
@@ -99,6 +113,7 @@ def login_attempt(username_input, password_input):
                 print(f"An unexpected WebDriver error occurred: {e}")
             time.sleep(5)  # Wait briefly before retrying
 
+@tracer.traced()
 def navigate_to_page_with_retry(url, element_selector):
     """Navigates to a given URL with retry logic for connection timeouts and missing elements."""
     while True:
@@ -122,6 +137,22 @@ def navigate_to_page_with_retry(url, element_selector):
                 print(f"An unexpected WebDriver error occurred: {e}")
             time.sleep(5)
 
+@tracer.traced()
+def http_login_to_browser(username_input, password_input):
+    """Logs in over plain HTTP and hands the cookies to the browser. Returns False if browser login is still needed."""
+    global http_session
+    try:
+        session = http_login(username_input, password_input)
+    except Exception as e:
+        print(f"HTTP login failed ({e}). Falling back to browser login...")
+        return False
+    if session is None:
+        return False
+    http_session = session
+    copy_cookies_to_browser(session, browser)
+    return True
+
+@tracer.traced()
 def check_valid_login():
     """Checks if the login is successful."""
     try:
@@ -134,6 +165,7 @@ def check_valid_login():
         return True
 
 
+@tracer.traced()
 def press_block_advising():
     """Presses the Block Advising button, handles modal issues for 'undefined' or stuck states, and retries indefinitely."""
     while True:
@@ -166,41 +198,15 @@ def press_block_advising():
         except TimeoutException:
             print("Error: Block Section List did not load properly. Retrying...")
 
-        except WebDriverException as e:
+        except WebDriverException:
             # Handle potential modal issues
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal1")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal1Body").text.strip()
-                    
-                    if "undefined" in modal_body:
-                        # Close modal immediately for "undefined"
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    
-                    if "... i'm still processing your request :)" in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    
-                    if "... loading ..." in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+            if handle_modal(browser, "#modal1") in RETRY_STATES:
+                continue
 
         time.sleep(2)  # Brief delay before retrying
 
 
+@tracer.traced()
 def press_view_lacking():
     """Presses the View Lacking button."""
     try:
@@ -217,6 +223,7 @@ def press_view_lacking():
         print("Error: View Lacking button not found.")
 
 
+@tracer.traced()
 def press_advised_course():
     """Presses the Advised Course button, handles modal issues for 'undefined' or stuck states, and retries indefinitely."""
     while True:
@@ -238,40 +245,14 @@ def press_advised_course():
         except TimeoutException:
             print("Error: Advised Course content did not load properly. Retrying...")
 
-        except WebDriverException as e:
+        except WebDriverException:
             # Handle potential modal issues
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal1")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal1Body").text.strip()
-                    
-                    if "undefined" in modal_body:
-                        # Close modal immediately for "undefined"
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    
-                    if "... i'm still processing your request :)" in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    
-                    if "... loading ..." in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+            if handle_modal(browser, "#modal1") in RETRY_STATES:
+                continue
 
         time.sleep(2)  # Brief delay before retrying
         
+@tracer.traced()
 def press_GE_FEL2():
     """Presses the GE_FEL2 button, handles modal issues for 'undefined' or stuck states, and retries indefinitely."""
     while True:
@@ -293,40 +274,14 @@ def press_GE_FEL2():
         except TimeoutException:
             print("Error: GE-FEL 2 Course content did not load properly. Retrying...")
 
-        except WebDriverException as e:
+        except WebDriverException:
             # Handle potential modal issues
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    
-                    if "undefined" in modal_body:
-                        # Close modal immediately for "undefined"
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    
-                    if "... i'm still processing your request :)" in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    
-                    if "... loading ..." in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+            if handle_modal(browser, "#modal2") in RETRY_STATES:
+                continue
 
         time.sleep(2)  # Brief delay before retrying        
 
+@tracer.traced()
 def press_GE_FEL3():
     """Presses the GE_FEL3 button, handles modal issues for 'undefined' or stuck states, and retries indefinitely."""
     while True:
@@ -348,40 +303,14 @@ def press_GE_FEL3():
         except TimeoutException:
             print("Error: GE-FEL 3 Course content did not load properly. Retrying...")
 
-        except WebDriverException as e:
+        except WebDriverException:
             # Handle potential modal issues
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    
-                    if "undefined" in modal_body:
-                        # Close modal immediately for "undefined"
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    
-                    if "... i'm still processing your request :)" in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    
-                    if "... loading ..." in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+            if handle_modal(browser, "#modal2") in RETRY_STATES:
+                continue
 
         time.sleep(2)  # Brief delay before retrying     
 
+@tracer.traced()
 def advise_ge_fel_course(timeout=10):
     """
     Continuously tries to press a GE-FEL button until the modal with "Successfully advised course" appears.
@@ -430,133 +359,31 @@ def advise_ge_fel_course(timeout=10):
                 button.click()
                 print(f"Attempting to advise course: GE-FEL {selected_course} - {course_title}...")
 
-                success_modal = wait_for_element(By.CSS_SELECTOR, "#modal2Body", timeout)
-                modal_text = success_modal.text
-
-                # Handle "Student has already taken and passed GE-FEL ____"
-                if "Student has already taken and passed GE-FEL" in modal_text:
-                    print(modal_text)
-                    try:
-                        modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                    except Exception:
-                        pass
-                    return
-
-                if "Successfully advised course" in modal_text:
-                    print(f"Successfully advised course: GE-FEL {selected_course} - {course_title}.")
-                    try:
-                        modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                    except Exception:
-                        pass
-                    return
-                if "Course already been advised!" in modal_text:
-                    print(f"Course already been advised!")
-                    try:
-                        modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                    except Exception:
-                        pass
-                    return
-                if "Student has reached the maximum number of units allowed for the term." in modal_text:
-                    print("Maximum units reached for the term. Ending advise for GE-FEL course.")
-                    try:
-                        modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                    except Exception:
-                        pass
-                    return
-                if "Cannot advise course equivalent due to course schedule not available" in modal_text:
-                    print("Cannot advise course: schedule not available. Please select another GE-FEL course.")
-                    try:
-                        modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                    except Exception:
-                        pass
+                wait_for_element(By.CSS_SELECTOR, "#modal2Body", timeout)
+                state = handle_modal(browser, "#modal2", f"GE-FEL {selected_course}")
+                if state is ModalState.SCHEDULE_UNAVAILABLE:
+                    print("Please select another GE-FEL course.")
                     break  # Break inner loop, re-prompt user
+                if state in FINAL_STATES:
+                    return
             except TimeoutException:
-                try:
-                    modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                    if modal.is_displayed():
-                        modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                        if "Student has already taken and passed GE-FEL" in modal_body:
-                            print(modal_body)
-                            try:
-                                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                                close_btn.click()
-                            except Exception:
-                                pass
-                            return
-                        if "Successfully advised course" in modal_body:
-                            print(f"Successfully advised course: GE-FEL {selected_course} - {course_title}. (Timeout branch)")
-                            try:
-                                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                                close_btn.click()
-                            except Exception:
-                                pass
-                            return
-                        if "Course already been advised!" in modal_body:
-                            print(f"Course already been advised! (Timeout branch)")
-                            try:
-                                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                                close_btn.click()
-                            except Exception:
-                                pass
-                            return
-                        if "Student has reached the maximum number of units allowed for the term." in modal_body:
-                            print("Maximum units reached for the term. (Timeout branch)")
-                            try:
-                                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                                close_btn.click()
-                            except Exception:
-                                pass
-                            return
-                        if "Cannot advise course equivalent due to course schedule not available" in modal_body:
-                            print("Cannot advise course: schedule not available. Please select another GE-FEL course. (Timeout branch)")
-                            try:
-                                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                                close_btn.click()
-                            except Exception:
-                                pass
-                            time.sleep(2)  # Wait before retrying
-                            press_GE_FEL2()  # Retry with GE-FEL 2 i dont think it matters which ge_fel since its the same course.
-                            break
-                except Exception:
-                    pass
+                state = handle_modal(browser, "#modal2", f"GE-FEL {selected_course}")
+                if state is ModalState.SCHEDULE_UNAVAILABLE:
+                    print("Please select another GE-FEL course. (Timeout branch)")
+                    time.sleep(2)  # Wait before retrying
+                    press_GE_FEL2()  # Retry with GE-FEL 2 i dont think it matters which ge_fel since its the same course.
+                    break
+                if state in FINAL_STATES:
+                    return
                 print("Error: Free Elective Course content did not load properly. Retrying...")
-            except WebDriverException as e:
-                try:
-                    modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                    if modal.is_displayed():
-                        modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                        if "undefined" in modal_body:
-                            print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                            ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                            print("Modal closed due to 'undefined'. Retrying immediately...")
-                            continue
-                        if "... i'm still processing your request :)" in modal_body:
-                            print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                            time.sleep(10)
-                            ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                            print("Modal closed after 10-second wait. Retrying...")
-                            continue
-                        if "... loading ..." in modal_body:
-                            print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                            time.sleep(20)
-                            ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                            print("Modal closed after 20-second wait. Retrying...")
-                            continue
-                except Exception as modal_error:
-                    print(f"Error while handling modal: {modal_error}")
+            except WebDriverException:
+                # Handle potential modal issues
+                if handle_modal(browser, "#modal2") in RETRY_STATES:
+                    continue
             time.sleep(2)
         # If we reach here, it means the course could not be advised due to schedule not available, so re-prompt
 
+@tracer.traced()
 def schedule_ge_fel_course(timeout=10):
     """
     Prints all available schedule details for a selected GE-FEL course, with robust modal and retry logic.
@@ -618,446 +445,149 @@ def schedule_ge_fel_course(timeout=10):
                 EC.presence_of_element_located((By.ID, "EnrollBody"))
             )
             print("Schedule loaded successfully.")
-            schedule_sections = browser.find_elements(By.CSS_SELECTOR, "#EnrollBody tr")
+            schedule_sections = extract_schedule_rows(browser)
             if not schedule_sections:
                 print(f"No schedule details found for GE-FEL {selected_course}.")
                 ActionChains(browser).send_keys(Keys.ESCAPE).perform()
                 break
-            for schedule_section in schedule_sections:
-                try:
-                    block_number = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(1)").text.strip()
-                    course_code = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(2)").text.strip()
-                    schedule_details = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(3) span").text.strip()
-                    course_status = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(4)").text.strip()
-                    population = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(5)").text.strip()
-                    link_element = schedule_section.find_element(By.CSS_SELECTOR, "a.green.rs-modal")
-                    link = link_element.get_attribute("href")
-                    print(f"Block #: {block_number}")
-                    print(f"Course Code: {course_code}")
-                    print(f"Schedule: {schedule_details}")
-                    print(f"Course Status: {course_status}")
-                    print(f"Population: {population}")
-                    print(f"Link: {link}")
-                    print("-" * 40)
-                except Exception:
-                    print("A schedule row was missing expected details and was skipped.")
+            print_schedule_rows(schedule_sections)
             ActionChains(browser).send_keys(Keys.ESCAPE).perform()
             break
         except TimeoutException:
             print("Error: GE-FEL Schedule content did not load properly. Retrying...")
-        except WebDriverException as e:
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal1")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal1Body").text.strip()
-                    if "undefined" in modal_body:
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    if "... i'm still processing your request :)" in modal_body:
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    if "... loading ..." in modal_body:
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+        except WebDriverException:
+            # Handle potential modal issues
+            if handle_modal(browser, "#modal1") in RETRY_STATES:
+                continue
         time.sleep(2)
 
-def advise_CPE_2301(timeout=10):
+def get_modal_capture():
+    """Returns the browser's ModalResponseCapture, or None when network capture is off or unavailable."""
+    global modal_capture
+    if not USE_NETWORK_CAPTURE or modal_capture is False:
+        return None
+    if modal_capture is None:
+        capture = ModalResponseCapture(browser)
+        modal_capture = capture if capture.start() else False
+    return modal_capture or None
+
+
+def show_button_selector(course_code):
+    """Selector of the plus button that opens a course in #modal2. GE-FEL courses are listed under a GE-FREELEC slot."""
+    if course_code.startswith("GE-FEL"):
+        return f"a.green.rs-modal[title*='{GE_FEL_SLOT}']"
+    return f"a.green.rs-modal[title*='Click to show course to be advised{course_code}']"
+
+
+@tracer.traced()
+def advise_course_code(course_code, timeout=10, max_retries=20):
     """
-    Presses the plus button for CPE 2301 and then presses the 'Click to advise course' button, handling modal errors and retrying as needed.
-    Handles 'Course already been advised!' and pre-requisite errors as a success state.
+    Presses the plus button for a course and then its 'Click to advise course' button, handling modal errors and retrying as needed.
+    Expects the 'Remaining Courses To Be Advised' modal to be open and leaves it open.
+    Returns the ModalState of the outcome, or ModalState.NOT_FOUND if the course could not be opened.
     """
-    show_button_selector = "a.green.rs-modal[title*='Click to show course to be advisedCPE 2301']"
-    advise_button_selector = "a.green.rs-modal[title*='Click to advise course CPE 2301']"
+    advise_button_selector = f"a.green.rs-modal[title*='Click to advise course {course_code}']"
+    tracer.annotate(course_code=course_code)
+    retries = 0
     # Step 1: Press the plus button to open the modal
     while True:
+        if retries >= max_retries:
+            print(f"Giving up on {course_code} after {max_retries} retries.")
+            tracer.annotate(state=ModalState.NOT_FOUND, retries=retries)
+            return ModalState.NOT_FOUND
         try:
-            show_button = wait_for_element(By.CSS_SELECTOR, show_button_selector, timeout)
+            show_button = wait_for_element(By.CSS_SELECTOR, show_button_selector(course_code), timeout)
             show_button.click()
-            print("Opened modal for CPE 2301.")
+            print(f"Opened modal for {course_code}.")
             break
         except TimeoutException:
-            print("Error: CPE 2301 show button did not load properly. Retrying...")
-        except WebDriverException as e:
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    if "undefined" in modal_body:
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    if "... i'm still processing your request :)" in modal_body:
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    if "... loading ..." in modal_body:
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+            print(f"Error: {course_code} show button did not load properly. Retrying...")
+        except WebDriverException:
+            # Handle potential modal issues
+            if handle_modal(browser, "#modal2") in RETRY_STATES:
+                retries += 1
+                continue
+        retries += 1
         time.sleep(2)
     # Step 2: Press the 'Click to advise course' button
     while True:
+        if retries >= max_retries:
+            print(f"Giving up on {course_code} after {max_retries} retries.")
+            tracer.annotate(state=ModalState.NOT_FOUND, retries=retries)
+            return ModalState.NOT_FOUND
         try:
             advise_button = wait_for_element(By.CSS_SELECTOR, advise_button_selector, timeout)
+            capture = get_modal_capture()
+            since = capture.mark() if capture else None
             advise_button.click()
-            print("Pressed 'Click to advise course' for CPE 2301.")
+            print(f"Pressed 'Click to advise course' for {course_code}.")
+            if capture:
+                # The outcome is known as soon as the advise response arrives, before the modal renders it
+                state = handle_captured_modal(browser, capture, since, "#modal2", course_code, timeout)
+                if state in FINAL_STATES:
+                    tracer.annotate(state=state, retries=retries)
+                    return state
+                if state in RETRY_STATES:
+                    retries += 1
+                    continue
             # Check for success, already advised, max units, or pre-req error
-            success_modal = wait_for_element(By.CSS_SELECTOR, "#modal2Body", timeout)
-            modal_text = success_modal.text
-            if "Successfully advised course." in modal_text:
-                print("Successfully advised course for CPE 2301.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after success
-            if "Course already been advised!" in modal_text:
-                print("Course already been advised for CPE 2301.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after already advised
-            if "Student has reached the maximum number of units allowed for the term." in modal_text:
-                print("Maximum units reached for the term. Ending advise for CPE 2301.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after max units
-            if "Student has not taken or passed the pre-requisite courses of" in modal_text:
-                print("Pre-requisite courses not taken or passed for CPE 2301.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after pre-req error
+            wait_for_element(By.CSS_SELECTOR, "#modal2Body", timeout)
+            state = handle_modal(browser, "#modal2", course_code)
+            if state in FINAL_STATES:
+                tracer.annotate(state=state, retries=retries)
+                return state
         except TimeoutException:
             # Check if modal is already showing success, already advised, max units, or pre-req error
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    if "Successfully advised course." in modal_body:
-                        print("Successfully advised course for CPE 2301. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-                    if "Course already been advised!" in modal_body:
-                        print("Course already been advised for CPE 2301. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-                    if "Student has reached the maximum number of units allowed for the term." in modal_body:
-                        print("Maximum units reached for the term. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-                    if "Student has not taken or passed the pre-requisite courses of" in modal_body:
-                        print("Pre-requisite courses not taken or passed for CPE 2301. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-            except Exception:
-                pass
-            print("Error: CPE 2301 advise button did not load properly. Retrying...")
-        except WebDriverException as e:
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    if "undefined" in modal_body:
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    if "... i'm still processing your request :)" in modal_body:
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    if "... loading ..." in modal_body:
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+            state = handle_modal(browser, "#modal2", course_code)
+            if state in FINAL_STATES:
+                tracer.annotate(state=state, retries=retries)
+                return state
+            print(f"Error: {course_code} advise button did not load properly. Retrying...")
+        except WebDriverException:
+            # Handle potential modal issues
+            if handle_modal(browser, "#modal2") in RETRY_STATES:
+                retries += 1
+                continue
+        retries += 1
         time.sleep(2)
 
-def advise_CPE_2302(timeout=10):
+
+@tracer.traced()
+def advise_course_codes(course_codes, timeout=10):
     """
-    Presses the plus button for CPE 2302 and then presses the 'Click to advise course' button, handling modal errors and retrying as needed.
-    Handles 'Course already been advised!' and pre-requisite errors as a success state.
+    Advises every course in course_codes (e.g. "CPE 2301", "CPE 2303L", "GE-FEL ESUR") while the
+    'Remaining Courses To Be Advised' modal stays open. Only #modal2 is closed between courses.
+    Returns a dict of course code to ModalState.
     """
-    show_button_selector = "a.green.rs-modal[title*='Click to show course to be advisedCPE 2302']"
-    advise_button_selector = "a.green.rs-modal[title*='Click to advise course CPE 2302']"
-    # Step 1: Press the plus button to open the modal
-    while True:
-        try:
-            show_button = wait_for_element(By.CSS_SELECTOR, show_button_selector, timeout)
-            show_button.click()
-            print("Opened modal for CPE 2302.")
+    outcomes = {}
+    for course_code in course_codes:
+        outcomes[course_code] = advise_course_code(course_code, timeout)
+        if outcomes[course_code] is ModalState.MAX_UNITS:
+            print("Maximum units reached for the term. Skipping the remaining courses.")
             break
-        except TimeoutException:
-            print("Error: CPE 2302 show button did not load properly. Retrying...")
-        except WebDriverException as e:
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    if "undefined" in modal_body:
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    if "... i'm still processing your request :)" in modal_body:
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    if "... loading ..." in modal_body:
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
-        time.sleep(2)
-    # Step 2: Press the 'Click to advise course' button
-    while True:
         try:
-            advise_button = wait_for_element(By.CSS_SELECTOR, advise_button_selector, timeout)
-            advise_button.click()
-            print("Pressed 'Click to advise course' for CPE 2302.")
-            # Check for success, already advised, max units, or pre-req error
-            success_modal = wait_for_element(By.CSS_SELECTOR, "#modal2Body", timeout)
-            modal_text = success_modal.text
-            if "Successfully advised course." in modal_text:
-                print("Successfully advised course for CPE 2302.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after success
-            if "Course already been advised!" in modal_text:
-                print("Course already been advised for CPE 2302.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after already advised
-            if "Student has reached the maximum number of units allowed for the term." in modal_text:
-                print("Maximum units reached for the term. Ending advise for CPE 2302.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after max units
-            if "Student has not taken or passed the pre-requisite courses of" in modal_text:
-                print("Pre-requisite courses not taken or passed for CPE 2302.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after pre-req error
+            # Continue as soon as #modal2 is closed instead of sleeping a fixed 2 seconds
+            WebDriverWait(browser, timeout).until(EC.invisibility_of_element_located((By.ID, "modal2")))
         except TimeoutException:
-            # Check if modal is already showing success, already advised, max units, or pre-req error
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    if "Successfully advised course." in modal_body:
-                        print("Successfully advised course for CPE 2302. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-                    if "Course already been advised!" in modal_body:
-                        print("Course already been advised for CPE 2302. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-                    if "Student has reached the maximum number of units allowed for the term." in modal_body:
-                        print("Maximum units reached for the term. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-                    if "Student has not taken or passed the pre-requisite courses of" in modal_body:
-                        print("Pre-requisite courses not taken or passed for CPE 2302. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-            except Exception:
-                pass
-            print("Error: CPE 2302 advise button did not load properly. Retrying...")
-        except WebDriverException as e:
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    if "undefined" in modal_body:
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    if "... i'm still processing your request :)" in modal_body:
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    if "... loading ..." in modal_body:
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
-        time.sleep(2)
+            print("Course modal did not close. Continuing anyway...")
+    return outcomes
+
+
+def advise_CPE_2301(timeout=10):
+    """Advises CPE 2301. Kept for older call sites, see advise_course_code."""
+    return advise_course_code("CPE 2301", timeout)
+
+
+def advise_CPE_2302(timeout=10):
+    """Advises CPE 2302. Kept for older call sites, see advise_course_code."""
+    return advise_course_code("CPE 2302", timeout)
+
 
 def advise_CPE_2303L(timeout=10):
-    """
-    Presses the plus button for CPE 2303L and then presses the 'Click to advise course' button, handling modal errors and retrying as needed.
-    Handles 'Course already been advised!' and pre-requisite errors as a success state.
-    """
-    show_button_selector = "a.green.rs-modal[title*='Click to show course to be advisedCPE 2303L']"
-    advise_button_selector = "a.green.rs-modal[title*='Click to advise course CPE 2303L']"
-    # Step 1: Press the plus button to open the modal
-    while True:
-        try:
-            show_button = wait_for_element(By.CSS_SELECTOR, show_button_selector, timeout)
-            show_button.click()
-            print("Opened modal for CPE 2303L.")
-            break
-        except TimeoutException:
-            print("Error: CPE 2303L show button did not load properly. Retrying...")
-        except WebDriverException as e:
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    if "undefined" in modal_body:
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    if "... i'm still processing your request :)" in modal_body:
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    if "... loading ..." in modal_body:
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
-        time.sleep(2)
-    # Step 2: Press the 'Click to advise course' button
-    while True:
-        try:
-            advise_button = wait_for_element(By.CSS_SELECTOR, advise_button_selector, timeout)
-            advise_button.click()
-            print("Pressed 'Click to advise course' for CPE 2303L.")
-            # Check for success, already advised, max units, or pre-req error
-            success_modal = wait_for_element(By.CSS_SELECTOR, "#modal2Body", timeout)
-            modal_text = success_modal.text
-            if "Successfully advised course." in modal_text:
-                print("Successfully advised course for CPE 2303L.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after success
-            if "Course already been advised!" in modal_text:
-                print("Course already been advised for CPE 2303L.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after already advised
-            if "Student has reached the maximum number of units allowed for the term." in modal_text:
-                print("Maximum units reached for the term. Ending advise for CPE 2303L.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after max units
-            if "Student has not taken or passed the pre-requisite courses of" in modal_text:
-                print("Pre-requisite courses not taken or passed for CPE 2303L.")
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                close_btn.click()
-                return  # Exit the function after pre-req error
-        except TimeoutException:
-            # Check if modal is already showing success, already advised, max units, or pre-req error
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    if "Successfully advised course." in modal_body:
-                        print("Successfully advised course for CPE 2303L. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-                    if "Course already been advised!" in modal_body:
-                        print("Course already been advised for CPE 2303L. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-                    if "Student has reached the maximum number of units allowed for the term." in modal_body:
-                        print("Maximum units reached for the term. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-                    if "Student has not taken or passed the pre-requisite courses of" in modal_body:
-                        print("Pre-requisite courses not taken or passed for CPE 2303L. (Timeout branch)")
-                        close_btn = modal.find_element(By.CSS_SELECTOR, "button.close[data-dismiss='modal']")
-                        close_btn.click()
-                        return
-            except Exception:
-                pass
-            print("Error: CPE 2303L advise button did not load properly. Retrying...")
-        except WebDriverException as e:
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal2")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal2Body").text.strip()
-                    if "undefined" in modal_body:
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    if "... i'm still processing your request :)" in modal_body:
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    if "... loading ..." in modal_body:
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
-        time.sleep(2)
+    """Advises CPE 2303L. Kept for older call sites, see advise_course_code."""
+    return advise_course_code("CPE 2303L", timeout)
 
+@tracer.traced()
 def schedule_CPES(timeout=10):
     """
     This is after you have advised the course this is same as schedule_ge_fel_course but this is for individual subjects. It gives the links for the schedules.
@@ -1087,73 +617,20 @@ def schedule_CPES(timeout=10):
             print("Schedule loaded successfully.")
             
             #Fetch the schedule and href attributes
-            schedule_sections = browser.find_elements(By.CSS_SELECTOR, "#EnrollBody tr")
-            for schedule_section in schedule_sections:
-                # Extract the block number
-                block_number = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(1)").text.strip()
-        
-                # Extract the course code
-                course_code = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(2)").text.strip()
-        
-                # Extract the schedule details
-                schedule_details = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(3) span").text.strip()
-        
-                # Extract the course status
-                course_status = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(4)").text.strip()
-        
-                # Extract the population
-                population = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(5)").text.strip()
-        
-                # Extract the link
-                link_element = schedule_section.find_element(By.CSS_SELECTOR, "a.green.rs-modal")
-                link = link_element.get_attribute("href")
-        
-                # Print the details
-                print(f"Block #: {block_number}")
-                print(f"Course Code: {course_code}")
-                print(f"Schedule: {schedule_details}")
-                print(f"Course Status: {course_status}")
-                print(f"Population: {population}")
-                print(f"Link: {link}")
-                print("-" * 40)
+            schedule_sections = extract_schedule_rows(browser)
+            print_schedule_rows(schedule_sections)
             break
         except TimeoutException:
             print("Error: CPES Schedule content did not load properly. Retrying...")
 
-        except WebDriverException as e:
+        except WebDriverException:
             # Handle potential modal issues
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal1")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal1Body").text.strip()
-                    
-                    if "undefined" in modal_body:
-                        # Close modal immediately for "undefined"
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    
-                    if "... i'm still processing your request :)" in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    
-                    if "... loading ..." in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+            if handle_modal(browser, "#modal1") in RETRY_STATES:
+                continue
 
         time.sleep(2)  # Brief delay before retrying            
 
+@tracer.traced()
 def schedule_CPE_2301(timeout=10):
     """
     Prints all available schedule details for CPE 2301, with robust modal and retry logic.
@@ -1187,60 +664,24 @@ def schedule_CPE_2301(timeout=10):
                 EC.presence_of_element_located((By.ID, "EnrollBody"))
             )
             print("Schedule loaded successfully.")
-            schedule_sections = browser.find_elements(By.CSS_SELECTOR, "#EnrollBody tr")
+            schedule_sections = extract_schedule_rows(browser)
             if not schedule_sections:
                 print("No schedule details found for CPE 2301.")
                 ActionChains(browser).send_keys(Keys.ESCAPE).perform()
                 break
-            for schedule_section in schedule_sections:
-                try:
-                    block_number = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(1)").text.strip()
-                    course_code = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(2)").text.strip()
-                    schedule_details = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(3) span").text.strip()
-                    course_status = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(4)").text.strip()
-                    population = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(5)").text.strip()
-                    link_element = schedule_section.find_element(By.CSS_SELECTOR, "a.green.rs-modal")
-                    link = link_element.get_attribute("href")
-                    print(f"Block #: {block_number}")
-                    print(f"Course Code: {course_code}")
-                    print(f"Schedule: {schedule_details}")
-                    print(f"Course Status: {course_status}")
-                    print(f"Population: {population}")
-                    print(f"Link: {link}")
-                    print("-" * 40)
-                except Exception:
-                    print("A schedule row was missing expected details and was skipped.")
+            print_schedule_rows(schedule_sections)
             # Escape/close modal after printing all
             ActionChains(browser).send_keys(Keys.ESCAPE).perform()
             break
         except TimeoutException:
             print("Error: CPE 2301 Schedule content did not load properly. Retrying...")
-        except WebDriverException as e:
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal1")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal1Body").text.strip()
-                    if "undefined" in modal_body:
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    if "... i'm still processing your request :)" in modal_body:
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    if "... loading ..." in modal_body:
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+        except WebDriverException:
+            # Handle potential modal issues
+            if handle_modal(browser, "#modal1") in RETRY_STATES:
+                continue
         time.sleep(2)
 
+@tracer.traced()
 def schedule_CPE_2302(timeout=10):
     """
     Prints all available schedule details for CPE 2302, with robust modal and retry logic.
@@ -1269,68 +710,25 @@ def schedule_CPE_2302(timeout=10):
                 EC.presence_of_element_located((By.ID, "EnrollBody"))
             )
             print("Schedule loaded successfully.")
-            schedule_sections = browser.find_elements(By.CSS_SELECTOR, "#EnrollBody tr")
+            schedule_sections = extract_schedule_rows(browser)
             if not schedule_sections:
                 print("No schedule details found for CPE 2302.")
                 ActionChains(browser).send_keys(Keys.ESCAPE).perform()
                 break
-            for schedule_section in schedule_sections:
-                try:
-                    block_number = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(1)").text.strip()
-                    course_code = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(2)").text.strip()
-                    schedule_details = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(3) span").text.strip()
-                    course_status = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(4)").text.strip()
-                    population = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(5)").text.strip()
-                    link_element = schedule_section.find_element(By.CSS_SELECTOR, "a.green.rs-modal")
-                    link = link_element.get_attribute("href")
-                    print(f"Block #: {block_number}")
-                    print(f"Course Code: {course_code}")
-                    print(f"Schedule: {schedule_details}")
-                    print(f"Course Status: {course_status}")
-                    print(f"Population: {population}")
-                    print(f"Link: {link}")
-                    print("-" * 40)
-                except Exception:
-                    print("A schedule row was missing expected details and was skipped.")
+            print_schedule_rows(schedule_sections)
             # Escape/close modal after printing all
             ActionChains(browser).send_keys(Keys.ESCAPE).perform()
             break
         except TimeoutException:
             print("Error: CPE 2302 Schedule content did not load properly. Retrying...")
 
-        except WebDriverException as e:
+        except WebDriverException:
             # Handle potential modal issues
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal1")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal1Body").text.strip()
-                    
-                    if "undefined" in modal_body:
-                        # Close modal immediately for "undefined"
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    
-                    if "... i'm still processing your request :)" in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    
-                    if "... loading ..." in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+            if handle_modal(browser, "#modal1") in RETRY_STATES:
+                continue
         time.sleep(2)
 
+@tracer.traced()
 def schedule_CPE_2303L(timeout=10):
     """
     Prints all available schedule details for CPE 2303L, with robust modal and retry logic.
@@ -1359,68 +757,59 @@ def schedule_CPE_2303L(timeout=10):
                 EC.presence_of_element_located((By.ID, "EnrollBody"))
             )
             print("Schedule loaded successfully.")
-            schedule_sections = browser.find_elements(By.CSS_SELECTOR, "#EnrollBody tr")
+            schedule_sections = extract_schedule_rows(browser)
             if not schedule_sections:
                 print("No schedule details found for CPE 2303L.")
                 ActionChains(browser).send_keys(Keys.ESCAPE).perform()
                 break
-            for schedule_section in schedule_sections:
-                try:
-                    block_number = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(1)").text.strip()
-                    course_code = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(2)").text.strip()
-                    schedule_details = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(3) span").text.strip()
-                    course_status = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(4)").text.strip()
-                    population = schedule_section.find_element(By.CSS_SELECTOR, "td:nth-child(5)").text.strip()
-                    link_element = schedule_section.find_element(By.CSS_SELECTOR, "a.green.rs-modal")
-                    link = link_element.get_attribute("href")
-                    print(f"Block #: {block_number}")
-                    print(f"Course Code: {course_code}")
-                    print(f"Schedule: {schedule_details}")
-                    print(f"Course Status: {course_status}")
-                    print(f"Population: {population}")
-                    print(f"Link: {link}")
-                    print("-" * 40)
-                except Exception:
-                    print("A schedule row was missing expected details and was skipped.")
+            print_schedule_rows(schedule_sections)
             # Escape/close modal after printing all
             ActionChains(browser).send_keys(Keys.ESCAPE).perform()
             break
         except TimeoutException:
             print("Error: CPE 2303L Schedule content did not load properly. Retrying...")
 
-        except WebDriverException as e:
+        except WebDriverException:
             # Handle potential modal issues
-            try:
-                modal = browser.find_element(By.CSS_SELECTOR, "#modal1")
-                if modal.is_displayed():
-                    modal_body = modal.find_element(By.CSS_SELECTOR, "#modal1Body").text.strip()
-                    
-                    if "undefined" in modal_body:
-                        # Close modal immediately for "undefined"
-                        print(f"Modal issue detected: {modal_body}. Closing modal and retrying...")
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed due to 'undefined'. Retrying immediately...")
-                        continue
-                    
-                    if "... i'm still processing your request :)" in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is processing: {modal_body}. Waiting 10 seconds before retrying...")
-                        time.sleep(10)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 10-second wait. Retrying...")
-                        continue
-                    
-                    if "... loading ..." in modal_body:
-                        # Wait 10 seconds before retrying for "still processing"
-                        print(f"Modal is loading: {modal_body}. Waiting 20 seconds before retrying...")
-                        time.sleep(20)
-                        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
-                        print("Modal closed after 20-second wait. Retrying...")
-                        continue
-            except Exception as modal_error:
-                print(f"Error while handling modal: {modal_error}")
+            if handle_modal(browser, "#modal1") in RETRY_STATES:
+                continue
         time.sleep(2)
 
+def get_advised_course_codes():
+    """Returns the course codes in #AdvisedCourseList with one script call."""
+    return browser.execute_script(
+        "return Array.prototype.map.call(document.querySelectorAll('#AdvisedCourseList tr td:first-child'),"
+        " function (td) { return td.innerText.trim(); });"
+    ) or []
+
+
+@tracer.traced()
+def view_schedules(course_codes, parallelism=SCHEDULE_PARALLELISM):
+    """
+    Prints the schedules of several advised courses, fetched in parallel by a pool of logged-in browsers.
+    Courses that are not in the advised course list are skipped, like in the schedule_* functions.
+    """
+    advised_codes = get_advised_course_codes()
+    to_fetch = []
+    for course_code in course_codes:
+        if any(code.endswith(course_code) for code in advised_codes):
+            to_fetch.append(course_code)
+        else:
+            print(f"{course_code} is not in the advised course list. Skipping schedule view.")
+
+    schedules = fetch_schedules(to_fetch, browser.get_cookies(), parallelism)
+    for course_code in to_fetch:
+        rows = schedules.get(course_code)
+        print(f"Schedule for {course_code}:")
+        if rows is None:
+            print(f"Error: {course_code} Schedule content did not load properly.")
+        elif not rows:
+            print(f"No schedule details found for {course_code}.")
+        else:
+            print_schedule_rows(rows)
+
+
+@tracer.traced()
 def close_remaining_courses_modal(timeout=10):
     """
     Closes the 'Remaining Courses To Be Advised' modal (#modal1) by clicking its close button.
@@ -1437,9 +826,10 @@ def close_remaining_courses_modal(timeout=10):
     except Exception as e:
         print(f"Could not close 'Remaining Courses To Be Advised' modal: {e}")
         
+@tracer.traced()
 def navigate_to_block_advising():
     """Navigates to the Block Advising section."""
-    browser.get("https://ismis.usc.edu.ph/advisedcourse")
+    browser.get(f"{BASE_URL}/advisedcourse")
 
     # Ensure the page is loaded
     while check_site_crash_after_login():
@@ -1449,9 +839,10 @@ def navigate_to_block_advising():
     # Click the Block Advising button
     press_block_advising()
 
+@tracer.traced()
 def navigate_to_view_lacking():
     """Navigates to the View Lacking section."""
-    browser.get("https://ismis.usc.edu.ph/advisedcourse")
+    browser.get(f"{BASE_URL}/advisedcourse")
 
     # Ensure the page is loaded
     while check_site_crash_after_login():
@@ -1462,9 +853,10 @@ def navigate_to_view_lacking():
     #press_view_lacking()
 
     
+@tracer.traced()
 def navigate_to_advise_course():
     """Navigates to the Advised Course section and verifies it has loaded properly."""
-    navigate_to_page_with_retry("https://ismis.usc.edu.ph/advisedcourse", "a.btn.btn-sm.green.rs-modal[title='Click To Show Courses']")
+    navigate_to_page_with_retry(f"{BASE_URL}/advisedcourse", "a.btn.btn-sm.green.rs-modal[title='Click To Show Courses']")
     press_advised_course()
 
 
@@ -1481,6 +873,8 @@ def main():
 
     # Login process
     login_status = False
+    if USE_HTTP_LOGIN:
+        login_status = http_login_to_browser(username_input, password_input)
     while not login_status:
         #clear()
         login_attempt(username_input, password_input)
@@ -1505,20 +899,23 @@ def main():
     #this block of code is for advising courses for non block. you can edit the functions to do the individual courses you want to advise.
     # then print their schedules and href link which leads to faster requests to the server since its what you press instead of clicking add.
     
-    print("Navigating to Advised Course...")
-    navigate_to_advise_course()
-
-    advise_CPE_2301()
-    time.sleep(2)  # Wait for the modal to load properly
-    advise_CPE_2302()
-    time.sleep(2)  # Wait for the modal to load properly
-    advise_CPE_2303L()
-    
-    close_remaining_courses_modal()
+    if http_session is not None:
+        # Advises every course at once over HTTP, then reloads the page so the browser sees the new advised list
+        print("Advising courses...")
+        print_advise_outcomes(advise_courses(http_session, ADVISE_COURSES, ADVISE_CONCURRENCY))
+        navigate_to_page_with_retry(f"{BASE_URL}/advisedcourse", "a.btn.btn-sm.green.rs-modal[title='Click To Show Courses']")
+    else:
+        print("Navigating to Advised Course...")
+        navigate_to_advise_course()
+
+        # Advises the whole list in one 'Remaining Courses To Be Advised' modal session
+        for course_code, state in advise_course_codes(ADVISE_COURSES).items():
+            print(f"{course_code}: {state.value}.")
+
+        close_remaining_courses_modal()
     
-    schedule_CPE_2301()
-    schedule_CPE_2302()
-    schedule_CPE_2303L()
+    # Fetches all schedules at once instead of schedule_CPE_2301(), schedule_CPE_2302() and schedule_CPE_2303L() in a row
+    view_schedules(SCHEDULE_COURSES)
     
     # this block of code is for enrolling in GE-FEL courses which is not needed for now.
     # print("Navigating to Advised Course...")
@@ -1547,5 +944,9 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        modal_timings.print_summary()
+        modal_timings.save()  # Keeps real busy-state durations for tuning BUSY_POLICIES
+        tracer.print_summary()
+        tracer.save()
         browser.quit()
 
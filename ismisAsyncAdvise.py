@@ -0,0 +1,114 @@
+import asyncio
+
+from ismisExtract import parse_modal_links, find_modal_link
+from ismisModal import ModalState, RETRY_STATES, classify_modal_text
+from ismisTrace import tracer
+
+# Configurations
+ADVISED_COURSE_PATH = "/advisedcourse"
+SHOW_COURSES_TITLE = "Click To Show Courses"
+RETRY_DELAYS = (0.5, 1, 2, 4, 8)  # Seconds to wait before each retry of a busy server
+
+
+async def fetch_modal(session, href):
+    """Loads an rs-modal href over the session without blocking the event loop."""
+    page = await asyncio.to_thread(session.get, href, True)
+    return page.text
+
+
+async def load_advise_links(session):
+    """Opens the 'Click To Show Courses' modal once and returns its rs-modal links."""
+    page = await asyncio.to_thread(session.get, ADVISED_COURSE_PATH)
+    show_courses = find_modal_link(parse_modal_links(page.text), SHOW_COURSES_TITLE)
+    if show_courses is None:
+        raise Exception("Advised Course button not found. Is the session still logged in?")
+    return parse_modal_links(await fetch_modal(session, show_courses))
+
+
+def find_show_link(links, course_code):
+    """Finds the plus button for a course. GE-FEL courses are listed under any GE-FREELEC slot."""
+    href = find_modal_link(links, f"Click to show course to be advised{course_code}")
+    if href is None and course_code.startswith("GE-FEL"):
+        href = find_modal_link(links, "GE-FREELEC")
+    return href
+
+
+async def advise_course(session, course_code, links, semaphore, checkpoint=None):
+    """Advises one course and returns (ModalState, modal text). checkpoint is awaited before each attempt."""
+    async with semaphore:
+        with tracer.span("advise_course", "advise", track=f"advise {course_code}", course_code=course_code) as span:
+            state, text = await _advise_course(session, course_code, links, span, checkpoint)
+            span.set(state=state)
+            return state, text
+
+
+async def _advise_course(session, course_code, links, span, checkpoint):
+    show_href = find_show_link(links, course_code)
+    if show_href is None:
+        return ModalState.NOT_FOUND, ""
+
+    state, text = ModalState.UNKNOWN, ""
+    for retries, delay in enumerate(RETRY_DELAYS + (None,)):
+        span.set(retries=retries)
+        if checkpoint is not None:
+            await checkpoint()
+        text = await fetch_modal(session, show_href)
+        advise_href = find_modal_link(parse_modal_links(text), f"Click to advise course {course_code}")
+        if advise_href is not None:
+            text = await fetch_modal(session, advise_href)
+            state = classify_modal_text(text)
+            if state not in RETRY_STATES:
+                return state, text.strip()
+        else:
+            state = classify_modal_text(text)
+            if state not in RETRY_STATES:
+                return ModalState.NOT_FOUND, text.strip()
+        if delay is None:
+            break
+        print(f"{course_code}: {state.value}. Retrying in {delay} seconds...")
+        await asyncio.sleep(delay)
+    return state, text.strip()
+
+
+async def advise_courses_async(session, course_codes, concurrency=4, checkpoint=None):
+    """Fires the advise requests for every course at once, at most concurrency at a time.
+    Returns a dict of course code to (ModalState, modal text). checkpoint, e.g. a job's pause/cancel
+    check, runs on a thread before every attempt; the first exception it raises stops the other
+    courses at their next attempt and is raised here."""
+    stopped = []
+
+    async def check():
+        if stopped:
+            raise stopped[0]
+        try:
+            await asyncio.to_thread(checkpoint)
+        except Exception as e:
+            stopped.append(e)
+            raise
+
+    links = await load_advise_links(session)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(
+        *(advise_course(session, course_code, links, semaphore, check if checkpoint else None) for course_code in course_codes),
+        return_exceptions=True,
+    )
+    if stopped:
+        raise stopped[0]
+    outcomes = {}
+    for course_code, result in zip(course_codes, results):
+        if isinstance(result, Exception):
+            print(f"{course_code}: advise request failed ({result}).")
+            result = (ModalState.UNKNOWN, str(result))
+        outcomes[course_code] = result
+    return outcomes
+
+
+def advise_courses(session, course_codes, concurrency=4, checkpoint=None):
+    """Synchronous entry point for advise_courses_async."""
+    return asyncio.run(advise_courses_async(session, list(course_codes), concurrency, checkpoint))
+
+
+def print_advise_outcomes(outcomes):
+    """Prints one line per course with its advise outcome."""
+    for course_code, (state, _) in outcomes.items():
+        print(f"{course_code}: {state.value}.")
@@ -0,0 +1,92 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException
+import statistics
+import time
+
+from ismisExtract import extract_offered_course_rows
+
+
+# Functions
+def read_course_rows_per_cell(browser):
+    """The original print_course_data reader: one XPath lookup per cell. Kept as the benchmark baseline."""
+    rows = browser.find_elements(By.CSS_SELECTOR, "tr")
+    courses = []
+    for row in rows:
+        try:
+            courses.append(tuple(
+                row.find_element(By.XPATH, f".//td[{index}]").text.strip()
+                for index in (1, 2, 3, 5, 6, 7)
+            ))
+        except NoSuchElementException:
+            continue
+    return courses
+
+
+def time_call(func, repeat=5):
+    """Runs func repeat times and returns the wall times in milliseconds and the last result."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, result
+
+
+def summarize(timings):
+    """Returns min/median/max of a list of timings in milliseconds."""
+    return {
+        "min_ms": round(min(timings), 2),
+        "median_ms": round(statistics.median(timings), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def benchmark_course_extraction(browser, repeat=5):
+    """Compares the per-cell offered-course reader with the single-call extractor on the current page."""
+    per_cell_timings, per_cell_rows = time_call(lambda: read_course_rows_per_cell(browser), repeat)
+    bulk_timings, bulk_rows = time_call(lambda: extract_offered_course_rows(browser), repeat)
+
+    if len(per_cell_rows) != len(bulk_rows):
+        print(f"Warning: per-cell reader found {len(per_cell_rows)} rows but bulk extractor found {len(bulk_rows)}.")
+
+    result = {
+        "rows": len(bulk_rows),
+        "per_cell": summarize(per_cell_timings),
+        "bulk": summarize(bulk_timings),
+    }
+    result["speedup"] = round(result["per_cell"]["median_ms"] / max(result["bulk"]["median_ms"], 0.001), 1)
+    return result
+
+
+def print_benchmark(name, result):
+    """Prints one benchmark result in a readable table."""
+    print(f"{name} ({result['rows']} rows)")
+    print("{:10s} {:>10s} {:>10s} {:>10s}".format("Reader", "Min ms", "Median ms", "Max ms"))
+    for reader in ("per_cell", "bulk"):
+        stats = result[reader]
+        print("{:10s} {:10.2f} {:10.2f} {:10.2f}".format(reader, stats["min_ms"], stats["median_ms"], stats["max_ms"]))
+    print(f"Speedup: {result['speedup']}x")
+
+
+def main():
+    """Logs in, opens the offered-course results and benchmarks the table readers."""
+    import ismisOfferedCourses as offered
+
+    username_input, password_input = offered.load_credentials()
+    login_status = offered.http_login_to_browser(username_input, password_input)
+    while not login_status:
+        offered.login_attempt(username_input, password_input)
+        login_status = offered.check_valid_login()
+
+    offered.navigate_to_courses()
+    WebDriverWait(offered.browser, 10).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "tr")))
+
+    print_benchmark("Offered courses", benchmark_course_extraction(offered.browser))
+    offered.browser.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# Reads the rs-modal AJAX responses straight from Chrome's network log through the DevTools protocol,
+# so an advise outcome is known as soon as ISMIS answers instead of after #modal2Body has rendered
+# and the next DOM poll has seen it. Needs a driver started with create_driver(capture_network=True).
+from collections import deque, namedtuple
+import json
+import time
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+
+from ismisModal import ModalState, ModalAction, MODAL_ACTIONS, BUSY_POLICIES, classify_modal_text, close_modal, read_modal, modal_timings
+from ismisTrace import tracer
+
+# Configurations
+CAPTURE_POLL_INTERVAL = 0.05  # Seconds between reads of the network log. Each read is one local WebDriver call
+MAX_CAPTURED_RESPONSES = 200  # Older responses are dropped, only the latest ones are ever waited for
+MODAL_RENDER_TIMEOUT = 3  # Seconds the page gets to show a captured response before the modal is closed anyway
+
+CapturedResponse = namedtuple("CapturedResponse", ["sequence", "url", "status", "body", "received_at"])
+
+
+def is_ajax_request(params):
+    """True for requests sent by the page's XMLHttpRequest, which is how every rs-modal loads."""
+    headers = {name.lower(): value for name, value in params["request"].get("headers", {}).items()}
+    return params.get("type") == "XHR" or headers.get("x-requested-with") == "XMLHttpRequest"
+
+
+def classify_response(response):
+    """Maps a captured modal response to the ModalState the page is about to show.
+    A failed or non-200 request is rendered as 'undefined' by the page script."""
+    if response.status != 200:
+        return ModalState.UNDEFINED
+    return classify_modal_text(response.body)
+
+
+class ModalResponseCapture:
+    """Collects finished AJAX responses from the performance log, numbered in the order they completed."""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.pending = {}  # requestId -> [url, status] of AJAX requests still in flight
+        self.responses = deque(maxlen=MAX_CAPTURED_RESPONSES)
+        self.sequence = 0
+
+    def start(self):
+        """Enables the Network domain and drops log entries from before now. Returns False if the driver
+        was started without the performance log, in which case the callers keep polling the DOM."""
+        try:
+            self.browser.execute_cdp_cmd("Network.enable", {})
+            self.browser.get_log("performance")
+        except WebDriverException as e:
+            print(f"Network capture unavailable ({e.msg}). Falling back to reading the modals.")
+            return False
+        return True
+
+    def poll(self):
+        """Reads the new performance log entries and stores every AJAX response that finished loading."""
+        for entry in self.browser.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent" and is_ajax_request(params):
+                self.pending[params["requestId"]] = [params["request"]["url"], None]
+            elif method == "Network.responseReceived" and params["requestId"] in self.pending:
+                self.pending[params["requestId"]][1] = params["response"]["status"]
+            elif method == "Network.loadingFinished" and params["requestId"] in self.pending:
+                url, status = self.pending.pop(params["requestId"])
+                try:
+                    body = self.browser.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})["body"]
+                except WebDriverException:
+                    body = ""  # Chrome already evicted it, e.g. after a navigation
+                self._add(url, status, body)
+            elif method == "Network.loadingFailed" and params["requestId"] in self.pending:
+                url, _ = self.pending.pop(params["requestId"])
+                self._add(url, 0, "")
+
+    def _add(self, url, status, body):
+        self.sequence += 1
+        self.responses.append(CapturedResponse(self.sequence, url, status, body, time.perf_counter()))
+
+    def mark(self):
+        """Returns the current sequence number. Call it right before the click whose response is wanted."""
+        self.poll()
+        return self.sequence
+
+    def wait_for_response(self, since, timeout=10):
+        """Returns the first AJAX response that finished after mark() returned since, or None on timeout."""
+        deadline = time.perf_counter() + timeout
+        while True:
+            self.poll()
+            for response in self.responses:
+                if response.sequence > since:
+                    return response
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(CAPTURE_POLL_INTERVAL)
+
+    def wait_for_outcome(self, since, timeout=10):
+        """
+        Follows the responses after since until one is not a busy state. The page reloads busy modals
+        itself, so each reload shows up as a new response; a busy state is waited out for as long as
+        its BUSY_POLICIES deadline allows. Returns (ModalState, CapturedResponse). The state is still a busy one
+        when its deadline ran out, and (None, None) means nothing answered within timeout.
+        """
+        with tracer.span("wait_for_modal_response", "modal") as span:
+            deadline = time.perf_counter() + timeout
+            state, last = None, None
+            while True:
+                response = self.wait_for_response(since, max(0.0, deadline - time.perf_counter()))
+                if response is None:
+                    span.set(state=state)  # Still busy, or no answer at all
+                    return state, last
+                state, last = classify_response(response), response
+                since = response.sequence
+                if state not in BUSY_POLICIES:
+                    span.set(state=state, url=response.url)
+                    return state, response
+                deadline = max(deadline, response.received_at + BUSY_POLICIES[state].deadline)
+
+
+def wait_for_rendered(browser, modal_selector, state, timeout=MODAL_RENDER_TIMEOUT):
+    """
+    Waits until the page's own handler has shown the captured outcome in the modal. Closing it earlier
+    lets the handler open it again over the next action. Returns False when it did not show in time.
+    """
+    with tracer.span("wait_for_modal_render", "modal", modal=modal_selector) as span:
+        deadline = time.perf_counter() + timeout
+        while True:
+            text = read_modal(browser, modal_selector)
+            if text is not None and classify_modal_text(text) is state:
+                span.set(rendered=True)
+                return True
+            if time.perf_counter() >= deadline:
+                span.set(rendered=False)
+                return False
+            time.sleep(CAPTURE_POLL_INTERVAL)
+
+
+@tracer.traced("handle_captured_modal", "modal")
+def handle_captured_modal(browser, capture, since, modal_selector, label="", timeout=10):
+    """
+    Waits for the response to the click made after capture.mark() returned since and performs the
+    MODAL_ACTIONS entry for it, like handle_modal but without reading the rendered modal.
+    Returns the ModalState, or None when nothing answered and the caller should read the modal instead.
+    """
+    state, response = capture.wait_for_outcome(since, timeout)
+    if state is None:
+        return None
+    modal_timings.record_transition(modal_selector, state)
+    action = MODAL_ACTIONS[state]
+    tracer.annotate(modal=modal_selector, label=label, state=state, action=action)
+    prefix = f"{label}: " if label else ""
+    try:
+        if action is not ModalAction.NONE and not wait_for_rendered(browser, modal_selector, state):
+            print(f"{prefix}Modal did not show the response in time. Closing it anyway.")
+        if action is ModalAction.CLOSE:
+            print(f"{prefix}{state.value}.")
+            close_modal(browser, modal_selector)
+        elif action in (ModalAction.RETRY, ModalAction.WAIT_AND_RETRY):
+            print(f"{prefix}Modal issue detected: {state.value}. Closing modal and retrying...")
+            ActionChains(browser).send_keys(Keys.ESCAPE).perform()
+    except WebDriverException as e:
+        print(f"Error while handling modal: {e}")
+    return state
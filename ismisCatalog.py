@@ -0,0 +1,146 @@
+# On-disk cache of offered-course search results, so repeated lookups do not need a browser.
+from collections import namedtuple
+import sqlite3
+import time
+
+from ismisExtract import OfferedCourse
+
+# Configurations
+CATALOG_DB_FILE = "catalog.sqlite3"
+CATALOG_TTL = 6 * 60 * 60  # Seconds before a cached search is refreshed from ISMIS
+
+CatalogDiff = namedtuple("CatalogDiff", ["added", "removed", "changed"])  # changed holds (old, new) pairs
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    course_filter TEXT NOT NULL,
+    academic_period TEXT NOT NULL,
+    academic_year TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (course_filter, academic_period, academic_year)
+);
+CREATE TABLE IF NOT EXISTS courses (
+    course_filter TEXT NOT NULL,
+    academic_period TEXT NOT NULL,
+    academic_year TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    course_code TEXT NOT NULL,
+    description TEXT,
+    status TEXT,
+    teachers TEXT,
+    schedule TEXT,
+    department TEXT,
+    enrolled TEXT,
+    PRIMARY KEY (course_filter, academic_period, academic_year, position)
+);
+"""
+
+
+def course_key(course):
+    """Identifies a section across refreshes. A course code has one row per section, told apart by schedule."""
+    return course.course_code, course.schedule, course.department
+
+
+def diff_courses(old_courses, new_courses):
+    """Compares two result sets of one search. Returns a CatalogDiff."""
+    old = {course_key(course): course for course in old_courses}
+    new = {course_key(course): course for course in new_courses}
+    added = [course for key, course in new.items() if key not in old]
+    removed = [course for key, course in old.items() if key not in new]
+    changed = [(old[key], course) for key, course in new.items() if key in old and old[key] != course]
+    return CatalogDiff(added, removed, changed)
+
+
+def print_catalog_diff(diff):
+    """Prints what a refresh changed, one line per section."""
+    if not (diff.added or diff.removed or diff.changed):
+        print("No changes since the last refresh.")
+        return
+    for course in diff.added:
+        print(f"+ {course.course_code} {course.schedule} ({course.status}, {course.enrolled})")
+    for course in diff.removed:
+        print(f"- {course.course_code} {course.schedule}")
+    for old, new in diff.changed:
+        changes = ", ".join(
+            f"{field}: {getattr(old, field)} -> {getattr(new, field)}"
+            for field in OfferedCourse._fields if getattr(old, field) != getattr(new, field)
+        )
+        print(f"~ {new.course_code} {new.schedule} ({changes})")
+
+
+class CourseCatalog:
+    """SQLite store of offered-course results keyed by course filter, academic period and year, with a TTL per search."""
+
+    def __init__(self, path=CATALOG_DB_FILE, ttl=CATALOG_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def fetched_at(self, course_filter, academic_period, academic_year):
+        """Returns when a search was last stored, or None if it never was."""
+        row = self.connection.execute(
+            "SELECT fetched_at FROM queries WHERE course_filter = ? AND academic_period = ? AND academic_year = ?",
+            (course_filter, academic_period, academic_year),
+        ).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, course_filter, academic_period, academic_year, ttl=None):
+        """True when the search is cached and younger than the TTL."""
+        fetched_at = self.fetched_at(course_filter, academic_period, academic_year)
+        ttl = self.ttl if ttl is None else ttl
+        return fetched_at is not None and time.time() - fetched_at < ttl
+
+    def get(self, course_filter, academic_period, academic_year):
+        """Returns the cached OfferedCourses of a search in page order, or None if it was never stored."""
+        if self.fetched_at(course_filter, academic_period, academic_year) is None:
+            return None
+        rows = self.connection.execute(
+            "SELECT course_code, description, status, teachers, schedule, department, enrolled FROM courses"
+            " WHERE course_filter = ? AND academic_period = ? AND academic_year = ? ORDER BY position",
+            (course_filter, academic_period, academic_year),
+        ).fetchall()
+        return [OfferedCourse(*row) for row in rows]
+
+    def put(self, course_filter, academic_period, academic_year, courses):
+        """Replaces the stored rows of a search and returns how they differ from the previous ones."""
+        old_courses = self.get(course_filter, academic_period, academic_year) or []
+        key = (course_filter, academic_period, academic_year)
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM courses WHERE course_filter = ? AND academic_period = ? AND academic_year = ?", key)
+            self.connection.executemany(
+                "INSERT INTO courses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [key + (position,) + tuple(course) for position, course in enumerate(courses)],
+            )
+            self.connection.execute("INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?)", key + (time.time(),))
+        return diff_courses(old_courses, courses)
+
+    def lookup(self, course_filter, academic_period, academic_year, fetch, ttl=None, force=False):
+        """
+        Answers a search from disk while it is fresh. Otherwise calls fetch() for the live rows,
+        stores them and returns them with the CatalogDiff against the old rows.
+        Returns (courses, diff), where diff is None when nothing was stored.
+        An empty live result is never stored: a failed search looks the same, and would hide the catalog for the whole TTL.
+        """
+        if not force and self.is_fresh(course_filter, academic_period, academic_year, ttl):
+            return self.get(course_filter, academic_period, academic_year), None
+        courses = fetch()
+        if not courses:
+            cached = self.get(course_filter, academic_period, academic_year)
+            if cached:
+                print("Live lookup returned no rows. Keeping the cached ones.")
+                return cached, None
+            print("Live lookup returned no rows. Nothing was cached.")
+            return [], None
+        return courses, self.put(course_filter, academic_period, academic_year, courses)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
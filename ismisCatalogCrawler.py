@@ -0,0 +1,195 @@
+# Crawls the whole offered-course listing of a term over HTTP and streams every row to JSONL or CSV.
+# Each page is written and flushed before the next one is fetched, and a small progress file records
+# how far the crawl got, so an interrupted crawl keeps its rows and resumes where it stopped:
+#
+#     python ismisCatalogCrawler.py --period "2ND SEMESTER" --year 2024 --format csv --output catalog.csv
+import argparse
+import csv
+import json
+import os
+import urllib.parse
+
+from ismisExtract import OfferedCourse, parse_offered_course_html
+from ismisSession import http_login
+from ismisTrace import tracer
+
+# Configurations
+OFFERED_COURSES_PATH = "/courseSchedule/CourseScheduleOfferedIndex"
+CATALOG_PREFIXES = ["CPE", "CPES", "CS", "IT", "IS", "MATH", "PHYS", "CHEM", "ENGL", "GE", "GE-FEL", "NSTP", "PE"]
+CATALOG_OUTPUT_FILE = "offered_courses.jsonl"
+ACADEMIC_PERIOD = "2ND SEMESTER"
+ACADEMIC_YEAR = "2024"
+MAX_PAGES = 500  # Per prefix, in case the pagination never ends
+CATALOG_FIELDS = ("academic_period", "academic_year", "prefix", "page") + OfferedCourse._fields
+
+
+def search_path(prefix, academic_period, academic_year, page=1):
+    """Path of one page of offered-course results, the same query the filter form submits."""
+    query = urllib.parse.urlencode({
+        "Courses": prefix,
+        "AcademicPeriod": academic_period,
+        "AcademicYear": academic_year,
+        "page": page,
+    })
+    return f"{OFFERED_COURSES_PATH}?{query}"
+
+
+def next_page_link(page_links, page):
+    """Returns the href of the pagination link for page + 1, or None on the last page."""
+    for text, href in page_links:
+        if text == str(page + 1):
+            return href
+    return None
+
+
+def owning_prefix(course_code, prefixes):
+    """The longest prefix a course code starts with. A search for "CPE" also lists CPES courses,
+    which are written when the "CPES" search is crawled instead."""
+    matches = [prefix for prefix in prefixes if course_code.startswith(prefix)]
+    return max(matches, key=len) if matches else None
+
+
+@tracer.traced("crawl_prefix", "catalog")
+def crawl_prefix(session, prefix, academic_period, academic_year, start_page=1):
+    """Yields (page, OfferedCourses) for every results page of one course-code prefix, one page at a time."""
+    tracer.annotate(prefix=prefix)
+    path = search_path(prefix, academic_period, academic_year, start_page)
+    page = start_page
+    while path is not None and page <= MAX_PAGES:
+        courses, page_links = parse_offered_course_html(session.get(path).text)
+        yield page, courses
+        if not courses:
+            return
+        path = next_page_link(page_links, page)
+        page += 1
+
+
+class JsonlWriter:
+    """Writes one JSON object per line."""
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + "\n")
+
+
+class CsvWriter:
+    """Writes CATALOG_FIELDS columns, with a header only at the start of a new file."""
+
+    def __init__(self, file):
+        self.writer = csv.DictWriter(file, fieldnames=CATALOG_FIELDS)
+        if file.tell() == 0:
+            self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter}
+
+
+def progress_path(output_path):
+    return output_path + ".progress"
+
+
+def load_progress(output_path, academic_period, academic_year):
+    """Returns the saved progress of an earlier crawl into output_path, or None to start over."""
+    path = progress_path(output_path)
+    if not os.path.exists(path) or not os.path.exists(output_path):
+        return None
+    try:
+        with open(path, "r") as file:
+            progress = json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"Could not read {path} ({e}). Starting over.")
+        return None
+    if (progress.get("academic_period"), progress.get("academic_year")) != (academic_period, academic_year):
+        print(f"{output_path} holds a crawl of another term. Starting over.")
+        return None
+    return progress
+
+
+def save_progress(output_path, progress):
+    """Writes the progress file next to the output, replacing the old one in one step."""
+    path = progress_path(output_path)
+    with open(path + ".tmp", "w") as file:
+        json.dump(progress, file)
+    os.replace(path + ".tmp", path)
+
+
+def crawl_catalog(session, output_path=CATALOG_OUTPUT_FILE, output_format="jsonl", prefixes=CATALOG_PREFIXES,
+                  academic_period=ACADEMIC_PERIOD, academic_year=ACADEMIC_YEAR, resume=True):
+    """
+    Streams every offered course of the term to output_path and returns the number of rows written this run.
+    Rows of a page are flushed before the progress file is updated, and on resume the output is cut back
+    to the last recorded page, so an interruption never leaves duplicate or half-written rows.
+    The progress file is removed once every prefix is done, so only an interrupted crawl resumes.
+    """
+    progress = load_progress(output_path, academic_period, academic_year) if resume else None
+    if progress is None:
+        progress = {"academic_period": academic_period, "academic_year": academic_year,
+                    "done": [], "current": None, "page": 0, "offset": 0}
+    else:
+        print(f"Resuming crawl: {len(progress['done'])} prefixes done.")
+
+    written = 0
+    with open(output_path, "a+", newline="", encoding="utf-8") as file:
+        file.truncate(progress["offset"])
+        file.seek(progress["offset"])
+        writer = WRITERS[output_format](file)
+        for prefix in prefixes:
+            if prefix in progress["done"]:
+                continue
+            start_page = progress["page"] + 1 if progress["current"] == prefix else 1
+            count = 0
+            for page, courses in crawl_prefix(session, prefix, academic_period, academic_year, start_page):
+                for course in courses:
+                    if owning_prefix(course.course_code, prefixes) not in (prefix, None):
+                        continue
+                    record = {"academic_period": academic_period, "academic_year": academic_year,
+                              "prefix": prefix, "page": page}
+                    record.update(course._asdict())
+                    writer.write(record)
+                    count += 1
+                file.flush()
+                progress.update(current=prefix, page=page, offset=file.tell())
+                save_progress(output_path, progress)
+            written += count
+            progress["done"].append(prefix)
+            progress.update(current=None, page=0)
+            save_progress(output_path, progress)
+            print(f"{prefix}: {count} rows.")
+    # A finished crawl is not resumed: the next run fetches the term again instead of keeping stale rows
+    os.remove(progress_path(output_path))
+    return written
+
+
+def main():
+    """Logs in over HTTP and crawls the offered-course catalog of one term."""
+    from ismisOfferedCourses import load_credentials
+
+    parser = argparse.ArgumentParser(description="Stream the ISMIS offered-course catalog to JSONL or CSV.")
+    parser.add_argument("--period", default=ACADEMIC_PERIOD)
+    parser.add_argument("--year", default=ACADEMIC_YEAR)
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("--output", help=f"defaults to {CATALOG_OUTPUT_FILE} with the format's extension")
+    parser.add_argument("--prefixes", nargs="+", default=CATALOG_PREFIXES)
+    parser.add_argument("--restart", action="store_true", help="ignore the progress of an earlier crawl")
+    args = parser.parse_args()
+    output_path = args.output or os.path.splitext(CATALOG_OUTPUT_FILE)[0] + "." + args.format
+
+    username_input, password_input = load_credentials()
+    session = http_login(username_input, password_input)
+    if session is None:
+        return
+    try:
+        written = crawl_catalog(session, output_path, args.format, args.prefixes, args.period, args.year, not args.restart)
+        print(f"{written} rows written to {output_path}.")
+    finally:
+        tracer.save()
+    print("DONE!")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,8 @@ import time
 import getpass
 import os
 
+from ismisSession import BASE_URL
+
 # Configurations
 
 options = Options()
@@ -42,7 +44,7 @@ def getUserInput(prompt, maximumNumber = None):
         return getpass.getpass(prompt) # Censors password entry
 
 def loginAttempt(username, password):
-    browser.get("https://ismis.usc.edu.ph")
+    browser.get(BASE_URL)
     username = browser.find_element(By.ID, "Username")
     password = browser.find_element(By.ID, "Password")
     loginButton = browser.find_element(By.CSS_SELECTOR, "button.btn")
@@ -101,7 +103,7 @@ while(homepageCrash == True):
 
 time.sleep(5)
 print("Navigating to grades page...")
-browser.get("https://ismis.usc.edu.ph/ViewGrades")
+browser.get(f"{BASE_URL}/ViewGrades")
 
 try:
     body = WebDriverWait(browser, 60).until(
@@ -1,24 +1,20 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 import time
 import getpass
 import os
 
+from ismisDriver import LazyDriver
+from ismisSession import BASE_URL
+
 # Global Variables for Username and Password
 USERNAME = ""  # Replace with your ISMIS username
 PASSWORD = ""  # Replace with your ISMIS password
 
 # Configurations
-options = Options()
-options.headless = False  # Runs Chromium browser without being visible
-options.add_experimental_option("excludeSwitches", ["enable-logging"])  # Disables DevTools logs on terminal
-ser = Service("./chromedriver.exe")
-browser = webdriver.Chrome(service=ser, options=options)
+browser = LazyDriver()  # Chrome is only launched the first time a function uses the browser
 
 clear = lambda: os.system('cls' if os.name == 'nt' else 'clear')  # Clears terminal
 
@@ -44,7 +40,7 @@ def get_credentials():
 
 def login_attempt(username_input, password_input):
     """Attempts to log into the ISMIS website."""
-    browser.get("https://ismis.usc.edu.ph")
+    browser.get(BASE_URL)
     try:
         username = wait_for_element(By.ID, "Username")
         password = wait_for_element(By.ID, "Password")
@@ -88,7 +84,7 @@ def check_site_crash():
 def fetch_grades():
     """Fetches and prints the grade data."""
     try:
-        browser.get("https://ismis.usc.edu.ph/ViewGrades")
+        browser.get(f"{BASE_URL}/ViewGrades")
         body = wait_for_element(By.TAG_NAME, "body", timeout=60)
         tables = body.find_elements(By.CLASS_NAME, "table")
 
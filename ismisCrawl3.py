@@ -1,20 +1,20 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 import time
 import getpass
 import os
 
+from ismisDriver import LazyDriver
+from ismisSession import BASE_URL, http_login, copy_cookies_to_browser
+from ismisTrace import tracer
+from ismisExtract import extract_grade_records
+from ismisGrades import GradeStore, GradePageError, grade_store_path, format_grade_update
+
 # Configurations
-options = Options()
-options.headless = False  # Runs Chromium browser visibly
-options.add_experimental_option("excludeSwitches", ["enable-logging"])  # Disables DevTools logs
-ser = Service("./chromedriver.exe")
-browser = webdriver.Chrome(service=ser, options=options)
+USE_HTTP_LOGIN = True  # Logs in over plain HTTP first, the browser form is only a fallback
+browser = LazyDriver()  # Chrome is only launched the first time a function uses the browser
 
 clear = lambda: os.system('cls' if os.name == 'nt' else 'clear')  # Clears terminal
 
@@ -35,8 +35,10 @@ def load_credentials(file_path="credentials.txt"):
             file.write(f"{username}\n{password}")
         return username, password
 
+@tracer.traced()
 def wait_for_element(by, identifier, timeout=5, max_retries=10):
     """Waits for an element to be present and retries on connection or timeout errors."""
+    tracer.annotate(selector=identifier)
     retries = 0
     while retries < max_retries:
         try:
@@ -76,12 +78,13 @@ def check_site_crash_homepage():
         print("Homepage not loaded properly. Refreshing...")
         return True  # Crash detected
 
+@tracer.traced()
 def login_attempt(username_input, password_input, max_retries=5):
     """Attempts to log into the ISMIS website with retries."""
     retries = 0
     while retries < max_retries:
         try:
-            browser.get("https://ismis.usc.edu.ph")
+            browser.get(BASE_URL)
 
             # Ensure the login page is loaded properly
             while check_site_crash_login_page():
@@ -111,6 +114,20 @@ def login_attempt(username_input, password_input, max_retries=5):
                 raise e
     raise Exception("Failed to log in after multiple retries.")
 
+@tracer.traced()
+def http_login_to_browser(username_input, password_input):
+    """Logs in over plain HTTP and hands the cookies to the browser. Returns False if browser login is still needed."""
+    try:
+        session = http_login(username_input, password_input)
+    except Exception as e:
+        print(f"HTTP login failed ({e}). Falling back to browser login...")
+        return False
+    if session is None:
+        return False
+    copy_cookies_to_browser(session, browser)
+    return True
+
+@tracer.traced()
 def check_valid_login():
     """Checks if the login is successful."""
     try:
@@ -122,32 +139,39 @@ def check_valid_login():
     except TimeoutException:
         return True
 
-def fetch_grades():
-    """Fetches and prints the grade data."""
+@tracer.traced()
+def fetch_grades(store=None):
+    """Fetches and prints the grade data, and returns it as a list of GradeRecords.
+    With a GradeStore, unchanged terms are taken from the store and only new or changed grades are reported."""
     try:
-        browser.get("https://ismis.usc.edu.ph/ViewGrades")
-        body = wait_for_element(By.TAG_NAME, "body", timeout=15)
+        browser.get(f"{BASE_URL}/ViewGrades")
+        wait_for_element(By.TAG_NAME, "body", timeout=15)
         #body = wait_for_element(By.CLASS_NAME, "portlet-title", timeout=5) #Trying to make it that it loads the table.
-        tables = body.find_elements(By.CLASS_NAME, "table")
+        if store is None:
+            records = extract_grade_records(browser)
+        else:
+            update = store.update(browser.page_source)
+            print(format_grade_update(update) + "\n")
+            records = update.records
 
         print("{:20s} {:60s} {:7s} {:4s} {:4s}".format("Course Code", "Course Name", "Units", "MG", "FG"))
 
-        for table_index in range(len(tables)):
-            course_code = tables[table_index].find_elements(By.CLASS_NAME, "col-lg-3")
-            course_name = tables[table_index].find_elements(By.CLASS_NAME, "col-lg-6")
-            unit_num = tables[table_index].find_elements(By.CSS_SELECTOR, "td.hidden-xs")
-            grade_value = tables[table_index].find_elements(By.CSS_SELECTOR, "td.col-lg-1:not(.hidden-xs)")
-
-            grade_index = 0
-            for index in range(len(course_code)):
-                print("{:20s} {:60s} {:7s} {:4s} {:4s}".format(
-                    course_code[index].text, course_name[index].text, unit_num[index].text,
-                    grade_value[grade_index].text, grade_value[grade_index + 1].text
-                ))
-                grade_index += 2
+        table_index = None
+        for record in records:
+            if table_index is not None and record.table_index != table_index:
+                print("\n\n")
+            table_index = record.table_index
+            units = "" if record.units is None else f"{record.units:g}"
+            print("{:20s} {:60s} {:7s} {:4s} {:4s}".format(record.code, record.name, units, record.midterm, record.final))
+        if records:
             print("\n\n")
+        return records
     except TimeoutException:
         print("Error fetching grades. Please try again later.")
+        return []
+    except GradePageError as e:
+        print(f"{e} Your stored grades were kept.")
+        return []
 
 def main():
     """Main function to control the flow of the program."""
@@ -164,6 +188,8 @@ def main():
     username_input, password_input = load_credentials()
 
     # Login process
+    if USE_HTTP_LOGIN:
+        login_status = http_login_to_browser(username_input, password_input)
     while not login_status:
         clear()
         login_status = login_attempt(username_input, password_input)
@@ -178,7 +204,7 @@ def main():
         browser.refresh()
         time.sleep(5)
 
-    fetch_grades()
+    fetch_grades(GradeStore(grade_store_path(username_input)))
     print("DONE!")
     browser.quit()
 
@@ -188,4 +214,5 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        tracer.save()
         browser.quit()
@@ -0,0 +1,101 @@
+import os
+
+# Configurations
+CHROMEDRIVER_PATH = os.environ.get("ISMIS_CHROMEDRIVER", "./chromedriver.exe")  # Set it to a chromedriver matching the installed Chrome, e.g. on Linux or macOS
+BROWSER_PROFILE = os.environ.get("ISMIS_BROWSER_PROFILE", "visible")  # "visible": a normal window. "lean": headless, eager, heavy resources blocked
+WINDOW_SIZE = "1366,900"  # Headless Chrome defaults to 800x600, which hides some of the ISMIS buttons
+
+# Resources the crawler never needs. Stylesheets are kept: the modals are hidden by CSS
+# and the visibility checks on #modal1 / #modal2 depend on it.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*analytics*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*", "*hotjar.com*",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+]
+
+
+def apply_lean_options(options):
+    """Headless Chrome that returns from get() at DOMContentLoaded and never decodes images."""
+    options.add_argument("--headless=new")  # options.headless is deprecated and ignored by current Selenium
+    options.add_argument(f"--window-size={WINDOW_SIZE}")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--mute-audio")
+    options.add_argument("--no-first-run")
+    options.add_argument("--disable-background-networking")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    options.page_load_strategy = "eager"  # The scripts wait for the elements they need anyway
+
+
+def block_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    """Makes Chrome refuse requests matching the patterns before they reach the network."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+def create_driver(driver_path=CHROMEDRIVER_PATH, profile=None, capture_network=False):
+    """Starts a Chrome WebDriver with the crawler's usual options. Selenium is only imported here.
+    profile is "lean" or "visible" and defaults to BROWSER_PROFILE. capture_network turns on the
+    performance log that ismisCapture reads AJAX responses from."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    profile = profile or BROWSER_PROFILE
+    options = Options()
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])  # Disables DevTools logs
+    if profile == "lean":
+        apply_lean_options(options)
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    if profile == "lean":
+        block_resources(driver)
+    return driver
+
+
+class LazyDriver:
+    """Stands in for a WebDriver and only launches the browser the first time it is used."""
+
+    def __init__(self, factory=create_driver):
+        self._factory = factory
+        self._driver = None
+
+    @property
+    def started(self):
+        """True once the real browser has been launched."""
+        return self._driver is not None
+
+    def get_driver(self):
+        """Returns the real WebDriver, launching it on first use."""
+        if self._driver is None:
+            self._driver = self._factory()
+        return self._driver
+
+    def use(self, driver):
+        """Injects an already running WebDriver instead of launching one."""
+        self._driver = driver
+
+    def quit(self):
+        """Shuts the browser down if it was ever started. Safe to call more than once."""
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            finally:
+                self._driver = None
+
+    def __getattr__(self, name):
+        # Only called for attributes LazyDriver itself does not define
+        return getattr(self.get_driver(), name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.quit()
+        return False
+
@@ -0,0 +1,275 @@
+# End-to-end benchmark of the login, advise and schedule flows against the mock ISMIS server.
+# Every phase is run repeatedly and reported as p50/p95/p99 wall time plus the number of
+# HTTP requests or WebDriver commands it took, and the whole run is saved as JSON so a
+# later run can be compared against it:
+#
+#     python ismisE2EBenchmark.py --repeat 20 --output before.json
+#     python ismisE2EBenchmark.py --repeat 20 --output after.json --compare before.json
+#     python ismisE2EBenchmark.py --profiles visible lean   # Browser profiles side by side
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import statistics
+import time
+from contextlib import contextmanager
+
+from ismisAsyncAdvise import load_advise_links, advise_course
+from ismisDriver import create_driver
+from ismisExtract import parse_modal_links, find_modal_link, parse_schedule_html
+from ismisMockServer import MockSettings, MOCK_USERNAME, MOCK_PASSWORD, start_mock_server
+from ismisSession import ISMISSession
+
+# Configurations
+BENCHMARK_RESULTS_FILE = "benchmark_results.json"
+BENCHMARK_REPEAT = 10
+BENCHMARK_COURSES = ["CPE 2301", "CPE 2302", "CPE 2303L"]
+BENCHMARK_LATENCY = 0.05  # Mock server latency in seconds, roughly a good campus connection
+BENCHMARK_JITTER = 0.05
+REGRESSION_THRESHOLD = 0.2  # A phase whose p95 grows by more than this fraction is reported
+PAGE_LOAD_PATHS = ["/", "/ViewGrades", "/advisedcourse", "/courseSchedule/CourseScheduleOfferedIndex"]
+
+
+# Functions
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize_phase(timings, calls):
+    """Returns the p50/p95/p99/mean wall time in milliseconds and the median calls per run."""
+    return {
+        "runs": len(timings),
+        "p50_ms": round(percentile(timings, 0.50), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+        "p99_ms": round(percentile(timings, 0.99), 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+        "calls_per_run": statistics.median(calls),
+        "max_calls": max(calls),
+    }
+
+
+class CommandCounter:
+    """Counts the WebDriver commands sent by a driver, including the ones sent through its elements."""
+
+    def __init__(self, driver):
+        self.count = 0
+        self.commands = {}
+        execute = driver.execute
+
+        def counted_execute(command, params=None):
+            self.count += 1
+            self.commands[command] = self.commands.get(command, 0) + 1
+            return execute(command, params)
+
+        driver.execute = counted_execute  # WebElement commands go through their parent's execute too
+
+
+class PhaseRecorder:
+    """Collects the wall time and call count of every run of every phase."""
+
+    def __init__(self):
+        self.timings = {}
+        self.calls = {}
+
+    @contextmanager
+    def phase(self, name, call_count):
+        """Times the enclosed block. call_count returns the running total of HTTP requests or WebDriver commands."""
+        calls_before = call_count()
+        start = time.perf_counter()
+        yield
+        self.timings.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        self.calls.setdefault(name, []).append(call_count() - calls_before)
+
+    def results(self):
+        return {name: summarize_phase(timings, self.calls[name]) for name, timings in self.timings.items()}
+
+
+def benchmark_http(recorder, base_url, course_codes, repeat, reset=None):
+    """Runs the plain HTTP flows: login, opening the advise modal, advising each course and reading each schedule."""
+    for _ in range(repeat):
+        session = ISMISSession(base_url)
+        count = lambda: session.request_count
+
+        with recorder.phase("http_login", count):
+            session.login(MOCK_USERNAME, MOCK_PASSWORD)
+
+        with recorder.phase("http_navigate_to_advise_course", count):
+            links = asyncio.run(load_advise_links(session))
+
+        if reset is not None:
+            reset()
+        for course_code in course_codes:
+            with recorder.phase("http_advise_course", count):
+                asyncio.run(advise_course(session, course_code, links, asyncio.Semaphore(1)))
+
+        page_links = parse_modal_links(session.get("/advisedcourse").text)
+        for course_code in course_codes:
+            href = find_modal_link(page_links, f"Click to view schedule  {course_code}")
+            if href is None:
+                continue
+            with recorder.phase("http_schedule", count):
+                parse_schedule_html(session.get(href, ajax=True).text)
+
+
+def benchmark_browser(recorder, base_url, course_codes, repeat, reset=None, profile="lean", server=None, capture=True):
+    """Runs the Selenium flows of ismisAdvisedCourse2 in one browser profile: login_attempt + check_valid_login,
+    plain page loads, navigate_to_advise_course, advise_course_codes per course and the schedule_* reads.
+    capture=False reads the advise outcomes from the rendered modal instead of the network log.
+    Returns the WebDriver command counts and, with the in-process mock, the bytes it served."""
+    import ismisAdvisedCourse2 as advised
+
+    advised.BASE_URL = base_url
+    advised.USE_NETWORK_CAPTURE = capture
+    advised.modal_capture = None
+    advised.browser.use(create_driver(profile=profile, capture_network=capture))
+    bytes_before = server.bytes_sent if server is not None else 0
+    name = lambda phase: f"browser_{profile}_{phase}"
+    schedule_functions = {
+        "CPE 2301": advised.schedule_CPE_2301,
+        "CPE 2302": advised.schedule_CPE_2302,
+        "CPE 2303L": advised.schedule_CPE_2303L,
+        "CPES 2201": advised.schedule_CPES,
+    }
+    counter = CommandCounter(advised.browser.get_driver())
+    count = lambda: counter.count
+    try:
+        for _ in range(repeat):
+            advised.browser.delete_all_cookies()
+
+            with recorder.phase(name("login"), count):
+                advised.login_attempt(MOCK_USERNAME, MOCK_PASSWORD)
+                advised.check_valid_login()
+
+            for path in PAGE_LOAD_PATHS:
+                with recorder.phase(name("page_load"), count):
+                    advised.browser.get(base_url + path)
+
+            if reset is not None:
+                reset()
+            with recorder.phase(name("navigate_to_advise_course"), count):
+                advised.navigate_to_advise_course()
+
+            for course_code in course_codes:
+                with recorder.phase(name("advise_course"), count):
+                    advised.advise_course_codes([course_code])
+            advised.close_remaining_courses_modal()
+
+            advised.navigate_to_page_with_retry(f"{base_url}/advisedcourse", "#AdvisedCourseList")
+            for course_code in course_codes:
+                if course_code not in schedule_functions:
+                    continue
+                with recorder.phase(name("schedule"), count):
+                    schedule_functions[course_code]()
+    finally:
+        advised.browser.quit()
+    result = {"webdriver_commands": counter.commands}
+    if server is not None:
+        result["bytes_served"] = server.bytes_sent - bytes_before
+    return result
+
+
+def compare_results(previous, current, threshold=REGRESSION_THRESHOLD):
+    """Returns (phase, old p95, new p95) for every phase whose p95 grew by more than threshold."""
+    regressions = []
+    for name, stats in current["phases"].items():
+        old = previous.get("phases", {}).get(name)
+        if old and stats["p95_ms"] > old["p95_ms"] * (1 + threshold):
+            regressions.append((name, old["p95_ms"], stats["p95_ms"]))
+    return regressions
+
+
+def print_results(results):
+    """Prints one line per phase, then the bytes each browser profile pulled from the server."""
+    print("{:44s} {:>6s} {:>10s} {:>10s} {:>10s} {:>8s}".format("Phase", "Runs", "p50 ms", "p95 ms", "p99 ms", "Calls"))
+    for name, stats in results["phases"].items():
+        print("{:44s} {:6d} {:10.2f} {:10.2f} {:10.2f} {:8}".format(
+            name, stats["runs"], stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["calls_per_run"]))
+    for profile, browser in results.get("browsers", {}).items():
+        if "bytes_served" in browser:
+            print(f"Profile '{profile}': {browser['bytes_served'] / 1024:.0f} KiB served")
+
+
+def print_profile_comparison(results, baseline, candidate):
+    """Prints the p50 of every browser phase of two profiles side by side."""
+    print("{:28s} {:>12s} {:>12s} {:>9s}".format("Browser phase", f"{baseline} p50", f"{candidate} p50", "Change"))
+    prefix = f"browser_{baseline}_"
+    for name, stats in results["phases"].items():
+        if not name.startswith(prefix):
+            continue
+        phase = name[len(prefix):]
+        other = results["phases"].get(f"browser_{candidate}_{phase}")
+        if other is None:
+            continue
+        change = (other["p50_ms"] - stats["p50_ms"]) / max(stats["p50_ms"], 0.001)
+        print("{:28s} {:12.2f} {:12.2f} {:>+9.0%}".format(phase, stats["p50_ms"], other["p50_ms"], change))
+
+
+def main():
+    """Starts the mock server (unless --base-url is given), runs the benchmarks and writes the JSON results."""
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of the ISMIS crawler flows.")
+    parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT)
+    parser.add_argument("--courses", nargs="+", default=BENCHMARK_COURSES)
+    parser.add_argument("--output", default=BENCHMARK_RESULTS_FILE)
+    parser.add_argument("--compare", help="earlier results file to check for p95 regressions")
+    parser.add_argument("--base-url", help="use an already running server instead of starting the mock")
+    parser.add_argument("--latency", type=float, default=BENCHMARK_LATENCY)
+    parser.add_argument("--jitter", type=float, default=BENCHMARK_JITTER)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-browser", action="store_true", help="only run the HTTP flows")
+    parser.add_argument("--profiles", nargs="+", default=["lean"], choices=["visible", "lean"],
+                        help="browser profiles to run, e.g. 'visible lean' for a before/after comparison")
+    parser.add_argument("--dom-modals", action="store_true",
+                        help="read advise outcomes by polling the modal instead of capturing the AJAX responses")
+    args = parser.parse_args()
+
+    server = None
+    reset = None
+    base_url = args.base_url
+    if base_url is None:
+        server = start_mock_server(MockSettings(latency=args.latency, jitter=args.jitter, seed=args.seed))
+        base_url = server.base_url
+        reset = server.reset_students
+
+    recorder = PhaseRecorder()
+    results = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "base_url": base_url,
+        "repeat": args.repeat,
+        "courses": args.courses,
+        "mock": None if server is None else {"latency": args.latency, "jitter": args.jitter, "seed": args.seed},
+    }
+    try:
+        benchmark_http(recorder, base_url, args.courses, args.repeat, reset)
+        if not args.no_browser:
+            results["browsers"] = {
+                profile: benchmark_browser(recorder, base_url, args.courses, args.repeat, reset, profile, server,
+                                           not args.dom_modals)
+                for profile in args.profiles
+            }
+    finally:
+        if server is not None:
+            server.shutdown()
+            results["server_requests"] = server.path_counts
+
+    results["phases"] = recorder.results()
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print_results(results)
+    if not args.no_browser and len(args.profiles) > 1:
+        print_profile_comparison(results, args.profiles[0], args.profiles[-1])
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            regressions = compare_results(json.load(file), results)
+        for name, old, new in regressions:
+            print(f"Regression: {name} p95 went from {old} ms to {new} ms.")
+        if not regressions:
+            print(f"No phase got more than {REGRESSION_THRESHOLD:.0%} slower than {args.compare}.")
+
+
+if __name__ == "__main__":
+    main()
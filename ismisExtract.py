@@ -0,0 +1,372 @@
+# Bulk table extractors. Each one reads a whole table with a single execute_script
+# call instead of one find_element round trip per cell.
+from collections import namedtuple
+from html.parser import HTMLParser
+
+from ismisTrace import tracer
+
+SCHEDULE_TABLE_SCRIPT = """
+var rows = document.querySelectorAll(arguments[0]);
+var result = [];
+for (var i = 0; i < rows.length; i++) {
+    var cells = rows[i].cells;
+    var text = function (index) {
+        return cells.length > index ? cells[index].innerText.trim() : null;
+    };
+    var schedule = cells.length > 2 ? cells[2].querySelector("span") : null;
+    var link = rows[i].querySelector("a.green.rs-modal");
+    result.push({
+        block_number: text(0),
+        course_code: text(1),
+        schedule: schedule ? schedule.innerText.trim() : null,
+        course_status: text(3),
+        population: text(4),
+        link: link ? link.href : null
+    });
+}
+return result;
+"""
+
+SCHEDULE_FIELDS = ("block_number", "course_code", "schedule", "course_status", "population", "link")
+
+
+def extract_schedule_rows(browser, row_selector="#EnrollBody tr"):
+    """Returns every schedule row as a dict. Rows missing a cell have None in that field."""
+    with tracer.span("extract_schedule_rows", "extract") as span:
+        rows = browser.execute_script(SCHEDULE_TABLE_SCRIPT, row_selector) or []
+        span.set(rows=len(rows))
+    return rows
+
+
+def is_complete_schedule_row(row):
+    """Checks that a schedule row has every field the old per-cell reader required."""
+    return all(row.get(field) is not None for field in SCHEDULE_FIELDS)
+
+
+def print_schedule_rows(rows):
+    """Prints schedule rows in the same layout as the schedule_* functions."""
+    for row in rows:
+        if not is_complete_schedule_row(row):
+            print("A schedule row was missing expected details and was skipped.")
+            continue
+        print(f"Block #: {row['block_number']}")
+        print(f"Course Code: {row['course_code']}")
+        print(f"Schedule: {row['schedule']}")
+        print(f"Course Status: {row['course_status']}")
+        print(f"Population: {row['population']}")
+        print(f"Link: {row['link']}")
+        print("-" * 40)
+
+
+GRADE_TABLE_SCRIPT = """
+var tables = document.querySelectorAll("table.table");
+var result = [];
+for (var t = 0; t < tables.length; t++) {
+    var portlet = tables[t].closest(".portlet");
+    var title = portlet ? portlet.querySelector(".portlet-title") : null;
+    var term = title ? title.innerText.trim() : "";
+    var rows = tables[t].querySelectorAll("tr");
+    for (var i = 0; i < rows.length; i++) {
+        var code = rows[i].querySelector(".col-lg-3");
+        if (!code) { continue; }
+        var name = rows[i].querySelector(".col-lg-6");
+        var units = rows[i].querySelector("td.hidden-xs");
+        var grades = rows[i].querySelectorAll("td.col-lg-1:not(.hidden-xs)");
+        result.push([
+            code.innerText.trim(),
+            name ? name.innerText.trim() : "",
+            units ? units.innerText.trim() : "",
+            grades.length > 0 ? grades[0].innerText.trim() : "",
+            grades.length > 1 ? grades[1].innerText.trim() : "",
+            term,
+            t
+        ]);
+    }
+}
+return result;
+"""
+
+GradeRecord = namedtuple("GradeRecord", ["code", "name", "units", "midterm", "final", "term", "table_index"])
+
+
+def parse_units(text):
+    """Converts a units cell to a float, or None when it is blank or not a number."""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_grade_records(browser):
+    """Returns every course row from every term table on /ViewGrades as GradeRecords, in page order."""
+    with tracer.span("extract_grade_records", "extract") as span:
+        rows = browser.execute_script(GRADE_TABLE_SCRIPT) or []
+        span.set(rows=len(rows))
+    return [
+        GradeRecord(code, name, parse_units(units), midterm, final, term, table_index)
+        for code, name, units, midterm, final, term, table_index in rows
+    ]
+
+
+OFFERED_COURSE_TABLE_SCRIPT = """
+var rows = document.querySelectorAll(arguments[0]);
+var result = [];
+for (var i = 0; i < rows.length; i++) {
+    var cells = rows[i].querySelectorAll("td");
+    if (cells.length < 7) { continue; }
+    var values = [];
+    var empty = true;
+    for (var c = 0; c < 7; c++) {
+        values.push(cells[c].innerText.trim());
+        if (values[c]) { empty = false; }
+    }
+    if (!empty) { result.push(values); }
+}
+return result;
+"""
+
+OfferedCourse = namedtuple(
+    "OfferedCourse",
+    ["course_code", "description", "status", "teachers", "schedule", "department", "enrolled"],
+)
+
+
+def extract_offered_course_rows(browser, row_selector="tr"):
+    """Returns every data row of the offered-courses table as OfferedCourses, skipping header and empty rows."""
+    with tracer.span("extract_offered_course_rows", "extract") as span:
+        rows = browser.execute_script(OFFERED_COURSE_TABLE_SCRIPT, row_selector) or []
+        span.set(rows=len(rows))
+    return [OfferedCourse(*values) for values in rows]
+
+
+class ModalLinkParser(HTMLParser):
+    """Collects the title and href of every rs-modal link in a page or AJAX modal body."""
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        attrs = dict(attrs)
+        if "rs-modal" in (attrs.get("class") or "").split() and attrs.get("href"):
+            self.links.append((attrs.get("title") or "", attrs["href"]))
+
+
+def parse_modal_links(html):
+    """Returns (title, href) pairs for the rs-modal links in an HTML string."""
+    parser = ModalLinkParser()
+    parser.feed(html)
+    return parser.links
+
+
+def find_modal_link(links, title_part):
+    """Returns the href of the first link whose title contains title_part, like a[title*='...'], or None."""
+    for title, href in links:
+        if title_part in title:
+            return href
+    return None
+
+
+VOID_TAGS = {"br", "img", "input", "hr", "meta", "link", "col", "area", "base", "wbr"}  # Tags that never get an end tag
+
+
+class ScheduleTableParser(HTMLParser):
+    """Reads the #EnrollBody rows of a schedule modal from raw HTML, for pages fetched without a browser."""
+
+    def __init__(self, body_id="EnrollBody"):
+        super().__init__()
+        self.body_id = body_id
+        self.rows = []
+        self._depth = 0  # Open tags inside the table body, 0 when outside it
+        self._row = None
+        self._cell = None
+        self._span = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if self._depth == 0:
+            if attrs.get("id") == self.body_id:
+                self._depth = 1
+            return
+        if tag not in VOID_TAGS:
+            self._depth += 1
+        if tag == "tr":
+            self._row = {"cells": [], "span": None, "link": None}
+        elif tag == "td" and self._row is not None:
+            self._cell = []
+            self._row["cells"].append(self._cell)
+        elif tag == "span" and self._cell is not None and len(self._row["cells"]) == 3 and self._row["span"] is None:
+            self._span = []
+        elif tag == "a" and self._row is not None and self._row["link"] is None:
+            if {"green", "rs-modal"} <= set((attrs.get("class") or "").split()):
+                self._row["link"] = attrs.get("href")
+
+    def handle_endtag(self, tag):
+        if self._depth == 0 or tag in VOID_TAGS:
+            return
+        self._depth -= 1
+        if tag == "span" and self._span is not None:
+            self._row["span"] = " ".join("".join(self._span).split())
+            self._span = None
+        elif tag == "td":
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._schedule_row(self._row))
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+        if self._span is not None:
+            self._span.append(data)
+
+    @staticmethod
+    def _schedule_row(row):
+        cells = [" ".join("".join(cell).split()) for cell in row["cells"]]
+        text = lambda index: cells[index] if len(cells) > index else None
+        return {
+            "block_number": text(0),
+            "course_code": text(1),
+            "schedule": row["span"],
+            "course_status": text(3),
+            "population": text(4),
+            "link": row["link"],
+        }
+
+
+def parse_schedule_html(html):
+    """Returns the #EnrollBody rows in an HTML string, in the same dict format as extract_schedule_rows."""
+    with tracer.span("parse_schedule_html", "extract") as span:
+        parser = ScheduleTableParser()
+        parser.feed(html)
+        span.set(rows=len(parser.rows))
+    return parser.rows
+
+
+class OfferedCourseTableParser(HTMLParser):
+    """Reads the offered-course rows and the pagination links of a results page from raw HTML."""
+
+    def __init__(self):
+        super().__init__()
+        self.courses = []
+        self.page_links = []  # (link text, href) of the links inside .pagination
+        self._cells = None
+        self._cell = None
+        self._pagination_depth = 0  # Open tags inside the .pagination list, 0 when outside it
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if self._pagination_depth:
+            if tag not in VOID_TAGS:
+                self._pagination_depth += 1
+            if tag == "a" and attrs.get("href"):
+                self._link = [attrs["href"], []]
+        elif "pagination" in (attrs.get("class") or "").split():
+            self._pagination_depth = 1
+        if tag == "tr":
+            self._cells = []
+        elif tag == "td" and self._cells is not None:
+            self._cell = []
+            self._cells.append(self._cell)
+
+    def handle_endtag(self, tag):
+        if self._pagination_depth and tag not in VOID_TAGS:
+            self._pagination_depth -= 1
+            if tag == "a" and self._link is not None:
+                self.page_links.append((" ".join("".join(self._link[1]).split()), self._link[0]))
+                self._link = None
+        if tag == "td":
+            self._cell = None
+        elif tag == "tr" and self._cells is not None:
+            values = [" ".join("".join(cell).split()) for cell in self._cells[:7]]
+            if len(values) == 7 and any(values):
+                self.courses.append(OfferedCourse(*values))
+            self._cells = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+        if self._link is not None:
+            self._link[1].append(data)
+
+
+def parse_offered_course_html(html):
+    """Returns (OfferedCourses, pagination links) of an offered-course results page, like extract_offered_course_rows."""
+    parser = OfferedCourseTableParser()
+    parser.feed(html)
+    return parser.courses, parser.page_links
+
+
+class GradeTableParser(HTMLParser):
+    """Reads the grade rows of /ViewGrades term tables from raw HTML, like GRADE_TABLE_SCRIPT."""
+
+    def __init__(self, table_index=0):
+        super().__init__()
+        self.records = []
+        self.term = ""
+        self.table_index = table_index - 1
+        self._title = None  # Text of the open .portlet-title, None when outside it
+        self._title_depth = 0
+        self._cells = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if self._title is not None and tag not in VOID_TAGS:
+            self._title_depth += 1
+        elif "portlet-title" in classes:
+            self._title = []
+            self._title_depth = 1
+        if tag == "table" and "table" in classes:
+            self.table_index += 1
+        elif tag == "tr":
+            self._cells = []
+        elif tag == "td" and self._cells is not None:
+            self._cell = [classes, []]
+            self._cells.append(self._cell)
+
+    def handle_endtag(self, tag):
+        if self._title is not None and tag not in VOID_TAGS:
+            self._title_depth -= 1
+            if self._title_depth == 0:
+                self.term = " ".join("".join(self._title).split())
+                self._title = None
+        if tag == "td":
+            self._cell = None
+        elif tag == "tr" and self._cells is not None:
+            self._add_record(self._cells)
+            self._cells = None
+
+    def handle_data(self, data):
+        if self._title is not None:
+            self._title.append(data)
+        if self._cell is not None:
+            self._cell[1].append(data)
+
+    def _add_record(self, cells):
+        text = lambda cell: " ".join("".join(cell[1]).split()) if cell else ""
+        first = lambda predicate: next((cell for cell in cells if predicate(cell[0])), None)
+        code = first(lambda classes: "col-lg-3" in classes)
+        if code is None:
+            return
+        grades = [cell for cell in cells if "col-lg-1" in cell[0] and "hidden-xs" not in cell[0]]
+        self.records.append(GradeRecord(
+            text(code),
+            text(first(lambda classes: "col-lg-6" in classes)),
+            parse_units(text(first(lambda classes: "hidden-xs" in classes))),
+            text(grades[0]) if len(grades) > 0 else "",
+            text(grades[1]) if len(grades) > 1 else "",
+            self.term,
+            self.table_index,
+        ))
+
+
+def parse_grade_html(html, table_index=0):
+    """Returns the GradeRecords in a /ViewGrades page or part of one, numbering tables from table_index."""
+    parser = GradeTableParser(table_index)
+    parser.feed(html)
+    return parser.records
@@ -0,0 +1,164 @@
+# Local grade history. Every /ViewGrades term table is fingerprinted, so later runs only parse
+# the terms whose HTML changed and can report just the new or changed grades.
+from collections import namedtuple
+import hashlib
+import json
+import os
+import re
+import time
+
+from ismisExtract import GradeRecord, parse_grade_html
+from ismisTrace import tracer
+
+# Configurations
+GRADE_STORE_FILE = "grades_{username}.json"  # One store per account
+VIEW_GRADES_PATH = "/ViewGrades"
+
+# Splits a page right before each element whose class list has "portlet" (not portlet-title or portlet-body)
+PORTLET_START = re.compile(r"""(?=<div\b[^>]*\bclass=["'](?:[^"']*\s)?portlet(?:\s[^"']*)?["'])""", re.IGNORECASE)
+
+GradeUpdate = namedtuple("GradeUpdate", ["records", "new_grades", "changed_grades", "parsed_terms", "skipped_terms", "first_run"])
+
+
+class GradePageError(Exception):
+    """Raised when a page has no grade tables, e.g. the login page or a 503. The store is left as it was."""
+
+
+def grade_store_path(username):
+    """Returns the grade store file for an account."""
+    return GRADE_STORE_FILE.format(username="".join(c for c in username if c.isalnum()) or "default")
+
+
+def split_grade_terms(html):
+    """
+    Cuts a /ViewGrades page into one chunk per term portlet that holds a table, without parsing it.
+    Each chunk ends at its last </table>, so page content after the tables does not change the fingerprint.
+    """
+    chunks = []
+    for chunk in PORTLET_START.split(html):
+        end = chunk.lower().rfind("</table>")
+        if end != -1:
+            chunks.append(chunk[:end + len("</table>")])
+    return chunks
+
+
+def fingerprint(chunk):
+    """Hash of a term chunk that ignores whitespace-only differences."""
+    return hashlib.sha256(" ".join(chunk.split()).encode("utf-8")).hexdigest()
+
+
+def format_grade_records(records):
+    """Formats GradeRecords the way fetch_grades prints them, with a blank gap between terms."""
+    lines = ["{:20s} {:60s} {:7s} {:4s} {:4s}".format("Course Code", "Course Name", "Units", "MG", "FG")]
+    term = None
+    for record in records:
+        if record.term != term:
+            lines.append("")
+            lines.append(record.term)
+            term = record.term
+        units = "" if record.units is None else f"{record.units:g}"
+        lines.append("{:20s} {:60s} {:7s} {:4s} {:4s}".format(record.code, record.name, units, record.midterm, record.final))
+    return "\n".join(lines)
+
+
+def format_grade_update(update):
+    """Summarizes an update in a few lines: new and changed grades, or that nothing changed."""
+    if update.first_run:
+        return f"Stored {len(update.records)} grades from {update.parsed_terms} term(s)."
+    lines = []
+    for record in update.new_grades:
+        lines.append(f"New: {record.code} ({record.term}) MG {record.midterm or '-'} FG {record.final or '-'}")
+    for old, new in update.changed_grades:
+        lines.append(f"Changed: {new.code} ({new.term}) MG {old.midterm or '-'} -> {new.midterm or '-'},"
+                     f" FG {old.final or '-'} -> {new.final or '-'}")
+    if not lines:
+        lines.append("No new grades.")
+    lines.append(f"({update.parsed_terms} term(s) parsed, {update.skipped_terms} unchanged.)")
+    return "\n".join(lines)
+
+
+class GradeStore:
+    """JSON file of the last seen term tables: fingerprint, term title and GradeRecords per table, in page order."""
+
+    def __init__(self, path):
+        self.path = path
+        self.terms = []
+        self.checked_at = None
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+            self.terms = [
+                {"fingerprint": term["fingerprint"], "term": term["term"],
+                 "records": [GradeRecord(*record) for record in term["records"]]}
+                for term in data.get("terms", [])
+            ]
+            self.checked_at = data.get("checked_at")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Could not read {self.path} ({e}). Starting a new grade store.")
+            self.terms = []
+
+    def save(self):
+        data = {
+            "checked_at": self.checked_at,
+            "terms": [{"fingerprint": term["fingerprint"], "term": term["term"],
+                       "records": [list(record) for record in term["records"]]} for term in self.terms],
+        }
+        with open(self.path + ".tmp", "w") as file:
+            json.dump(data, file, indent=2)
+        os.replace(self.path + ".tmp", self.path)
+
+    def records(self):
+        """Every stored GradeRecord in page order."""
+        return [record for term in self.terms for record in term["records"]]
+
+    @tracer.traced("update_grades", "grades")
+    def update(self, html):
+        """
+        Reads a /ViewGrades page. Term tables whose fingerprint is already stored are reused without parsing.
+        Saves the store and returns a GradeUpdate with the grades that are new or changed since the last run.
+        Raises GradePageError without touching the store when the page holds no term tables.
+        """
+        chunks = split_grade_terms(html)
+        if not chunks:
+            raise GradePageError("The grades page did not load. Is the session still logged in?")
+        known = {term["fingerprint"]: term for term in self.terms}
+        old_records = {(record.term, record.code): record for record in self.records()}
+        terms = []
+        parsed = 0
+        for index, chunk in enumerate(chunks):
+            digest = fingerprint(chunk)
+            term = known.get(digest)
+            if term is None:
+                records = parse_grade_html(chunk, index)
+                term = {"fingerprint": digest, "term": records[0].term if records else "", "records": records}
+                parsed += 1
+            else:
+                term = dict(term, records=[record._replace(table_index=index) for record in term["records"]])
+            terms.append(term)
+
+        new_grades, changed_grades = [], []
+        for term in terms:
+            if term["fingerprint"] in known:
+                continue
+            for record in term["records"]:
+                old = old_records.get((record.term, record.code))
+                if old is None:
+                    new_grades.append(record)
+                elif (old.midterm, old.final) != (record.midterm, record.final):
+                    changed_grades.append((old, record))
+
+        self.terms = terms
+        self.checked_at = time.time()
+        self.save()
+        tracer.annotate(parsed=parsed, skipped=len(terms) - parsed)
+        return GradeUpdate(self.records(), new_grades, changed_grades, parsed, len(terms) - parsed, not known)
+
+
+def check_grades(session, store):
+    """Fetches /ViewGrades over an ISMISSession and updates the store. Returns the GradeUpdate."""
+    return store.update(session.get(VIEW_GRADES_PATH).text)
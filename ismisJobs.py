@@ -0,0 +1,234 @@
+# Background job runner for the GUI. One long-lived worker thread owns one HTTP session and runs the
+# queued jobs (advise, schedule, watch) one after another. State changes are handed to a post function,
+# which the GUI points at Kivy's Clock, and progress lines to on_progress, which the GUI points at its
+# ProgressChannel, so nothing here ever runs on the UI thread.
+import queue
+import threading
+import time
+
+from ismisAsyncAdvise import advise_courses
+from ismisExtract import parse_modal_links, find_modal_link, parse_schedule_html
+from ismisSeatWatcher import SeatWatcher, POLL_INTERVAL
+from ismisTrace import tracer
+
+# Configurations
+AUTO_ENROLL_COURSES = ["CPE 2301", "CPE 2302", "CPE 2303L"]  # Courses the "Auto Enroll" button advises and then watches
+ADVISE_CONCURRENCY = 4
+PAUSE_POLL_INTERVAL = 0.5  # How often a paused job checks whether it was resumed or cancelled
+
+QUEUED, RUNNING, PAUSED, DONE, FAILED, CANCELLED = "queued", "running", "paused", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job at its next checkpoint after cancel()."""
+
+
+class Job:
+    """One unit of work: func(context, *args) runs on the worker thread."""
+
+    def __init__(self, name, func, args=()):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class JobContext:
+    """What a running job gets: the runner's session, a way to report progress, and pause/cancel checkpoints."""
+
+    def __init__(self, runner, job):
+        self.runner = runner
+        self.job = job
+
+    @property
+    def session(self):
+        return self.runner.session
+
+    @property
+    def credentials(self):
+        return self.runner.credentials
+
+    def report(self, message):
+        """Sends a progress line to the GUI through on_progress, which is called on the worker thread."""
+        self.runner.on_progress(self.job, message)
+
+    def checkpoint(self):
+        """Raises JobCancelled after cancel() and blocks while the runner is paused."""
+        if self.job.cancelled.is_set():
+            raise JobCancelled()
+        if self.runner.paused.is_set():
+            self.runner.set_status(self.job, PAUSED)
+            while self.runner.paused.is_set():
+                if self.job.cancelled.wait(PAUSE_POLL_INTERVAL):
+                    raise JobCancelled()
+            self.runner.set_status(self.job, RUNNING)
+
+    def sleep(self, seconds):
+        """Waits like time.sleep, but wakes up at once on cancel and does not count paused time."""
+        deadline = time.monotonic() + seconds
+        while True:
+            checked_at = time.monotonic()
+            self.checkpoint()
+            deadline += time.monotonic() - checked_at  # Time spent paused
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self.job.cancelled.wait(min(remaining, PAUSE_POLL_INTERVAL)):
+                raise JobCancelled()
+
+
+class JobRunner:
+    """
+    Runs submitted jobs in order on a single worker thread. The session is made by session_factory on that
+    thread the first time a job needs it and kept for every later job, so an overnight run logs in once.
+    on_status(job) is called through post, e.g. a Clock.schedule_once wrapper. on_progress(job, message) can
+    fire many times a second and is called on the worker thread, so it should only hand the message off,
+    e.g. to a ProgressChannel.
+    """
+
+    def __init__(self, session_factory, credentials=None, post=None, on_progress=None, on_status=None):
+        self.session_factory = session_factory
+        self.credentials = credentials
+        self.post = post or (lambda callback, *args: callback(*args))
+        self.on_progress = on_progress or (lambda job, message: print(f"{job.name}: {message}"))
+        self.on_status = on_status or (lambda job: None)
+        self.jobs = queue.Queue()
+        self.paused = threading.Event()
+        self.current = None
+        self._session = None
+        self._worker = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self.session_factory()
+            if self._session is None:
+                raise Exception("Could not log in to ISMIS.")
+        return self._session
+
+    def submit(self, name, func, *args):
+        """Queues a job and starts the worker if it is not running yet. Returns the Job."""
+        job = Job(name, func, args)
+        self.jobs.put(job)
+        self.post(self.on_status, job)
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name="ismis-jobs", daemon=True)
+                self._worker.start()
+        return job
+
+    def set_status(self, job, status):
+        job.status = status
+        self.post(self.on_status, job)
+
+    def pause(self):
+        self.paused.set()
+
+    def resume(self):
+        self.paused.clear()
+
+    def cancel(self):
+        """Cancels the running job and every queued one."""
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            job.cancel()
+            self.set_status(job, CANCELLED)  # Taken off the queue, so the worker never sees it
+        if self.current is not None:
+            self.current.cancel()
+        self.paused.clear()
+
+    @property
+    def busy(self):
+        return self.current is not None or not self.jobs.empty()
+
+    def _work(self):
+        while True:
+            try:
+                job = self.jobs.get(timeout=1)
+            except queue.Empty:
+                with self._lock:
+                    if self.jobs.empty():
+                        self._worker = None  # Started again by the next submit
+                        return
+                continue
+            self.current = job
+            self._run(job)
+            self.current = None
+            self.post(self.on_status, job)
+
+    def _run(self, job):
+        context = JobContext(self, job)
+        if job.cancelled.is_set():
+            job.status = CANCELLED
+            return
+        self.set_status(job, RUNNING)
+        try:
+            with tracer.span("job", "jobs", job=job.name):
+                context.checkpoint()
+                job.result = job.func(context, *job.args)
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+            context.report("Cancelled.")
+        except Exception as e:
+            job.status = FAILED
+            job.error = e
+            context.report(f"Failed: {e}")
+
+
+# Jobs
+def advise_job(context, course_codes):
+    """Advises every course over the runner's session and reports each outcome."""
+    context.report(f"Advising {', '.join(course_codes)}...")
+    outcomes = advise_courses(context.session, course_codes, ADVISE_CONCURRENCY, context.checkpoint)
+    for course_code, (state, _) in outcomes.items():
+        context.report(f"{course_code}: {state.value}.")
+    return outcomes
+
+
+def schedule_job(context, course_codes):
+    """Reads the schedule of each advised course and reports its sections."""
+    links = parse_modal_links(context.session.get("/advisedcourse").text)
+    schedules = {}
+    for course_code in course_codes:
+        context.checkpoint()
+        href = find_modal_link(links, f"Click to view schedule  {course_code}")
+        if href is None:
+            context.report(f"{course_code} is not in the advised course list.")
+            continue
+        rows = schedules[course_code] = parse_schedule_html(context.session.get(href, ajax=True).text)
+        for row in rows:
+            context.report(f"{course_code} block {row['block_number']}: {row['schedule']} "
+                           f"{row['course_status']} {row['population']}")
+    return schedules
+
+
+def watch_job(context, watch, enroll=False, interval=POLL_INTERVAL):
+    """Runs a SeatWatcher on the runner's session until every course is enrolled or the job is cancelled."""
+    watcher = SeatWatcher(
+        context.session, watch, enroll=enroll, credentials=context.credentials, interval=interval,
+        on_opening=lambda opening: context.report(
+            f"Seat available: {opening.course_code} block {opening.block} ({opening.population})."),
+    )
+    context.report(f"Watching {', '.join(watcher.watch)} for free seats...")
+    watcher.run(sleep=context.sleep)
+    context.report(f"Stopped after {watcher.polls} rounds.")
+    return watcher.watch
+
+
+def queue_auto_enroll(runner, course_codes=AUTO_ENROLL_COURSES):
+    """Queues what the "Auto Enroll" button does: advise the courses, then watch them and enroll as seats free up."""
+    return [
+        runner.submit("Advise", advise_job, list(course_codes)),
+        runner.submit("Watch", watch_job, [(course_code, None) for course_code in course_codes], True),
+    ]
@@ -0,0 +1,691 @@
+# Local stand-in for ISMIS. Serves the pages and rs-modal endpoints the crawlers depend on,
+# with knobs for latency, 503 bursts and the flaky modal states, so every script can be run
+# offline by pointing ISMIS_BASE_URL at it:
+#
+#     python ismisMockServer.py --latency 0.2 --burst-every 40 --processing-rate 0.2
+#     ISMIS_BASE_URL=http://127.0.0.1:8765 python ismisAdvisedCourse2.py
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+import argparse
+import random
+import secrets
+import threading
+import time
+import urllib.parse
+
+# Configurations
+MOCK_HOST = "127.0.0.1"
+MOCK_PORT = 8765
+MOCK_USERNAME = "student"  # Put these in credentials.txt when running against the mock server
+MOCK_PASSWORD = "password"
+AUTH_COOKIE = ".ASPXAUTH"
+MAX_UNITS = 27
+OFFERED_PAGE_SIZE = 25
+
+BUSY_TEXTS = {
+    "undefined": "undefined",
+    "processing": "... i'm still processing your request :)",
+    "loading": "... loading ...",
+}
+
+# (code, description, units) of the courses in the "Click To Show Courses" modal
+ADVISE_COURSES = [
+    ("CPE 2301", "COMPUTER ARCHITECTURE AND ORGANIZATION", 3),
+    ("CPE 2302", "DATA AND DIGITAL COMMUNICATIONS", 3),
+    ("CPE 2303L", "FEEDBACK AND CONTROL SYSTEMS LAB", 1),
+    ("CPES 2201", "SOFTWARE DESIGN", 3),
+    ("CPE 3101", "EMBEDDED SYSTEMS", 3),
+    ("GE-PC", "PURPOSIVE COMMUNICATION", 3),
+    ("GE-FREELEC 2", "FREE ELECTIVE 2", 3),
+    ("GE-FREELEC 3", "FREE ELECTIVE 3", 3),
+]
+GE_FEL_COURSES = [
+    ("ESUR", "EUREKA! STIR YOUR IMAGINATION"),
+    ("TPDD", "THANATOLOGY (PHILOSOPHY OF DYING AND DEATH)"),
+    ("US", "URBAN SKETCHING"),
+    ("ITCCD", "INDIGENOUS TRADITIONAL CREATIVE CRAFTS AND DESIGN"),
+    ("EL", "EDIBLE LANDSCAPING"),
+    ("OMDL", "OPERATIONS MANAGEMENT IN DAILY LIFE"),
+    ("ISE", "INTRODUCTION TO SOCIAL ENTREPRENEURSHIP"),
+    ("LSC", "LIVING SUSTAINABILITY IN CEBU"),
+    ("CCC", "COPING WITH CLIMATE CHANGE"),
+    ("EO", "EXPLORING THE OCEANS"),
+    ("HLT", "HEALTHY LIVING IN THE TROPICS"),
+]
+PASSED_COURSES = {"GE-PC"}
+MISSING_PREREQUISITE = {"CPE 3101"}
+NO_SCHEDULE = {"GE-FEL EO"}
+OFFERED_PREFIXES = ["CPE", "CPES", "CS", "IT", "MATH", "PHYS", "GE-FEL", "ENGL"]
+DAYS = ["MW", "TTh", "F", "S"]
+ROOMS = ["LB261TC", "LB262TC", "LB263TC", "LB465TC", "LB466TC"]
+
+# Static files the real pages pull in: (content type, share of MockSettings.asset_kb). Served without login
+ASSETS = {
+    "/content/site.css": ("text/css", 0),
+    "/content/fonts/opensans.woff2": ("font/woff2", 0.5),
+    "/content/img/logo.png": ("image/png", 0.25),
+    "/content/img/banner.jpg": ("image/jpeg", 1),
+    "/content/profile.png": ("image/png", 0.25),
+    "/scripts/analytics.js": ("application/javascript", 0.25),
+}
+SITE_CSS = """@font-face { font-family: "Open Sans"; src: url("/Content/fonts/opensans.woff2") format("woff2"); }
+body { font-family: "Open Sans", sans-serif; background: url("/Content/img/banner.jpg") no-repeat top; }
+"""
+PAGE_HEAD = """<link rel="stylesheet" href="/Content/site.css">
+<script async src="/Scripts/analytics.js"></script>"""
+PAGE_IMAGES = """<img src="/Content/img/logo.png" alt="USC"><img src="/Content/img/banner.jpg" alt="">"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>ISMIS - Login</title>""" + PAGE_HEAD + """</head><body>""" + PAGE_IMAGES + """
+<form action="/Account/Login" method="post">
+<input name="__RequestVerificationToken" type="hidden" value="{token}">
+{errors}
+<input id="Username" name="Username" type="text" value="">
+<input id="Password" name="Password" type="password">
+<button class="btn green" type="submit">Login</button>
+</form>
+</body></html>"""
+
+# Minimal rs-modal/rs-ajax behaviour: load the href over XHR into the target modal's body
+PAGE_SCRIPT = """
+<script>
+function showModal(id, html) {
+    var modal = document.getElementById(id);
+    document.getElementById(id + "Body").innerHTML = html;
+    modal.style.display = "block";
+    var refresh = modal.querySelector("[data-refresh]");
+    if (refresh) {
+        var href = refresh.getAttribute("data-href");
+        setTimeout(function () { loadModal(id, href); }, parseFloat(refresh.getAttribute("data-refresh")) * 1000);
+    }
+}
+function loadModal(id, href) {
+    var xhr = new XMLHttpRequest();
+    xhr.open("GET", href);
+    xhr.setRequestHeader("X-Requested-With", "XMLHttpRequest");
+    xhr.onload = function () { showModal(id, xhr.status == 200 ? xhr.responseText : "undefined"); };
+    xhr.onerror = function () { showModal(id, "undefined"); };
+    xhr.send();
+}
+function hideModals() {
+    var modals = document.querySelectorAll(".modal");
+    for (var i = 0; i < modals.length; i++) { modals[i].style.display = "none"; }
+}
+document.addEventListener("click", function (event) {
+    var link = event.target.closest("a.rs-modal, a.rs-ajax");
+    if (link) {
+        event.preventDefault();
+        var id = (link.getAttribute("data-target") || "#modal1").substring(1);
+        showModal(id, "... loading ...");
+        loadModal(id, link.href);
+        return;
+    }
+    if (event.target.closest("[data-dismiss='modal']")) { event.target.closest(".modal").style.display = "none"; }
+});
+document.addEventListener("keydown", function (event) { if (event.key === "Escape") { hideModals(); } });
+</script>"""
+
+MODALS = """
+<div id="modal1" class="modal" style="display:none">
+<div class="portlet"><div class="portlet-title"><div class="tools"><a class="remove" data-dismiss="modal" href="#"></a></div></div>
+<div id="modal1Body" class="modal-body"></div></div></div>
+<div id="modal2" class="modal" style="display:none">
+<button type="button" class="close" data-dismiss="modal">&times;</button>
+<div id="modal2Body" class="modal-body"></div></div>"""
+
+
+class MockSettings:
+    """Knobs for how slow and flaky the mock server behaves."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, burst_every=0, burst_length=3,
+                 undefined_rate=0.0, processing_rate=0.0, loading_rate=0.0, busy_seconds=1.5, asset_kb=200, seat_churn=0.0,
+                 seed=None):
+        self.latency = latency  # Seconds added to every response
+        self.jitter = jitter  # Extra random seconds, 0 to jitter
+        self.error_rate = error_rate  # Chance of a single 503 on any request
+        self.burst_every = burst_every  # Every burst_every requests, the next burst_length requests get 503. 0 disables it
+        self.burst_length = burst_length
+        self.undefined_rate = undefined_rate  # Chance an advise modal answers "undefined"
+        self.processing_rate = processing_rate  # Chance it answers "... i'm still processing your request :)"
+        self.loading_rate = loading_rate  # Chance it stays on "... loading ..."
+        self.busy_seconds = busy_seconds  # How long the busy texts stay before the modal reloads itself
+        self.asset_kb = asset_kb  # Size of the largest image. Fonts, icons and scripts are a share of it
+        self.seat_churn = seat_churn  # Chance a schedule request finds one section with students added or dropped
+        self.random = random.Random(seed)
+
+
+class StudentState:
+    """What one logged-in account has advised and enrolled in so far."""
+
+    def __init__(self):
+        self.advised = {}
+        self.enrolled = {}
+
+    def units(self):
+        return sum(self.advised.values())
+
+
+class MockISMISServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that holds the mock's settings, login sessions and request counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, settings=None, username=MOCK_USERNAME, password=MOCK_PASSWORD):
+        super().__init__(address, MockISMISHandler)
+        self.settings = settings or MockSettings()
+        self.username = username
+        self.password = password
+        self.sessions = {}
+        self.tokens = set()
+        self.request_count = 0
+        self.path_counts = {}
+        self.bytes_sent = 0
+        self.offered_courses = build_offered_courses()
+        self.schedules = {}  # Course code -> [block, schedule, enrolled, capacity] rows, once churn or enrollment changed them
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def reset_students(self):
+        """Forgets every advised and enrolled course and seat change, so repeated runs see the same outcomes."""
+        with self.lock:
+            for student in self.sessions.values():
+                student.advised.clear()
+                student.enrolled.clear()
+            self.schedules.clear()
+
+    def count_bytes(self, size):
+        with self.lock:
+            self.bytes_sent += size
+
+    def count_request(self, path):
+        """Counts a request and reports whether it falls inside a 503 burst."""
+        settings = self.settings
+        with self.lock:
+            self.request_count += 1
+            self.path_counts[path] = self.path_counts.get(path, 0) + 1
+            count = self.request_count
+            in_burst = settings.burst_every > 0 and count > settings.burst_every and \
+                (count - 1) % settings.burst_every < settings.burst_length
+            return in_burst or settings.random.random() < settings.error_rate
+
+    def schedule_rows(self, code):
+        """Returns (block, schedule, status, population) rows of a course, first shuffling a few seats per seat_churn."""
+        settings = self.settings
+        with self.lock:
+            rows = self.schedules.get(code)
+            if rows is None:
+                rows = self.schedules[code] = [
+                    [block, schedule] + [int(part) for part in population.split("/")]
+                    for block, schedule, _, population in course_schedule(code)
+                ]
+            if settings.random.random() < settings.seat_churn:
+                row = settings.random.choice(rows)
+                row[2] = min(row[3], max(0, row[2] + settings.random.choice((-3, -2, -1, 1, 2))))
+            return [(block, schedule, "CLOSED" if enrolled >= capacity else "OPEN", f"{enrolled}/{capacity}")
+                    for block, schedule, enrolled, capacity in rows]
+
+    def take_seat(self, code, block):
+        """Counts an enrollment against a section. Returns False when it is full or does not exist."""
+        self.schedule_rows(code)
+        with self.lock:
+            for row in self.schedules[code]:
+                if row[0] == block and row[2] < row[3]:
+                    row[2] += 1
+                    return True
+        return False
+
+    def busy_state(self):
+        """Rolls the dice for a flaky modal answer. Returns a key of BUSY_TEXTS, or None."""
+        settings = self.settings
+        with self.lock:
+            roll = settings.random.random()
+        for name, rate in (("undefined", settings.undefined_rate), ("processing", settings.processing_rate),
+                           ("loading", settings.loading_rate)):
+            if roll < rate:
+                return name
+            roll -= rate
+        return None
+
+
+def build_offered_courses(seed=2024):
+    """Generates a deterministic offered-course catalog: (code, description, status, teachers, schedule, department, enrolled)."""
+    rng = random.Random(seed)
+    courses = []
+    for prefix in OFFERED_PREFIXES:
+        for number in range(1, 41):
+            code = f"{prefix} {1000 + number * 37 % 3000}"
+            for section in range(rng.randint(1, 3)):
+                start = rng.choice([7, 9, 10, 13, 15, 17])
+                schedule = f"{rng.choice(DAYS)} {start:02d}:30 AM - {start + 1:02d}:30 AM {rng.choice(ROOMS)}"
+                capacity = 40
+                enrolled = rng.randint(0, capacity)
+                status = "CLOSED" if enrolled >= capacity else "OPEN"
+                courses.append((code, f"{prefix} COURSE {number} SECTION {chr(65 + section)}", status,
+                                "", schedule, "DCISM", f"{enrolled}/{capacity}"))
+    return courses
+
+
+def course_schedule(code):
+    """Returns (block, schedule, status, population) rows for an advised course, the same on every call."""
+    rng = random.Random(code)
+    rows = []
+    for index in range(rng.randint(2, 4)):
+        start = 7 + index * 2
+        capacity = 40
+        enrolled = rng.randint(20, capacity)
+        status = "CLOSED" if enrolled >= capacity else "OPEN"
+        rows.append((chr(65 + index), f"{rng.choice(DAYS)} {start:02d}:30 - {start + 1:02d}:30 {rng.choice(ROOMS)}",
+                     status, f"{enrolled}/{capacity}"))
+    return rows
+
+
+def modal_link(href, title, text, target="#modal1", classes="btn btn-sm green rs-modal"):
+    return f'<a class="{classes}" data-target="{target}" href="{escape(href)}" title="{escape(title)}">{escape(text)}</a>'
+
+
+def query_url(path, **params):
+    return f"{path}?{urllib.parse.urlencode(params)}"
+
+
+class MockISMISHandler(BaseHTTPRequestHandler):
+    """Routes ISMIS paths to page builders. Pages past the login form need the auth cookie."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keeps benchmark output readable
+
+    # Plumbing
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def handle_request(self, method):
+        url = urllib.parse.urlsplit(self.path)
+        self.query = dict(urllib.parse.parse_qsl(url.query))
+        self.form = {}
+        if method == "POST":
+            length = int(self.headers.get("Content-Length") or 0)
+            self.form = dict(urllib.parse.parse_qsl(self.rfile.read(length).decode("utf-8")))
+
+        settings = self.server.settings
+        if settings.latency or settings.jitter:
+            time.sleep(settings.latency + settings.random.uniform(0, settings.jitter))
+        path = url.path.rstrip("/").lower() or "/"
+        if self.server.count_request(path):
+            self.send_html("<html><body><h1>Service Unavailable</h1></body></html>", status=503)
+            return
+
+        routes = {
+            ("GET", "/"): self.home,
+            ("POST", "/account/login"): self.login,
+            ("GET", "/account/logoff"): self.logoff,
+            ("GET", "/advisedcourse"): self.advised_course_page,
+            ("GET", "/advisedcourse/choosetoadvise"): self.choose_to_advise,
+            ("GET", "/advisedcourse/tobeadvise"): self.to_be_advise,
+            ("GET", "/advisedcourse/advise"): self.advise,
+            ("GET", "/advisedcourse/schedule"): self.schedule,
+            ("GET", "/advisedcourse/enroll"): self.enroll,
+            ("GET", "/advisedcourse/blocksection"): self.block_section,
+            ("GET", "/advisedcourse/lacking"): self.lacking,
+            ("GET", "/viewgrades"): self.view_grades,
+            ("GET", "/courseschedule/coursescheduleofferedindex"): self.offered_courses,
+            ("POST", "/courseschedule/coursescheduleofferedindex"): self.offered_courses,
+            ("GET", "/courseschedule/offeredcoursefilter"): self.offered_course_filter,
+            ("GET", "/paymaya"): self.paymaya,
+            ("POST", "/paymaya"): self.paymaya_checkout,
+        }
+        handler = routes.get((method, path))
+        if path in ASSETS:
+            self.send_asset(path)
+        elif handler is None:
+            self.send_html("<html><body><h1>404 Not Found</h1></body></html>", status=404)
+        elif path not in ("/", "/account/login") and self.student() is None:
+            self.redirect("/")
+        else:
+            handler()
+
+    def send_html(self, body, status=200, headers=()):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count_bytes(len(data))
+
+    def send_asset(self, path):
+        content_type, share = ASSETS[path]
+        data = SITE_CSS.encode("utf-8") if path.endswith(".css") else bytes(int(self.server.settings.asset_kb * share * 1024))
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count_bytes(len(data))
+
+    def redirect(self, location, headers=()):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+
+    def student(self):
+        """Returns the StudentState of the auth cookie, or None when not logged in."""
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == AUTH_COOKIE:
+                return self.server.sessions.get(value)
+        return None
+
+    def is_ajax(self):
+        return self.headers.get("X-Requested-With") == "XMLHttpRequest"
+
+    def page(self, title, content):
+        """Wraps content in the logged-in layout with the profile picture, modals and rs-modal script."""
+        return f"""<!DOCTYPE html>
+<html><head><title>ISMIS - {escape(title)}</title>{PAGE_HEAD}</head><body>
+<div class="page-header">{PAGE_IMAGES}<img id="header_profile_pic" src="/Content/profile.png" alt="profile"></div>
+<div class="page-content">{content}</div>
+{MODALS}
+{PAGE_SCRIPT}
+</body></html>"""
+
+    def busy_answer(self):
+        """Returns a flaky modal body per the settings, or None for a normal answer."""
+        state = self.server.busy_state()
+        if state is None:
+            return None
+        if state == "undefined":
+            return BUSY_TEXTS[state]
+        # The page script reloads the same href after busy_seconds, like the real modal eventually settling
+        return f'<div data-refresh="{self.server.settings.busy_seconds}" data-href="{escape(self.path)}">{BUSY_TEXTS[state]}</div>'
+
+    # Login
+    def login_page(self, errors=""):
+        token = secrets.token_urlsafe(16)
+        with self.server.lock:
+            self.server.tokens.add(token)
+        return LOGIN_PAGE.format(token=token, errors=errors)
+
+    def home(self):
+        if self.student() is None:
+            self.send_html(self.login_page())
+            return
+        self.send_html(self.page("Home", '<div class="portlet"><div class="portlet-title"><h3>Welcome</h3></div></div>'))
+
+    def login(self):
+        token = self.form.get("__RequestVerificationToken", "")
+        with self.server.lock:
+            valid_token = token in self.server.tokens
+            self.server.tokens.discard(token)
+        if not valid_token:
+            self.send_html("<html><body><h1>The required anti-forgery form field is not present.</h1></body></html>", status=500)
+            return
+        if (self.form.get("Username"), self.form.get("Password")) != (self.server.username, self.server.password):
+            errors = '<div class="validation-summary-errors"><ul><li>Invalid username or password.</li></ul></div>'
+            self.send_html(self.login_page(errors))
+            return
+        session_id = secrets.token_hex(16)
+        with self.server.lock:
+            self.server.sessions[session_id] = StudentState()
+        self.redirect("/", [("Set-Cookie", f"{AUTH_COOKIE}={session_id}; Path=/; HttpOnly")])
+
+    def logoff(self):
+        self.redirect("/", [("Set-Cookie", f"{AUTH_COOKIE}=; Path=/; Max-Age=0")])
+
+    # Advised course page and its rs-modal endpoints
+    def advised_course_page(self):
+        student = self.student()
+        rows = "".join(
+            f"<tr><td>{escape(code)}</td><td>{units}</td><td>"
+            + modal_link(query_url("/advisedcourse/schedule", code=code), f"Click to view schedule  {code}",
+                         "Schedule", classes="btn btn-xs green rs-modal")
+            + "</td></tr>"
+            for code, units in student.advised.items()
+        )
+        content = f"""
+<div class="portlet"><div class="portlet-title"><h3>Advised Courses</h3></div>
+<div class="actions">
+{modal_link("/advisedcourse/choosetoadvise", "Click To Show Courses", "Advise Course")}
+{modal_link("/advisedcourse/blocksection", "Click to see block section list", "Block Advising")}
+{modal_link("/advisedcourse/lacking", "Click To Show Lacking Courses.", "View Lacking")}
+</div>
+<table class="table"><tbody id="AdvisedCourseList">{rows}</tbody></table></div>"""
+        self.send_html(self.page("Advised Course", content))
+
+    def choose_to_advise(self):
+        rows = "".join(
+            f"<tr><td>{escape(code)}</td><td>{escape(description)}</td><td>{units}</td><td>"
+            + modal_link(query_url("/advisedcourse/tobeadvise", code=code), f"Click to show course to be advised{code}",
+                         "+", target="#modal2", classes="btn btn-xs green rs-modal")
+            + "</td></tr>"
+            for code, description, units in ADVISE_COURSES
+        )
+        self.send_html(f'<h4>Remaining Courses To Be Advised</h4><table class="table"><tbody id="ChooseToAdviseBody">{rows}</tbody></table>')
+
+    def to_be_advise(self):
+        busy = self.busy_answer()
+        if busy is not None:
+            self.send_html(busy)
+            return
+        code = self.query.get("code", "")
+        if code.startswith("GE-FREELEC"):
+            choices = [(f"GE-FEL {short}", title) for short, title in GE_FEL_COURSES]
+        else:
+            choices = [(code, description) for course, description, _ in ADVISE_COURSES if course == code]
+        rows = "".join(
+            f"<tr><td>{escape(choice)}</td><td>{escape(title)}</td><td>"
+            + modal_link(query_url("/advisedcourse/advise", code=choice, slot=code), f"Click to advise course {choice}",
+                         "Advise", target="#modal2", classes="btn btn-xs green rs-modal")
+            + "</td></tr>"
+            for choice, title in choices
+        )
+        self.send_html(f'<table class="table"><tbody id="ToBeAdviseBody">{rows}</tbody></table>')
+
+    def advise(self):
+        busy = self.busy_answer()
+        if busy is not None:
+            self.send_html(busy)
+            return
+        student = self.student()
+        code = self.query.get("code", "")
+        slot = self.query.get("slot", code)
+        units = next((units for course, _, units in ADVISE_COURSES if course == slot), 3)
+        with self.server.lock:
+            if code in student.advised:
+                message = "Course already been advised!"
+            elif slot in PASSED_COURSES:
+                message = f"Student has already taken and passed {code}."
+            elif slot in MISSING_PREREQUISITE:
+                message = f"Student has not taken or passed the pre-requisite courses of {code}."
+            elif code in NO_SCHEDULE:
+                message = "Cannot advise course equivalent due to course schedule not available."
+            elif student.units() + units > MAX_UNITS:
+                message = "Student has reached the maximum number of units allowed for the term."
+            else:
+                student.advised[code] = units
+                message = f"Successfully advised course {code}."
+        self.send_html(f"<p>{escape(message)}</p>")
+
+    def schedule(self):
+        code = self.query.get("code", "")
+        rows = "".join(
+            f"<tr><td>{block}</td><td>{escape(code)}</td><td><span>{escape(schedule)}</span></td>"
+            f"<td>{status}</td><td>{population}</td><td>"
+            + (modal_link(query_url("/advisedcourse/enroll", code=code, block=block), f"Click to enroll {code} {block}",
+                          "Enroll", target="#modal2", classes="btn btn-xs green rs-modal") if status == "OPEN" else "")
+            + "</td></tr>"
+            for block, schedule, status, population in self.server.schedule_rows(code)
+        )
+        self.send_html(f'<h4>Schedule of {escape(code)}</h4><table class="table"><tbody id="EnrollBody">{rows}</tbody></table>')
+
+    def enroll(self):
+        busy = self.busy_answer()
+        if busy is not None:
+            self.send_html(busy)
+            return
+        student = self.student()
+        code, block = self.query.get("code", ""), self.query.get("block", "")
+        with self.server.lock:
+            if code not in student.advised:
+                message = f"{code} has not been advised."
+            elif code in student.enrolled:
+                message = f"Already enrolled in {code} block {student.enrolled[code]}."
+            else:
+                message = None
+        if message is None:
+            if self.server.take_seat(code, block):
+                with self.server.lock:
+                    student.enrolled[code] = block
+                message = f"Successfully enrolled in {code} block {block}."
+            else:
+                message = f"Block {block} of {code} is already full."
+        self.send_html(f"<p>{escape(message)}</p>")
+
+    def block_section(self):
+        blocks = "".join(
+            f"<h4>BSCPE 2-{index} "
+            + modal_link(query_url("/advisedcourse/blocksection", block=index), f"Click to advise block BSCPE 2-{index}",
+                         "Advise", classes="btn btn-xs green rs-modal")
+            + "</h4>"
+            for index in range(1, 4)
+        )
+        self.send_html(f'<div id="BlockSectionBody">{blocks}</div>')
+
+    def lacking(self):
+        rows = "".join(f"<tr><td>{escape(code)}</td><td>{escape(description)}</td></tr>" for code, description, _ in ADVISE_COURSES)
+        self.send_html(f'<div class="portlet-title"><h3>Lacking Courses</h3></div><table class="table"><tbody>{rows}</tbody></table>')
+
+    # Grades
+    def view_grades(self):
+        terms = [("FIRST SEMESTER, 2023 - 2024", ["MATH 1101", "PHYS 1101", "CPE 1101", "GE-PC"]),
+                 ("SECOND SEMESTER, 2023 - 2024", ["MATH 1102", "PHYS 1102", "CPE 1102", "CPE 1102L"]),
+                 ("FIRST SEMESTER, 2024 - 2025", ["CPE 2101", "CPE 2102", "CPES 2101", "GE-STS"])]
+        portlets = []
+        for term, codes in terms:
+            rows = []
+            for code in codes:
+                rng = random.Random(code)
+                rows.append(f'<tr><td class="col-lg-3">{code}</td><td class="col-lg-6">{code} DESCRIPTION</td>'
+                            f'<td class="col-lg-1 hidden-xs">{1 if code.endswith("L") else 3}</td>'
+                            f'<td class="col-lg-1">{rng.choice(["1.2", "1.5", "1.8", "2.1"])}</td>'
+                            f'<td class="col-lg-1">{rng.choice(["1.1", "1.4", "1.7", "2.0"])}</td></tr>')
+            portlets.append(f'<div class="portlet"><div class="portlet-title"><div class="caption">{term}</div></div>'
+                            f'<div class="portlet-body"><table class="table"><tbody>{"".join(rows)}</tbody></table></div></div>')
+        self.send_html(self.page("View Grades", "".join(portlets)))
+
+    # Offered courses
+    def offered_course_filter(self):
+        self.send_html("""
+<form id="OfferedCourseFilter" action="/courseSchedule/CourseScheduleOfferedIndex" method="get">
+<input id="Courses" name="Courses" type="text">
+<select id="AcademicPeriod" name="AcademicPeriod"><option>FIRST SEMESTER</option><option>2ND SEMESTER</option><option>SUMMER</option></select>
+<select id="AcademicYear" name="AcademicYear"><option>2023</option><option>2024</option><option>2025</option></select>
+<div class="form-actions"><button class="btn green" type="submit">Search</button></div>
+</form>""")
+
+    def offered_courses(self):
+        params = dict(self.query, **self.form)
+        course_filter = params.get("Courses", "").strip().upper()
+        try:
+            page = max(1, int(params.get("page", 1)))
+        except ValueError:
+            page = 1
+        courses = [course for course in self.server.offered_courses if course[0].startswith(course_filter)]
+        page_count = max(1, -(-len(courses) // OFFERED_PAGE_SIZE))
+        rows = "".join(
+            f'<tr class=" " title="created by: [ID] last [DATE], updated by: [ID] last [DATE]">'
+            f"<td>{escape(code)}</td><td>{escape(description)}</td><td>{status}</td><td>{teachers}</td>"
+            f"<td><span>{escape(schedule)}</span><br></td><td>{department}<span>&nbsp;</span> <span>(40)</span> <br></td>"
+            f"<td>{enrolled}</td></tr>"
+            for code, description, status, teachers, schedule, department, enrolled
+            in courses[(page - 1) * OFFERED_PAGE_SIZE:page * OFFERED_PAGE_SIZE]
+        )
+        pages = "".join(
+            f'<li class="{"active" if number == page else ""}"><a href="'
+            + escape(query_url("/courseSchedule/CourseScheduleOfferedIndex", **dict(params, page=number)))
+            + f'">{number}</a></li>'
+            for number in range(1, page_count + 1)
+        )
+        content = f"""
+<div class="portlet"><div class="portlet-title"><h3>Offered Courses</h3>
+<a class="btn btn-sm rs-ajax green" data-target="#modal1" href="/courseSchedule/OfferedCourseFilter">Filter</a></div>
+<table class="table"><thead><tr><th>CourseCode</th><th>Course Description</th><th>Course Status</th><th>Teacher/s</th>
+<th>Schedule</th><th>Department Reserved</th><th>Enrolled Students</th></tr></thead><tbody>{rows}</tbody></table>
+<ul class="pagination">{pages}</ul></div>"""
+        self.send_html(self.page("Offered Courses", content))
+
+    # Paymaya
+    def paymaya(self):
+        token = secrets.token_urlsafe(16)
+        fields = ["Student.Firstname", "Student.Middlename", "Student.Lastname", "Student.IDNumber",
+                  "Student.EmailAddress", "Student.MobileNumber", "Student.CardCode", "Telleritem[0].Amount"]
+        inputs = "".join(f'<input name="{name}" type="text" value="">' for name in fields)
+        self.send_html(self.page("Paymaya", f"""
+<form action="/Paymaya" method="post">
+<input name="__RequestVerificationToken" type="hidden" value="{token}">
+{inputs}
+<button class="btn green" type="submit">Pay</button>
+</form>"""))
+
+    def paymaya_checkout(self):
+        checkout = f"https://payments.maya.ph/v2/checkout?id={secrets.token_hex(8)}"
+        self.send_html(f"""<!DOCTYPE html>
+<html><head><meta http-equiv="refresh" content="5;url={checkout}"></head><body>
+<p>Redirecting to <a href="{checkout}">{checkout}</a></p>
+</body></html>""")
+
+
+def start_mock_server(settings=None, host=MOCK_HOST, port=0):
+    """Starts the mock server on a background thread. Port 0 picks a free port. Returns the server; stop it with shutdown()."""
+    server = MockISMISServer((host, port), settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    """Runs the mock server in the foreground with the knobs given on the command line."""
+    parser = argparse.ArgumentParser(description="Local stand-in for ISMIS.")
+    parser.add_argument("--host", default=MOCK_HOST)
+    parser.add_argument("--port", type=int, default=MOCK_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds, 0 to jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="chance of a single 503 on any request")
+    parser.add_argument("--burst-every", type=int, default=0, help="start a 503 burst every N requests")
+    parser.add_argument("--burst-length", type=int, default=3, help="requests per 503 burst")
+    parser.add_argument("--undefined-rate", type=float, default=0.0)
+    parser.add_argument("--processing-rate", type=float, default=0.0)
+    parser.add_argument("--loading-rate", type=float, default=0.0)
+    parser.add_argument("--busy-seconds", type=float, default=1.5, help="how long a busy modal lasts")
+    parser.add_argument("--asset-kb", type=float, default=200, help="size of the banner image; other assets are a share of it")
+    parser.add_argument("--seat-churn", type=float, default=0.0, help="chance a schedule request finds seats added or dropped")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = MockSettings(args.latency, args.jitter, args.error_rate, args.burst_every, args.burst_length,
+                            args.undefined_rate, args.processing_rate, args.loading_rate, args.busy_seconds, args.asset_kb,
+                            args.seat_churn, args.seed)
+    server = MockISMISServer((args.host, args.port), settings)
+    print(f"Mock ISMIS running at {server.base_url} (login: {MOCK_USERNAME} / {MOCK_PASSWORD})")
+    print(f"Set ISMIS_BASE_URL={server.base_url} to point the crawlers at it.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+from enum import Enum
+import json
+import os
+import re
+import statistics
+import time
+
+from ismisTrace import tracer
+
+# Configurations
+MODAL_TIMINGS_FILE = "modal_timings.json"  # Observed busy-state durations, used to tune RetryPolicy defaults
+
+
+class ModalState(Enum):
+    SUCCESS = "Successfully advised course"
+    ALREADY_ADVISED = "Course already been advised"
+    ALREADY_PASSED = "Student has already taken and passed the course"
+    MAX_UNITS = "Maximum units reached for the term"
+    SCHEDULE_UNAVAILABLE = "Cannot advise course: schedule not available"
+    PREREQUISITE_MISSING = "Pre-requisite courses not taken or passed"
+    UNDEFINED = "Modal shows 'undefined'"
+    PROCESSING = "Server is still processing the request"
+    LOADING = "Modal is still loading"
+    NOT_FOUND = "Course button not found"
+    UNKNOWN = "Unrecognized modal content"
+
+
+class ModalAction(Enum):
+    CLOSE = "close"  # Final outcome: close the modal and stop
+    RETRY = "retry"  # Escape the modal and retry right away
+    WAIT_AND_RETRY = "wait"  # Poll until the busy state clears, then escape and retry
+    NONE = "none"  # Leave the modal alone
+
+
+# Text shown in #modal1Body / #modal2Body for each state, highest priority first
+MODAL_MESSAGES = [
+    (ModalState.SUCCESS, "Successfully advised course"),
+    (ModalState.ALREADY_ADVISED, "Course already been advised!"),
+    (ModalState.ALREADY_PASSED, "Student has already taken and passed"),
+    (ModalState.MAX_UNITS, "Student has reached the maximum number of units allowed for the term."),
+    (ModalState.SCHEDULE_UNAVAILABLE, "Cannot advise course equivalent due to course schedule not available"),
+    (ModalState.PREREQUISITE_MISSING, "Student has not taken or passed the pre-requisite courses of"),
+    (ModalState.PROCESSING, "... i'm still processing your request :)"),
+    (ModalState.LOADING, "... loading ..."),
+    (ModalState.UNDEFINED, "undefined"),
+]
+MODAL_PATTERN = re.compile("|".join(f"(?P<{state.name}>{re.escape(text)})" for state, text in MODAL_MESSAGES))
+MODAL_PRIORITY = {state: index for index, (state, _) in enumerate(MODAL_MESSAGES)}
+
+MODAL_ACTIONS = {
+    ModalState.SUCCESS: ModalAction.CLOSE,
+    ModalState.ALREADY_ADVISED: ModalAction.CLOSE,
+    ModalState.ALREADY_PASSED: ModalAction.CLOSE,
+    ModalState.MAX_UNITS: ModalAction.CLOSE,
+    ModalState.SCHEDULE_UNAVAILABLE: ModalAction.CLOSE,
+    ModalState.PREREQUISITE_MISSING: ModalAction.CLOSE,
+    ModalState.UNDEFINED: ModalAction.RETRY,
+    ModalState.PROCESSING: ModalAction.WAIT_AND_RETRY,
+    ModalState.LOADING: ModalAction.WAIT_AND_RETRY,
+    ModalState.NOT_FOUND: ModalAction.NONE,
+    ModalState.UNKNOWN: ModalAction.NONE,
+}
+FINAL_STATES = frozenset(state for state, action in MODAL_ACTIONS.items() if action is ModalAction.CLOSE)
+RETRY_STATES = frozenset(state for state, action in MODAL_ACTIONS.items() if action in (ModalAction.RETRY, ModalAction.WAIT_AND_RETRY))
+
+# Reads visibility and body text of a modal in one round trip
+READ_MODAL_SCRIPT = """
+var modal = document.querySelector(arguments[0]);
+if (!modal || !(modal.offsetWidth || modal.offsetHeight || modal.getClientRects().length)) { return null; }
+var body = modal.querySelector(arguments[1]);
+return body ? body.innerText.trim() : "";
+"""
+
+CLOSE_MODAL_SCRIPT = """
+var button = document.querySelector(arguments[0] + " [data-dismiss='modal']");
+if (button) { button.click(); return true; }
+return false;
+"""
+
+
+def classify_modal_text(text):
+    """Maps modal text to a ModalState with one scan over the compiled message pattern."""
+    found = {match.lastgroup for match in MODAL_PATTERN.finditer(text or "")}
+    if not found:
+        return ModalState.UNKNOWN
+    return min((ModalState[name] for name in found), key=MODAL_PRIORITY.get)
+
+
+class RetryPolicy:
+    """Polling schedule for busy modals: short intervals that grow by factor, up to max_interval, until deadline."""
+
+    def __init__(self, initial=0.25, factor=1.5, max_interval=3.0, deadline=30.0):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.deadline = deadline
+
+    def intervals(self):
+        """Yields the sleep before each poll. The last one is cut short so the total ends at the deadline."""
+        interval = self.initial
+        elapsed = 0.0
+        while elapsed < self.deadline:
+            step = min(interval, self.deadline - elapsed)
+            yield step
+            elapsed += step
+            interval = min(interval * self.factor, self.max_interval)
+
+
+# Busy states seen in #modal1Body / #modal2Body and how long to keep polling them
+BUSY_POLICIES = {
+    ModalState.PROCESSING: RetryPolicy(deadline=10.0),  # "... i'm still processing your request :)" used to sleep 10 s
+    ModalState.LOADING: RetryPolicy(deadline=20.0),  # "... loading ..." used to sleep 20 s
+}
+
+
+class ModalTimings:
+    """Records how long each busy modal state lasted and every state transition the dispatcher saw."""
+
+    def __init__(self):
+        self.durations = {}
+        self.transitions = []
+        self._last_seen = {}
+
+    def record_transition(self, modal, state):
+        """Records a state seen by the dispatcher and the time since the previous one on the same modal."""
+        now = time.perf_counter()
+        previous, since = self._last_seen.get(modal, (None, now))
+        self._last_seen[modal] = (state, now)
+        self.transitions.append({
+            "modal": modal,
+            "from": previous.name if previous else None,
+            "to": state.name,
+            "seconds": round(now - since, 3),
+        })
+
+    def record(self, state, seconds, cleared):
+        """Adds one observation. cleared is False when the deadline ran out first."""
+        self.durations.setdefault(state, []).append({"seconds": round(seconds, 3), "cleared": cleared})
+
+    def summary(self):
+        """Returns count, median, p95 and max seconds per state."""
+        result = {}
+        for state, samples in self.durations.items():
+            seconds = sorted(sample["seconds"] for sample in samples)
+            result[state] = {
+                "count": len(seconds),
+                "cleared": sum(1 for sample in samples if sample["cleared"]),
+                "median": round(statistics.median(seconds), 3),
+                "p95": seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))],
+                "max": seconds[-1],
+            }
+        return result
+
+    def save(self, path=MODAL_TIMINGS_FILE):
+        """Appends this run's observations to the timings file."""
+        if not self.durations:
+            return
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as file:
+                    data = json.load(file)
+            except (OSError, ValueError) as e:
+                print(f"Could not read {path} ({e}). Starting a new one.")
+        for state, samples in self.durations.items():
+            data.setdefault(state, []).extend(samples)
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2)
+
+    def print_summary(self):
+        """Prints the observed durations per state and the number of each transition."""
+        for state, stats in self.summary().items():
+            print(f"Modal '{state}': {stats['count']} times, median {stats['median']}s, p95 {stats['p95']}s, max {stats['max']}s")
+        counts = {}
+        for transition in self.transitions:
+            key = (transition["modal"], transition["from"], transition["to"])
+            counts[key] = counts.get(key, 0) + 1
+        for (modal, previous, state), count in counts.items():
+            print(f"{modal}: {previous or 'start'} -> {state} ({count}x)")
+
+
+modal_timings = ModalTimings()
+
+
+def read_modal(browser, modal_selector):
+    """Returns the text of a visible modal's body, or None when the modal is not showing."""
+    return browser.execute_script(READ_MODAL_SCRIPT, modal_selector, modal_selector + "Body")
+
+
+def close_modal(browser, modal_selector):
+    """Clicks the modal's dismiss button, falling back to Escape."""
+    if not browser.execute_script(CLOSE_MODAL_SCRIPT, modal_selector):
+        ActionChains(browser).send_keys(Keys.ESCAPE).perform()
+
+
+def wait_out_modal(browser, modal_selector, state, policy=None):
+    """
+    Polls a modal until it leaves a busy state or the policy's deadline passes,
+    and records how long the state lasted. Returns True if the modal cleared in time.
+    """
+    policy = policy or BUSY_POLICIES[state]
+    start = time.perf_counter()
+    cleared = False
+    polls = 0
+    with tracer.span("wait_out_modal", "modal", modal=modal_selector, state=state) as span:
+        for interval in policy.intervals():
+            time.sleep(interval)
+            polls += 1
+            try:
+                text = read_modal(browser, modal_selector)
+            except WebDriverException:
+                text = None
+            if text is None or classify_modal_text(text) is not state:
+                cleared = True
+                break
+        span.set(polls=polls, cleared=cleared)
+    elapsed = time.perf_counter() - start
+    modal_timings.record(state.name.lower(), elapsed, cleared)
+    if cleared:
+        print(f"Modal '{state.name.lower()}' cleared after {elapsed:.2f} seconds.")
+    else:
+        print(f"Modal still '{state.name.lower()}' after {elapsed:.2f} seconds.")
+    return cleared
+
+
+@tracer.traced("handle_modal", "modal")
+def handle_modal(browser, modal_selector, label=""):
+    """
+    Reads a modal once, classifies it and performs the matching action from MODAL_ACTIONS:
+    closes it on a final outcome, escapes it (after waiting out busy states) for a retry, or leaves it.
+    Returns the ModalState, or None when the modal is not showing.
+    """
+    try:
+        text = read_modal(browser, modal_selector)
+    except WebDriverException as e:
+        print(f"Error while handling modal: {e}")
+        return None
+    if text is None:
+        return None
+
+    state = classify_modal_text(text)
+    modal_timings.record_transition(modal_selector, state)
+    action = MODAL_ACTIONS[state]
+    tracer.annotate(modal=modal_selector, label=label, state=state, action=action)
+    prefix = f"{label}: " if label else ""
+    try:
+        if action is ModalAction.CLOSE:
+            print(f"{prefix}{state.value}.")
+            close_modal(browser, modal_selector)
+        elif action is ModalAction.RETRY:
+            print(f"{prefix}Modal issue detected: {text}. Closing modal and retrying...")
+            ActionChains(browser).send_keys(Keys.ESCAPE).perform()
+        elif action is ModalAction.WAIT_AND_RETRY:
+            print(f"{prefix}{state.value}: {text}. Waiting for it to finish before retrying...")
+            wait_out_modal(browser, modal_selector, state)
+            ActionChains(browser).send_keys(Keys.ESCAPE).perform()
+    except WebDriverException as e:
+        print(f"Error while handling modal: {e}")
+    return state
@@ -1,20 +1,23 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import time
 import getpass
 import os
 
+from ismisDriver import LazyDriver
+from ismisSession import BASE_URL, http_login, copy_cookies_to_browser
+from ismisTrace import tracer
+from ismisExtract import extract_offered_course_rows
+from ismisCatalog import CATALOG_TTL, CourseCatalog, print_catalog_diff
+
 # Configurations
-options = Options()
-options.headless = False  # Runs Chromium browser visibly
-options.add_experimental_option("excludeSwitches", ["enable-logging"])  # Disables DevTools logs
-ser = Service("./chromedriver.exe")
-browser = webdriver.Chrome(service=ser, options=options)
+USE_HTTP_LOGIN = True  # Logs in over plain HTTP first, the browser form is only a fallback
+COURSE_FILTER = "GE-FEL"  # Course code typed into the offered course filter
+ACADEMIC_PERIOD = "2ND SEMESTER"
+ACADEMIC_YEAR = "2024"
+browser = LazyDriver()  # Chrome is only launched the first time a function uses the browser
 
 clear = lambda: os.system('cls' if os.name == 'nt' else 'clear')  # Clears terminal
 
@@ -35,8 +38,10 @@ def load_credentials(file_path="credentials.txt"):
             file.write(f"{username}\n{password}")
         return username, password
 
+@tracer.traced()
 def wait_for_element(by, identifier, timeout=5, max_retries=10):
     """Waits for an element to be present and retries on connection or timeout errors."""
+    tracer.annotate(selector=identifier)
     retries = 0
     while retries < max_retries:
         try:
@@ -76,12 +81,13 @@ def check_site_crash_homepage():
         print("Homepage not loaded properly. Refreshing...")
         return True  # Crash detected
 
+@tracer.traced()
 def login_attempt(username_input, password_input, max_retries=5):
     """Attempts to log into the ISMIS website with retries."""
     retries = 0
     while retries < max_retries:
         try:
-            browser.get("https://ismis.usc.edu.ph")
+            browser.get(BASE_URL)
 
             # Ensure the login page is loaded properly
             while check_site_crash_login_page():
@@ -111,6 +117,20 @@ def login_attempt(username_input, password_input, max_retries=5):
                 raise e
     raise Exception("Failed to log in after multiple retries.")
 
+@tracer.traced()
+def http_login_to_browser(username_input, password_input):
+    """Logs in over plain HTTP and hands the cookies to the browser. Returns False if browser login is still needed."""
+    try:
+        session = http_login(username_input, password_input)
+    except Exception as e:
+        print(f"HTTP login failed ({e}). Falling back to browser login...")
+        return False
+    if session is None:
+        return False
+    copy_cookies_to_browser(session, browser)
+    return True
+
+@tracer.traced()
 def check_valid_login():
     """Checks if the login is successful."""
     try:
@@ -122,10 +142,11 @@ def check_valid_login():
     except TimeoutException:
         return True
 
-def navigate_to_courses():
+@tracer.traced()
+def navigate_to_courses(course_filter=COURSE_FILTER, academic_period=ACADEMIC_PERIOD, academic_year=ACADEMIC_YEAR):
     """Navigate to the course schedule page and interact with the course filter."""
     try:
-        browser.get("https://ismis.usc.edu.ph/courseSchedule/CourseScheduleOfferedIndex")
+        browser.get(f"{BASE_URL}/courseSchedule/CourseScheduleOfferedIndex")
 
         # Wait for the filter button and click it
         filter_button = wait_for_element(By.CSS_SELECTOR, "a.rs-ajax.green")
@@ -139,10 +160,9 @@ def navigate_to_courses():
         academic_period_select = wait_for_element(By.ID, "AcademicPeriod")
         academic_year_select = wait_for_element(By.ID, "AcademicYear")
 
-        # Fill in values (you can replace these with dynamic input or defaults)
-        course_input.send_keys("GE-FEL")  # Example course code
-        academic_period_select.send_keys("2ND SEMESTER")
-        academic_year_select.send_keys("2024")
+        course_input.send_keys(course_filter)
+        academic_period_select.send_keys(academic_period)
+        academic_year_select.send_keys(academic_year)
 
         # Find the submit button and click it
         submit_button = wait_for_element(By.CSS_SELECTOR, "div.form-actions button[type='submit']")
@@ -151,8 +171,22 @@ def navigate_to_courses():
     except Exception as e:
         print(f"Error interacting with course filter: {e}")
 
-def print_course_data():
-    """Extract and print course details including the header in the desired format."""
+@tracer.traced()
+def fetch_course_data():
+    """Waits for the search results and returns them as OfferedCourses, or [] on error."""
+    try:
+        WebDriverWait(browser, 10).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "tr"))
+        )
+        return extract_offered_course_rows(browser)
+    except Exception as e:
+        print(f"Error extracting course data: {e}")
+        return []
+
+@tracer.traced()
+def print_course_data(courses=None):
+    """Print course details including the header in the desired format, and return them as OfferedCourses.
+    Reads them from the current page when courses is not given."""
     try:
         # Print the table header
         print("""
@@ -169,58 +203,41 @@ def print_course_data():
 </thead>
         """)
 
-        # Wait for the course rows to load
-        rows = WebDriverWait(browser, 10).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "tr"))
-        )
-        
-        for row in rows:
-            try:
-                # Extract course details
-                course_name = row.find_element(By.XPATH, ".//td[1]").text.strip()
-                course_title = row.find_element(By.XPATH, ".//td[2]").text.strip()
-                section = row.find_element(By.XPATH, ".//td[3]").text.strip()
-                schedule = row.find_element(By.XPATH, ".//td[5]").text.strip()
-                department = row.find_element(By.XPATH, ".//td[6]").text.strip()
-                enrolled = row.find_element(By.XPATH, ".//td[7]").text.strip()
-
-                # Print the course details in the desired format
-                print(f"""
+        if courses is None:
+            courses = fetch_course_data()
+
+        for course in courses:
+            # Print the course details in the desired format
+            print(f"""
 <tr class=" " title="created by: [ID] last [DATE], updated by: [ID] last [DATE]">
-    <td>{course_name}</td>
-    <td>{course_title}</td>
-    <td>{section}</td>
+    <td>{course.course_code}</td>
+    <td>{course.description}</td>
+    <td>{course.status}</td>
     <td></td>
     <td>
-        <span>{schedule}</span><br>
+        <span>{course.schedule}</span><br>
     </td>
     <td>
-        {department}<span>&nbsp;</span> <span>(40)</span> <br>
+        {course.department}<span>&nbsp;</span> <span>(40)</span> <br>
     </td>
-    <td>{enrolled}</td>
+    <td>{course.enrolled}</td>
 </tr>
-                """)
-            except NoSuchElementException:
-                # If any course data is missing, we skip it
-                continue
+            """)
+        return courses
     except Exception as e:
         print(f"Error extracting or printing course data: {e}")
+        return []
 
-def main():
-    """Main function to control the flow of the program."""
-    clear()
-
-    print("Welcome to blurridge's ISMIS Crawler!\n")
-    print("Accessing course schedule data...")
-    time.sleep(1)
-    print("Loading...")
-
+def log_in():
+    """Logs in, over HTTP first when enabled, and waits for the homepage to load."""
     login_status = False
 
     # Load credentials from a file
     username_input, password_input = load_credentials()
 
     # Login process
+    if USE_HTTP_LOGIN:
+        login_status = http_login_to_browser(username_input, password_input)
     while not login_status:
         clear()
         login_status = login_attempt(username_input, password_input)
@@ -235,10 +252,37 @@ def main():
         browser.refresh()
         time.sleep(5)
 
-    navigate_to_courses()
+def fetch_live_courses(course_filter=COURSE_FILTER, academic_period=ACADEMIC_PERIOD, academic_year=ACADEMIC_YEAR):
+    """Logs in if needed, runs the offered course search in the browser and returns the rows."""
+    if not browser.started:
+        log_in()
+    navigate_to_courses(course_filter, academic_period, academic_year)
+    return fetch_course_data()
+
+def main():
+    """Main function to control the flow of the program."""
+    clear()
+
+    print("Welcome to blurridge's ISMIS Crawler!\n")
+    print("Accessing course schedule data...")
+    time.sleep(1)
+    print("Loading...")
+
+    # Answer from the local catalog while it is fresh, the browser is only started for a refresh
+    with CourseCatalog(ttl=CATALOG_TTL) as catalog:
+        courses, diff = catalog.lookup(
+            COURSE_FILTER, ACADEMIC_PERIOD, ACADEMIC_YEAR,
+            lambda: fetch_live_courses(COURSE_FILTER, ACADEMIC_PERIOD, ACADEMIC_YEAR),
+        )
+    if not courses:
+        print(f"No rows for {COURSE_FILTER}, {ACADEMIC_PERIOD} {ACADEMIC_YEAR}, and nothing cached.")
+    elif diff is None:
+        print(f"Using cached results for {COURSE_FILTER}, {ACADEMIC_PERIOD} {ACADEMIC_YEAR}.")
+    else:
+        print_catalog_diff(diff)
 
-    # Extract and print course data
-    print_course_data()
+    # Print course data
+    print_course_data(courses)
 
     print("DONE!")
     browser.quit()
@@ -249,4 +293,5 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        tracer.save()
         browser.quit()
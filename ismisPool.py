@@ -0,0 +1,102 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import queue
+import urllib.parse
+
+from ismisDriver import LazyDriver, create_driver
+from ismisExtract import extract_schedule_rows
+from ismisSession import BASE_URL, load_cookies_into_browser
+from ismisTrace import tracer
+
+
+def create_pool_driver():
+    """The pool's browsers are never looked at, so they always run in the lean profile."""
+    return create_driver(profile="lean")
+
+
+class DriverPool:
+    """A fixed set of browsers that all start out logged in with the same session cookies."""
+
+    def __init__(self, size, cookies, base_url=BASE_URL, factory=create_pool_driver):
+        self.cookies = cookies
+        self.landing_url = urllib.parse.urljoin(base_url.rstrip("/") + "/", "advisedcourse")
+        self._drivers = [LazyDriver(factory) for _ in range(size)]
+        self._idle = queue.Queue()
+        for driver in self._drivers:
+            self._idle.put(driver)
+
+    @contextmanager
+    def borrow(self):
+        """Hands out an idle browser, launching and logging it in on first use."""
+        driver = self._idle.get()
+        try:
+            if not driver.started:
+                load_cookies_into_browser(driver, self.cookies, self.landing_url)
+            yield driver
+        finally:
+            self._idle.put(driver)
+
+    def close(self):
+        """Quits every browser the pool launched."""
+        for driver in self._drivers:
+            try:
+                driver.quit()
+            except WebDriverException as e:
+                print(f"Error while closing browser: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+@tracer.traced("fetch_schedule", "schedule")
+def fetch_schedule(browser, course_code, timeout=10, max_retries=3):
+    """Opens the schedule modal of one advised course and returns its rows, or None if it never loads."""
+    button_selector = f"a.green.rs-modal[title*='Click to view schedule  {course_code}']"
+    tracer.annotate(course_code=course_code)
+    for attempt in range(max_retries):
+        tracer.annotate(retries=attempt)
+        try:
+            button = WebDriverWait(browser, timeout).until(EC.element_to_be_clickable((By.CSS_SELECTOR, button_selector)))
+            previous = browser.find_elements(By.ID, "EnrollBody")
+            button.click()
+            if previous:
+                # The modal keeps the last schedule until the new one replaces it
+                WebDriverWait(browser, timeout).until(EC.staleness_of(previous[0]))
+            WebDriverWait(browser, timeout).until(EC.presence_of_element_located((By.ID, "EnrollBody")))
+            rows = extract_schedule_rows(browser)
+            ActionChains(browser).send_keys(Keys.ESCAPE).perform()
+            return rows
+        except (TimeoutException, WebDriverException) as e:
+            print(f"{course_code} schedule did not load properly ({type(e).__name__}). Retrying ({attempt + 1}/{max_retries})...")
+            try:
+                ActionChains(browser).send_keys(Keys.ESCAPE).perform()
+            except WebDriverException:
+                browser.refresh()
+    print(f"Could not load the schedule for {course_code}.")
+    return None
+
+
+def fetch_schedules(course_codes, cookies, parallelism=3, base_url=BASE_URL, factory=create_pool_driver):
+    """Fetches the #EnrollBody schedules of many advised courses at once.
+    Returns a dict of course code to schedule rows (None for courses that failed)."""
+    course_codes = list(course_codes)
+    if not course_codes:
+        return {}
+
+    with DriverPool(min(parallelism, len(course_codes)), cookies, base_url, factory) as pool:
+        def worker(course_code):
+            with pool.borrow() as browser:
+                return fetch_schedule(browser, course_code)
+
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            return dict(zip(course_codes, executor.map(worker, course_codes)))
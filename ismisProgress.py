@@ -0,0 +1,52 @@
+# Thread-safe progress channel between worker threads and the GUI. Workers post as often as they like;
+# the UI thread drains it on a fixed tick and gets at most one update per tick, so a burst of retries
+# turns into a single in-place text change instead of a new dialog per message.
+from collections import deque, namedtuple
+import threading
+
+# Configurations
+PROGRESS_TICK = 0.1  # Seconds between drains on the UI thread
+PROGRESS_LINES = 8  # Lines kept when messages are appended, e.g. a job's log
+
+ProgressUpdate = namedtuple("ProgressUpdate", ["title", "text", "auto_dismiss", "dismiss"])
+
+
+class ProgressChannel:
+    """Holds only the latest state of the progress display. Safe to post to from any thread."""
+
+    def __init__(self, max_lines=PROGRESS_LINES):
+        self._lock = threading.Lock()
+        self._title = None
+        self._lines = deque(maxlen=max_lines)
+        self._auto_dismiss = False
+        self._dismiss = False
+        self._changed = False  # Anything posted since the last drain
+
+    def post(self, title, text, auto_dismiss=False, append=False):
+        """Sets the dialog to title and text. append adds text as a new line under the same title instead."""
+        with self._lock:
+            if not append or title != self._title:
+                self._lines.clear()
+            self._title = title
+            self._lines.append(text)
+            self._auto_dismiss = auto_dismiss
+            self._dismiss = False
+            self._changed = True
+
+    def dismiss(self):
+        """Asks for the dialog to be closed. Replaces anything posted before it."""
+        with self._lock:
+            self._title = None
+            self._lines.clear()
+            self._dismiss = True
+            self._changed = True
+
+    def drain(self):
+        """Returns a ProgressUpdate with the state after every post since the last drain, or None if nothing was posted."""
+        with self._lock:
+            if not self._changed:
+                return None
+            update = ProgressUpdate(self._title, "\n".join(self._lines), self._auto_dismiss, self._dismiss)
+            self._changed = False
+            self._dismiss = False
+            return update
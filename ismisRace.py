@@ -0,0 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import json
+import os
+import re
+import time
+
+from ismisExtract import parse_modal_links, find_modal_link, parse_schedule_html
+from ismisModal import FINAL_STATES, RETRY_STATES, classify_modal_text
+from ismisSession import http_login
+from ismisTrace import tracer
+
+# Configurations
+RACE_PLAN_FILE = "race_plan.json"  # Enroll links resolved ahead of time
+REUSE_RACE_PLAN = True  # Races from a saved plan instead of scraping the enroll links again
+RACE_OPENING_TIME = "2025-07-07 08:00:00"  # Local time when enrollment opens
+RACE_SECTIONS = {  # Preferred section first, then the fallbacks in order
+    "CPE 2301": ["A", "B"],
+    "CPE 2302": ["A", "B"],
+    "CPE 2303L": ["A", "B"],
+}
+RACE_RETRY_DELAYS = (0.1, 0.2, 0.4, 0.8)  # Seconds between retries of a busy section
+RACE_WARMUP_SECONDS = 30  # Session is re-checked this long before opening
+ADVISED_COURSE_PATH = "/advisedcourse"
+ENROLL_SUCCESS_PATTERN = re.compile(r"Successfully enrolled in")
+ALREADY_ENROLLED_PATTERN = re.compile(r"Already enrolled in [^<]*?block (?P<block>[\w-]+)")
+
+
+# Functions
+def resolve_schedule(session, course_code, links):
+    """Opens a course's 'Click to view schedule' modal over HTTP and returns its schedule rows."""
+    href = find_modal_link(links, f"Click to view schedule  {course_code}")
+    if href is None:
+        print(f"{course_code} is not in the advised course list. Skipping.")
+        return []
+    return parse_schedule_html(session.get(href, ajax=True).text)
+
+
+def build_race_plan(session, sections=RACE_SECTIONS):
+    """
+    Scrapes the enroll link of every preferred and fallback section ahead of time.
+    Returns a dict of course code to a list of {block_number, schedule, link}, in preference order.
+    """
+    links = parse_modal_links(session.get(ADVISED_COURSE_PATH).text)
+    plan = {}
+    for course_code, blocks in sections.items():
+        rows = {row["block_number"]: row for row in resolve_schedule(session, course_code, links) if row["link"]}
+        plan[course_code] = []
+        for block in blocks:
+            row = rows.get(block)
+            if row is None:
+                print(f"{course_code} block {block} has no enroll link. Leaving it out of the plan.")
+                continue
+            plan[course_code].append({"block_number": block, "schedule": row["schedule"], "link": row["link"]})
+        print(f"{course_code}: {len(plan[course_code])} section(s) ready.")
+    return plan
+
+
+def save_race_plan(plan, path=RACE_PLAN_FILE):
+    """Writes the resolved plan to disk so it can be reviewed or reused."""
+    with open(path, "w") as file:
+        json.dump(plan, file, indent=2)
+
+
+def load_race_plan(path=RACE_PLAN_FILE):
+    """Reads a plan saved by save_race_plan."""
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def wait_until(opening_time):
+    """Sleeps until opening_time (a datetime), coarsely at first and in short steps for the last second."""
+    while True:
+        remaining = (opening_time - datetime.datetime.now()).total_seconds()
+        if remaining <= 0:
+            return
+        if remaining > 60:
+            print(f"Enrollment opens in {remaining:.0f} seconds...")
+        time.sleep(min(remaining - 1, 30) if remaining > 1.5 else min(remaining, 0.005))
+
+
+def enrolled_block(text, section):
+    """The block a modal text says the student is enrolled in, or None if it is not an enroll confirmation."""
+    if ENROLL_SUCCESS_PATTERN.search(text):
+        return section["block_number"]
+    match = ALREADY_ENROLLED_PATTERN.search(text)
+    if match:
+        return match.group("block")
+    return None
+
+
+def enroll_section(session, course_code, section):
+    """Fires one enroll link, retrying busy responses. Returns (ModalState or None when enrolled, text)."""
+    text = ""
+    for delay in RACE_RETRY_DELAYS + (None,):
+        text = session.get(section["link"], ajax=True).text
+        if enrolled_block(text, section) is not None:
+            return None, text.strip()
+        state = classify_modal_text(text)
+        if state not in RETRY_STATES:
+            return state, text.strip()
+        if delay is None:
+            break
+        print(f"{course_code} block {section['block_number']}: {state.value}. Retrying in {delay} seconds...")
+        time.sleep(delay)
+    return state, text.strip()
+
+
+def race_course(session, course_code, sections, opened_at):
+    """Tries a course's sections in preference order until one is accepted or a final state stops it."""
+    with tracer.span("race_course", "race", course_code=course_code) as span:
+        block, text = _race_course(session, course_code, sections, opened_at)
+        span.set(block=block)
+        return block, text
+
+
+def _race_course(session, course_code, sections, opened_at):
+    for section in sections:
+        fired_at = time.perf_counter()
+        state, text = enroll_section(session, course_code, section)
+        timing = f"fired +{(fired_at - opened_at) * 1000:.0f} ms, answered in {(time.perf_counter() - fired_at) * 1000:.0f} ms"
+        if state is None:
+            block = enrolled_block(text, section)
+            print(f"{course_code}: enrolled in block {block} ({timing}).")
+            return block, text
+        print(f"{course_code} block {section['block_number']}: {state.value} ({timing}).")
+        if state in FINAL_STATES:
+            return None, text
+    print(f"{course_code}: no section in the plan could be enrolled.")
+    return None, ""
+
+
+def run_race(session, plan, opening_time, before_open=None):
+    """
+    Waits for opening_time, then fires every course's enroll links at once. Returns course code to
+    (enrolled block or None, modal text or error). A course that fails does not stop the others.
+    before_open is called RACE_WARMUP_SECONDS ahead of time, e.g. to make sure the session is still logged in.
+    """
+    print(f"Waiting for enrollment to open at {opening_time}...")
+    warmup_time = opening_time - datetime.timedelta(seconds=RACE_WARMUP_SECONDS)
+    if before_open is not None and datetime.datetime.now() < warmup_time:
+        wait_until(warmup_time)
+        before_open()
+    wait_until(opening_time)
+    opened_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, len(plan))) as executor:
+        futures = {
+            course_code: executor.submit(race_course, session, course_code, sections, opened_at)
+            for course_code, sections in plan.items() if sections
+        }
+        results = {}
+        for course_code, future in futures.items():
+            try:
+                results[course_code] = future.result()
+            except Exception as e:
+                print(f"{course_code}: race failed ({e}).")
+                results[course_code] = (None, f"Failed: {e}")
+        return results
+
+
+def main():
+    """Resolves the race plan ahead of time, then enrolls the moment registration opens."""
+    from ismisAdvisedCourse2 import load_credentials
+
+    username_input, password_input = load_credentials()
+    session = http_login(username_input, password_input)
+    if session is None:
+        return
+
+    if REUSE_RACE_PLAN and os.path.exists(RACE_PLAN_FILE):
+        print(f"Reusing the enroll links in {RACE_PLAN_FILE}.")
+        plan = load_race_plan()
+    else:
+        plan = build_race_plan(session)
+        save_race_plan(plan)
+
+    def before_open():
+        # Cookies may have expired while waiting
+        if not session.is_session_valid():
+            session.login(username_input, password_input)
+
+    opening_time = datetime.datetime.strptime(RACE_OPENING_TIME, "%Y-%m-%d %H:%M:%S")
+    results = run_race(session, plan, opening_time, before_open)
+    for course_code, (block, text) in results.items():
+        if block:
+            print(f"{course_code}: block {block}")
+        else:
+            print(f"{course_code}: not enrolled ({text or 'no sections'})")
+    tracer.save()
+    print("DONE!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# Result rows for the GUI's RecycleView. Crawls run on worker threads and push rows into a ResultFeed
+# as soon as each table or page is parsed; the UI thread drains it in batches, so the first rows show
+# up right away and only the rows on screen ever get widgets.
+from collections import deque
+import threading
+
+from ismisCatalogCrawler import CATALOG_PREFIXES, ACADEMIC_PERIOD, ACADEMIC_YEAR, crawl_prefix, owning_prefix
+from ismisExtract import parse_modal_links, find_modal_link, parse_schedule_html
+
+# Configurations
+RESULT_BATCH = 500  # Rows added to the view per drain, so a whole catalog never lands in one frame
+
+
+def result_row(primary, secondary="", trailing="", header=False):
+    """One RecycleView data entry. Kept to four short strings so a full catalog stays small in memory."""
+    return {"primary": primary, "secondary": secondary, "trailing": trailing, "header": header}
+
+
+def grade_rows(records):
+    """GradeRecords as rows, with a header row per term."""
+    rows = []
+    term = None
+    for record in records:
+        if record.term != term:
+            rows.append(result_row(record.term, header=True))
+            term = record.term
+        units = "" if record.units is None else f"{record.units:g} units"
+        rows.append(result_row(record.code, record.name, f"{record.midterm or '-'} / {record.final or '-'}  {units}"))
+    return rows
+
+
+def schedule_rows(course_code, rows):
+    """Schedule rows of one course, under a header row."""
+    return [result_row(f"Schedule for {course_code}", header=True)] + [
+        result_row(f"Block {row['block_number']}", row["schedule"] or "", f"{row['course_status']} {row['population']}")
+        for row in rows
+    ]
+
+
+def offered_course_rows(courses):
+    """OfferedCourses as rows."""
+    return [
+        result_row(course.course_code, f"{course.description}  {course.schedule}", f"{course.status} {course.enrolled}")
+        for course in courses
+    ]
+
+
+class ResultFeed:
+    """
+    Thread-safe queue of result rows for one view at a time. start() begins a new result set and
+    makes rows still coming from an older crawl stale, so switching views never mixes results.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = deque()
+        self._generation = 0
+        self._reset = False
+        self._status = None
+
+    def start(self, status="Loading..."):
+        """Clears the view and returns the generation the new crawl has to pass to put()."""
+        with self._lock:
+            self._generation += 1
+            self._rows.clear()
+            self._reset = True
+            self._status = status
+            return self._generation
+
+    def is_current(self, generation):
+        """False once start() began a newer result set, so a crawl can give up before its first request."""
+        with self._lock:
+            return generation == self._generation
+
+    def put(self, generation, rows, status=None):
+        """Adds rows and optionally a status line. Returns False once the crawl is stale and should stop."""
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._rows.extend(rows)
+            if status is not None:
+                self._status = status
+            return True
+
+    def replace(self, generation, rows, status=None):
+        """Swaps the whole result set, e.g. cached grades for freshly checked ones."""
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._rows = deque(rows)
+            self._reset = True
+            if status is not None:
+                self._status = status
+            return True
+
+    def drain(self, limit=RESULT_BATCH):
+        """Returns (reset, rows, status) with at most limit rows. status is None when it did not change."""
+        with self._lock:
+            rows = [self._rows.popleft() for _ in range(min(limit, len(self._rows)))]
+            reset, status = self._reset, self._status
+            self._reset, self._status = False, None
+            return reset, rows, status
+
+
+# Streams, run on a worker thread
+def stream_grades(feed, generation, session, store):
+    """Shows the stored grades at once, then swaps in the checked ones."""
+    from ismisGrades import check_grades, format_grade_update
+
+    if store.records():
+        feed.put(generation, grade_rows(store.records()), "Checking for new grades...")
+    update = check_grades(session, store)
+    feed.replace(generation, grade_rows(update.records), format_grade_update(update).splitlines()[0])
+
+
+def stream_schedules(feed, generation, session, course_codes):
+    """Adds each advised course's schedule as soon as it is parsed."""
+    links = parse_modal_links(session.get("/advisedcourse").text)
+    for course_code in course_codes:
+        href = find_modal_link(links, f"Click to view schedule  {course_code}")
+        if href is None:
+            rows = [result_row(course_code, "Not in the advised course list.", header=True)]
+        else:
+            rows = schedule_rows(course_code, parse_schedule_html(session.get(href, ajax=True).text))
+        if not feed.put(generation, rows, f"Loaded {course_code}..."):
+            return
+    feed.put(generation, [], f"{len(course_codes)} course(s).")
+
+
+def stream_catalog(feed, generation, session, prefixes=CATALOG_PREFIXES,
+                   academic_period=ACADEMIC_PERIOD, academic_year=ACADEMIC_YEAR):
+    """Adds the offered-course catalog one results page at a time."""
+    count = 0
+    for prefix in prefixes:
+        for page, courses in crawl_prefix(session, prefix, academic_period, academic_year):
+            courses = [course for course in courses if owning_prefix(course.course_code, prefixes) in (prefix, None)]
+            count += len(courses)
+            if not feed.put(generation, offered_course_rows(courses), f"{prefix} page {page}: {count} courses..."):
+                return
+    feed.put(generation, [], f"{count} offered courses, {academic_period} {academic_year}.")
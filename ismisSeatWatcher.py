@@ -0,0 +1,251 @@
+# Watches the schedules of advised courses and reacts when a closed section opens or gets a free seat.
+# Polls the schedule modals over plain HTTP with jittered intervals, so it can run for hours without a
+# browser, and only parses a schedule table again when its HTML changed:
+#
+#     python ismisSeatWatcher.py "CPE 2301:A,C" "CPE 2302" --interval 20 --enroll
+from collections import namedtuple
+import argparse
+import random
+import time
+import urllib.error
+
+from ismisExtract import parse_modal_links, find_modal_link, parse_schedule_html
+from ismisGrades import fingerprint
+from ismisModal import RETRY_STATES, classify_modal_text
+from ismisSession import LoginFormParser, http_login
+from ismisTrace import tracer
+
+# Configurations
+ADVISED_COURSE_PATH = "/advisedcourse"
+POLL_INTERVAL = 30.0  # Seconds between rounds over every watched course
+POLL_JITTER = 0.3  # Each wait is POLL_INTERVAL +/- this fraction, so polls never line up with other clients
+MAX_BACKOFF = 300.0  # Longest wait after repeated failed rounds
+ENROLL_SUCCESS_TEXTS = ("Successfully enrolled", "Already enrolled")
+WATCH_MAX_TRACE_EVENTS = 20000  # Keeps the tracer from growing for hours. Later spans are counted but dropped
+
+SeatOpening = namedtuple("SeatOpening", ["course_code", "block", "status", "population", "link", "previous"])
+
+
+class SessionLostError(Exception):
+    """Raised when the watcher was logged out and could not log in again. run() backs off and tries again."""
+
+
+def parse_population(text):
+    """Splits a population cell like "38/40" into (enrolled, capacity), or None when it is not in that form."""
+    try:
+        enrolled, capacity = (int(part) for part in (text or "").split("/"))
+    except ValueError:
+        return None
+    return enrolled, capacity
+
+
+def has_free_seat(row):
+    """True when a schedule row is OPEN and, if its population can be read, below capacity."""
+    if (row.get("course_status") or "").upper() != "OPEN":
+        return False
+    population = parse_population(row.get("population"))
+    return population is None or population[0] < population[1]
+
+
+def parse_watch_spec(spec):
+    """Turns "CPE 2301:A,C" into ("CPE 2301", {"A", "C"}). A course without blocks watches every section."""
+    course_code, _, blocks = spec.partition(":")
+    blocks = {block.strip() for block in blocks.split(",") if block.strip()}
+    return course_code.strip(), blocks or None
+
+
+def jittered(interval, jitter, rng):
+    """interval +/- jitter as a fraction of it."""
+    return max(0.0, interval * (1 + rng.uniform(-jitter, jitter)))
+
+
+def print_opening(opening):
+    """Default callback: one line per section that has a seat."""
+    was = f"was {opening.previous['course_status']} {opening.previous['population']}" if opening.previous else "first check"
+    print(f"Seat available: {opening.course_code} block {opening.block} is {opening.status} {opening.population} ({was}).")
+
+
+class SeatWatcher:
+    """
+    Polls the schedule of each watched course and calls on_opening with a SeatOpening for every section
+    that has a free seat and did not have one on the previous read. With enroll=True the section's Enroll
+    link is followed right away and the course stops being watched once enrolled.
+    Only the latest rows of each course are kept, so memory stays flat however long it runs.
+    """
+
+    def __init__(self, session, watch, on_opening=print_opening, enroll=False, credentials=None,
+                 interval=POLL_INTERVAL, jitter=POLL_JITTER, seed=None):
+        self.session = session
+        self.watch = dict(watch)  # Course code -> set of blocks, or None for every block
+        self.on_opening = on_opening
+        self.enroll = enroll
+        self.credentials = credentials  # (username, password) for logging in again when the session expires
+        self.interval = interval
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.schedule_links = {}
+        self.fingerprints = {}
+        self.sections = {}  # Course code -> {block: row} from the last parsed table
+        self.polls = 0
+        self.parsed = 0
+        self.skipped = 0
+
+    def is_logged_out(self, html):
+        parser = LoginFormParser()
+        parser.feed(html)
+        return parser.login_form() is not None
+
+    def relogin(self):
+        """Logs the session in again. Raises SessionLostError when there are no credentials or the login failed."""
+        self.schedule_links.clear()
+        if self.credentials is None:
+            raise SessionLostError("Logged out of ISMIS and no credentials to log in again.")
+        print("ISMIS session expired. Logging in again...")
+        try:
+            logged_in = self.session.login(*self.credentials)
+        except Exception as e:
+            raise SessionLostError(f"Could not log in again: {e}") from e
+        if not logged_in:
+            raise SessionLostError("ISMIS refused the saved credentials.")
+
+    def refresh_links(self):
+        """Reads the 'Click to view schedule' link of every watched course from the advised course page."""
+        page = self.session.get(ADVISED_COURSE_PATH)
+        if self.is_logged_out(page.text):
+            self.relogin()
+            page = self.session.get(ADVISED_COURSE_PATH)
+        links = parse_modal_links(page.text)
+        self.schedule_links = {}
+        for course_code in list(self.watch):
+            href = find_modal_link(links, f"Click to view schedule  {course_code}")
+            if href is None:
+                print(f"{course_code} is not in the advised course list. Not watching it.")
+                self.stop_watching(course_code)
+            else:
+                self.schedule_links[course_code] = href
+
+    @tracer.traced("check_course", "watch")
+    def check_course(self, course_code):
+        """Reads one course's schedule and returns the SeatOpenings since the previous read."""
+        tracer.annotate(course_code=course_code)
+        href = self.schedule_links.get(course_code)
+        if href is None:
+            return []  # Links are read again next round, e.g. after logging in again
+        html = self.session.get(href, ajax=True).text
+        digest = fingerprint(html)
+        if digest == self.fingerprints.get(course_code):
+            self.skipped += 1
+            tracer.annotate(changed=False)
+            return []
+        if self.is_logged_out(html):
+            self.relogin()
+            return []
+        if "EnrollBody" not in html:
+            print(f"{course_code}: schedule did not load ({classify_modal_text(html).value}). Trying again next round.")
+            return []
+        self.parsed += 1
+        tracer.annotate(changed=True)
+        blocks = self.watch[course_code]
+        rows = {row["block_number"]: row for row in parse_schedule_html(html)
+                if blocks is None or row["block_number"] in blocks}
+        previous = self.sections.get(course_code, {})
+        openings = [
+            SeatOpening(course_code, block, row["course_status"], row["population"], row["link"], previous.get(block))
+            for block, row in rows.items()
+            if has_free_seat(row) and not (block in previous and has_free_seat(previous[block]))
+        ]
+        self.fingerprints[course_code] = digest
+        self.sections[course_code] = rows
+        return openings
+
+    def enroll_in(self, opening):
+        """Follows a section's Enroll link. Returns True once ISMIS confirms the enrollment."""
+        if not opening.link:
+            print(f"{opening.course_code} block {opening.block} has no Enroll link.")
+            return False
+        text = self.session.get(opening.link, ajax=True).text
+        if any(success in text for success in ENROLL_SUCCESS_TEXTS):
+            print(f"Enrolled in {opening.course_code} block {opening.block}.")
+            return True
+        if classify_modal_text(text) in RETRY_STATES:
+            print(f"{opening.course_code}: server busy while enrolling. Trying again next round.")
+        else:
+            print(f"Could not enroll in {opening.course_code} block {opening.block}: {' '.join(text.split())[:200]}")
+        self.fingerprints.pop(opening.course_code, None)  # Re-read the table so a seat that is still free counts again
+        self.sections.pop(opening.course_code, None)
+        return False
+
+    @tracer.traced("watch_round", "watch")
+    def poll_once(self):
+        """Checks every watched course once and handles its openings. Returns the SeatOpenings found."""
+        if any(course_code not in self.schedule_links for course_code in self.watch):
+            self.refresh_links()
+        self.polls += 1
+        found = []
+        for course_code in list(self.schedule_links):
+            for opening in self.check_course(course_code):
+                found.append(opening)
+                if self.on_opening is not None:
+                    self.on_opening(opening)
+                if self.enroll and self.enroll_in(opening):
+                    self.stop_watching(course_code)
+                    break
+        return found
+
+    def stop_watching(self, course_code):
+        for mapping in (self.watch, self.schedule_links, self.fingerprints, self.sections):
+            mapping.pop(course_code, None)
+
+    def run(self, max_polls=None, sleep=time.sleep):
+        """Polls until every course is enrolled, max_polls rounds have run, or Ctrl+C.
+        sleep waits between rounds; a job runner passes one that honours pause and cancel.
+        Network errors and a lost session are backed off and retried."""
+        max_events = tracer.max_events
+        tracer.max_events = min(max_events, WATCH_MAX_TRACE_EVENTS)
+        failures = 0
+        try:
+            while self.watch and (max_polls is None or self.polls < max_polls):
+                wait = 0.0
+                try:
+                    self.poll_once()
+                    failures = 0
+                    wait = jittered(self.interval, self.jitter, self.rng)
+                except (urllib.error.URLError, TimeoutError, ConnectionError, SessionLostError) as e:
+                    failures += 1
+                    wait = min(MAX_BACKOFF, jittered(self.interval, self.jitter, self.rng) * 2 ** failures)
+                    print(f"Watch round failed ({e}). Waiting {wait:.0f} seconds...")
+                if self.watch and (max_polls is None or self.polls < max_polls):
+                    sleep(wait)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+        finally:
+            tracer.max_events = max_events
+        print(f"{self.polls} rounds: {self.parsed} schedule tables parsed, {self.skipped} unchanged.")
+
+
+def main():
+    """Logs in over HTTP and watches the given courses until a seat opens in each (or forever without --enroll)."""
+    from ismisOfferedCourses import load_credentials
+
+    parser = argparse.ArgumentParser(description="Watch ISMIS sections for free seats.")
+    parser.add_argument("courses", nargs="+", help='advised courses to watch, e.g. "CPE 2301" or "CPE 2301:A,C" for some blocks')
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="seconds between rounds")
+    parser.add_argument("--jitter", type=float, default=POLL_JITTER, help="random share of the interval added or removed")
+    parser.add_argument("--enroll", action="store_true", help="enroll as soon as a watched section has a seat")
+    parser.add_argument("--max-polls", type=int, help="stop after this many rounds")
+    args = parser.parse_args()
+
+    username_input, password_input = load_credentials()
+    session = http_login(username_input, password_input)
+    if session is None:
+        return
+    watcher = SeatWatcher(session, [parse_watch_spec(spec) for spec in args.courses], enroll=args.enroll,
+                          credentials=(username_input, password_input), interval=args.interval, jitter=args.jitter)
+    try:
+        watcher.run(args.max_polls)
+    finally:
+        tracer.save()
+
+
+if __name__ == "__main__":
+    main()
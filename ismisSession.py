@@ -0,0 +1,234 @@
+import http.cookiejar
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+from html.parser import HTMLParser
+import os
+import time
+
+from ismisTrace import tracer
+
+# Configurations
+BASE_URL = os.environ.get("ISMIS_BASE_URL", "https://ismis.usc.edu.ph").rstrip("/")  # Point at ismisMockServer.py for offline runs
+SESSION_CACHE_FILE = "session_{username}.cookies"  # Saved auth cookies, one file per account
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+
+PageResponse = namedtuple("PageResponse", ["url", "status", "text"])
+
+
+class LoginFormParser(HTMLParser):
+    """Collects the action and input values of the form that holds the password field."""
+
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._current = {"action": attrs.get("action") or "", "fields": {}, "has_password": False}
+            self.forms.append(self._current)
+        elif tag == "input" and self._current is not None and attrs.get("name"):
+            self._current["fields"][attrs["name"]] = attrs.get("value") or ""
+            if attrs.get("type", "").lower() == "password":
+                self._current["has_password"] = True
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._current = None
+
+    def login_form(self):
+        """Returns the first form with a password input, or None."""
+        for form in self.forms:
+            if form["has_password"]:
+                return form
+        return None
+
+
+class ISMISSession:
+    """Plain HTTP session for ISMIS that logs in without a browser and keeps the cookie jar."""
+
+    def __init__(self, base_url=BASE_URL, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cookie_jar = http.cookiejar.LWPCookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookie_jar))
+        self.opener.addheaders = [("User-Agent", USER_AGENT)]
+        self.request_count = 0
+        self.logged_in = False
+
+    def url(self, path):
+        """Resolves a path like '/ViewGrades' against the base URL."""
+        return urllib.parse.urljoin(self.base_url + "/", path)
+
+    def request(self, method, path, data=None, ajax=False, max_retries=5):
+        """Sends a request with retry logic for connection errors and 5xx site crashes."""
+        headers = {}
+        body = None
+        if data is not None:
+            body = urllib.parse.urlencode(data).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        if ajax:
+            headers["X-Requested-With"] = "XMLHttpRequest"
+
+        retries = 0
+        with tracer.span("http_request", "http", method=method, path=path) as span:
+            while True:
+                req = urllib.request.Request(self.url(path), data=body, headers=headers, method=method)
+                try:
+                    self.request_count += 1
+                    with self.opener.open(req, timeout=self.timeout) as response:
+                        charset = response.headers.get_content_charset() or "utf-8"
+                        span.set(status=response.status, retries=retries)
+                        return PageResponse(response.geturl(), response.status, response.read().decode(charset, "replace"))
+                except urllib.error.HTTPError as e:
+                    span.set(status=e.code, retries=retries)
+                    if e.code < 500 or retries >= max_retries:
+                        raise
+                    print(f"Server error {e.code} on {path}. Retrying ({retries + 1}/{max_retries})...")
+                except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+                    span.set(retries=retries)
+                    if retries >= max_retries:
+                        raise
+                    print(f"Connection issue detected ({e}). Retrying ({retries + 1}/{max_retries})...")
+                retries += 1
+                time.sleep(min(2 ** retries * 0.25, 5))
+
+    def get(self, path, ajax=False):
+        """Fetches a page and returns its PageResponse."""
+        return self.request("GET", path, ajax=ajax)
+
+    def post(self, path, data, ajax=False):
+        """Posts form data and returns the PageResponse."""
+        return self.request("POST", path, data=data, ajax=ajax)
+
+    @tracer.traced("http_login", "http")
+    def login(self, username, password, max_retries=5):
+        """Fetches the login form, posts the credentials with its anti-forgery token and reports success."""
+        retries = 0
+        while retries < max_retries:
+            page = self.get("/")
+            parser = LoginFormParser()
+            parser.feed(page.text)
+            form = parser.login_form()
+            if form is None:
+                if "header_profile_pic" in page.text:
+                    self.logged_in = True  # Existing cookies are still valid
+                    return True
+                print(f"Login page not loaded properly. Retrying ({retries + 1}/{max_retries})...")
+                retries += 1
+                time.sleep(2)
+                continue
+
+            fields = dict(form["fields"])
+            fields["Username"] = username
+            fields["Password"] = password
+            if "__RequestVerificationToken" not in fields:
+                print("Warning: login form has no __RequestVerificationToken.")
+
+            print(f"Attempting login for {username}...")
+            action = urllib.parse.urljoin(page.url, form["action"]) if form["action"] else page.url
+            result = self.post(action, fields)
+
+            if "validation-summary-errors" in result.text:
+                print("Wrong username/password. Please try again.")
+                return False
+            if "header_profile_pic" in result.text:
+                self.logged_in = True
+                return True
+
+            print(f"Homepage not loaded properly. Retrying ({retries + 1}/{max_retries})...")
+            retries += 1
+            time.sleep(2)
+        raise Exception("Failed to log in after multiple retries.")
+
+    def is_session_valid(self):
+        """Checks with one request whether the current cookies still reach the logged-in homepage."""
+        try:
+            page = self.get("/")
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            print(f"Could not check saved session ({e}).")
+            return False
+        self.logged_in = "header_profile_pic" in page.text
+        return self.logged_in
+
+    def save_cookies(self, path):
+        """Writes the cookie jar to disk, including session-only cookies."""
+        self.cookie_jar.save(path, ignore_discard=True, ignore_expires=True)
+        try:
+            os.chmod(path, 0o600)  # Auth cookies are as good as the password
+        except OSError:
+            pass
+
+    def load_cookies(self, path):
+        """Loads cookies saved by save_cookies. Returns False if there is no usable cache file."""
+        if not os.path.exists(path):
+            return False
+        try:
+            self.cookie_jar.load(path, ignore_discard=True, ignore_expires=True)
+        except (OSError, http.cookiejar.LoadError) as e:
+            print(f"Saved session could not be read ({e}). Logging in again...")
+            return False
+        return True
+
+    def selenium_cookies(self):
+        """Returns the cookie jar in the dict format accepted by WebDriver.add_cookie."""
+        cookies = []
+        for cookie in self.cookie_jar:
+            entry = {"name": cookie.name, "value": cookie.value, "path": cookie.path or "/", "secure": bool(cookie.secure)}
+            if cookie.domain_specified:
+                entry["domain"] = cookie.domain  # Host-only cookies stay bound to the current domain
+            if cookie.expires:
+                entry["expiry"] = int(cookie.expires)
+            cookies.append(entry)
+        return cookies
+
+
+def load_cookies_into_browser(browser, cookies, landing_url):
+    """Adds WebDriver-format cookies to a browser and opens landing_url with them."""
+    browser.get(landing_url)  # Cookies can only be set for the current domain
+    for cookie in cookies:
+        browser.add_cookie(cookie)
+    browser.get(landing_url)
+
+
+def copy_cookies_to_browser(session, browser, landing_path="/"):
+    """Loads the session cookies into a WebDriver so it starts out logged in."""
+    load_cookies_into_browser(browser, session.selenium_cookies(), session.url(landing_path))
+
+
+def session_cache_path(username):
+    """Returns the cookie cache file for an account."""
+    return SESSION_CACHE_FILE.format(username="".join(c for c in username if c.isalnum()) or "default")
+
+
+@tracer.traced("http_cached_login", "http")
+def cached_login(username, password, base_url=BASE_URL):
+    """Reuses saved cookies when they are still valid, otherwise logs in and saves the new ones.
+    Returns an authenticated ISMISSession, or None on wrong credentials."""
+    session = ISMISSession(base_url)
+    cache_path = session_cache_path(username)
+
+    if session.load_cookies(cache_path):
+        if session.is_session_valid():
+            print("Reusing saved ISMIS session.")
+            return session
+        print("Saved session has expired. Logging in again...")
+        session.cookie_jar.clear()
+
+    if not session.login(username, password):
+        return None
+    session.save_cookies(cache_path)
+    return session
+
+
+def http_login(username, password, base_url=BASE_URL, use_cache=True):
+    """Logs in over plain HTTP. Returns an authenticated ISMISSession, or None on wrong credentials."""
+    if use_cache:
+        return cached_login(username, password, base_url)
+    session = ISMISSession(base_url)
+    if session.login(username, password):
+        return session
+    return None
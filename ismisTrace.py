@@ -0,0 +1,146 @@
+# Timed spans around crawler steps, exported as Chrome trace-event JSON.
+# Open the saved file in chrome://tracing or https://ui.perfetto.dev to see where a run spent its time.
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import json
+import os
+import threading
+import time
+
+# Configurations
+TRACE_FILE = os.environ.get("ISMIS_TRACE_FILE", "ismis_trace.json")
+MAX_TRACE_EVENTS = 500000  # Roughly 100 MB of JSON. Later spans are counted but dropped
+
+_open_spans = ContextVar("ismis_open_spans", default=())  # Per thread and per asyncio task
+
+
+class Span:
+    """One timed step. Attributes end up in the trace event's args."""
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        """Adds or overwrites attributes, e.g. the retry count or modal state found along the way."""
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """Records spans from any thread or asyncio task and writes them as Chrome trace events."""
+
+    def __init__(self, max_events=MAX_TRACE_EVENTS):
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self.tracks = {}  # Track name -> tid, for spans that should get their own row in the viewer
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def _timestamp(self, moment):
+        return round((moment - self.origin) * 1_000_000, 1)  # Trace events use microseconds
+
+    def _thread_id(self, track):
+        if track is None:
+            thread = threading.current_thread()
+            key, name = thread.ident, thread.name
+        else:
+            key, name = track, track
+        with self.lock:
+            tid = self.tracks.get(key)
+            if tid is None:
+                tid = self.tracks[key] = len(self.tracks) + 1
+                self.events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}})
+        return tid
+
+    def _add(self, event):
+        with self.lock:
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category="crawler", track=None, **attributes):
+        """
+        Times the enclosed block as a span. track puts concurrent spans (e.g. one per course in an
+        asyncio gather) on their own row instead of the current thread's.
+        """
+        span = Span(name, attributes)
+        token = _open_spans.set(_open_spans.get() + (span,))
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            end = time.perf_counter()
+            _open_spans.reset(token)
+            self._add({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": self._timestamp(start),
+                "dur": round((end - start) * 1_000_000, 1),
+                "pid": os.getpid(),
+                "tid": self._thread_id(track),
+                "args": {key: _json_value(value) for key, value in span.attributes.items()},
+            })
+
+    def traced(self, name=None, category="crawler"):
+        """Decorator that wraps every call of a function in a span."""
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def annotate(self, **attributes):
+        """Sets attributes on the innermost open span of the current thread or task, if any."""
+        spans = _open_spans.get()
+        if spans:
+            spans[-1].set(**attributes)
+
+    def summary(self):
+        """Returns count and total milliseconds per span name, slowest first."""
+        totals = {}
+        with self.lock:
+            events = [event for event in self.events if event["ph"] == "X"]
+        for event in events:
+            entry = totals.setdefault(event["name"], {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += event["dur"] / 1000
+        return dict(sorted(totals.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+    def save(self, path=TRACE_FILE):
+        """Writes every recorded event as Chrome trace JSON."""
+        with self.lock:
+            events = list(self.events)
+        if not any(event["ph"] != "M" for event in events):
+            return
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped_events": self.dropped}}, file)
+        print(f"Trace written to {path} ({len(events)} events). Open it in chrome://tracing or ui.perfetto.dev.")
+
+    def print_summary(self, limit=10):
+        """Prints the span names that took the most time in total."""
+        for name, entry in list(self.summary().items())[:limit]:
+            print(f"{name}: {entry['count']} spans, {entry['total_ms']:.0f} ms total")
+
+
+def _json_value(value):
+    """Keeps span attributes JSON-serializable. Enums are written by name."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "name") and hasattr(value, "value"):
+        return value.name
+    return str(value)
+
+
+tracer = Tracer()
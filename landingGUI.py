@@ -1,23 +1,60 @@
-import kivy
+import time
+STARTUP_START = time.perf_counter()  # Taken before the Kivy imports so the startup timings include them
+
+import json
 import os
+import statistics
+import threading
 from kivymd.app import MDApp
 from kivy.lang import Builder
-from kivymd.uix.label import MDLabel
-from kivymd.uix.screen import MDScreen
-from kivymd.uix.button import MDButton, MDButtonIcon, MDButtonText
-from kivy.uix.anchorlayout import AnchorLayout
-from kivy.graphics import Color, Rectangle
-from kivy.config import Config
 from kivy.core.window import Window
 from kivy.uix.screenmanager import ScreenManager, Screen
-from kivymd.uix.dialog import MDDialog
-from kivymd.uix.dialog import (
-    MDDialogHeadlineText,
-    MDDialogSupportingText,
-    MDDialogButtonContainer,
-)
-from kivymd.uix.button import MDButton, MDButtonText
+from kivy.uix.boxlayout import BoxLayout
+from kivy.properties import StringProperty, BooleanProperty
 from kivy.clock import Clock
+from ismisProgress import ProgressChannel, PROGRESS_TICK
+
+# KivyMD widgets used in the kv files are looked up through the Factory when a rule is applied,
+# and the dialog classes are imported the first time a dialog opens, so none are imported here.
+
+# Configurations
+PREWARM_SELENIUM = True  # Imports Selenium in the background while the login screen is up. Chrome itself only starts if HTTP login fails
+STARTUP_TIMINGS_FILE = "startup_timings.json"  # One entry per launch, to spot slow starts
+STARTUP_HISTORY = 50  # Launches kept in the timings file
+STARTUP_REGRESSION = 0.2  # A first frame this much slower than the median of earlier launches is reported
+
+startup_marks = {}
+
+
+def mark_startup(name):
+    """Records milliseconds since the process started, once per name."""
+    startup_marks.setdefault(name, round((time.perf_counter() - STARTUP_START) * 1000, 1))
+
+
+def save_startup_timings(path=STARTUP_TIMINGS_FILE):
+    """Appends this launch's marks to the timings file and reports a first frame slower than usual."""
+    history = []
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as file:
+                history = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Could not read {path} ({e}). Starting a new one.")
+    print("Startup: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in startup_marks.items()))
+    earlier = [entry["first_frame"] for entry in history if "first_frame" in entry]
+    if earlier and "first_frame" in startup_marks:
+        median = statistics.median(earlier)
+        if startup_marks["first_frame"] > median * (1 + STARTUP_REGRESSION):
+            print(f"Slow start: first frame after {startup_marks['first_frame']:.0f} ms, usually {median:.0f} ms.")
+    history = (history + [dict(startup_marks, timestamp=time.time())])[-STARTUP_HISTORY:]
+    try:
+        with open(path, "w") as file:
+            json.dump(history, file, indent=2)
+    except OSError as e:
+        print(f"Could not write {path} ({e}).")
+
+
+mark_startup("imports")
 
 
 class LoginScreen(Screen):
@@ -26,35 +63,67 @@ class LoginScreen(Screen):
 class HomeScreen(Screen):
     pass
 
+class ResultsScreen(Screen):
+    pass
+
+class ResultRow(BoxLayout):
+    # RecycleView viewclass, filled from the dicts made by ismisResults.result_row
+    primary = StringProperty("")
+    secondary = StringProperty("")
+    trailing = StringProperty("")
+    header = BooleanProperty(False)
+
 class ISMISCrawler(MDApp):
     dialog = None
+    dialog_title = None
+    dialog_text = None
+    dialog_reusable = False
+    progress = None
+    session = None
+    username = None
+    password = None
+    runner = None
+    home_screen = None
+    results_screen = None
+    results_feed = None
+    browser = None  # Started by get_browser for the browser login fallback
     
     def runISMIS(app):
-        from selenium import webdriver
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.webdriver.chrome.service import Service
-        from selenium.webdriver.chrome.options import Options
-        import time
+        from ismisSession import cached_login
 
         def show(msg):
-            from kivy.clock import Clock
-            Clock.schedule_once(lambda dt: app.show_dialog("Logging in...", msg, auto_dismiss=False), 0)
-
-        show("Launching browser...")
-        options = Options()
-        options.headless = False
-        options.add_experimental_option("excludeSwitches", ["enable-logging"])
-        service = Service("./chromedriver.exe")
-        browser = webdriver.Chrome(service=service, options=options)
+            app.progress.post("Logging in...", msg)
 
         show("Reading credentials...")
         with open("credentials.txt", "r") as f:
             username, password = [line.strip() for line in f.readlines()]
+        app.username, app.password = username, password
 
         show("Opening ISMIS...")
-        browser.get("https://ismis.usc.edu.ph")
+        try:
+            session = cached_login(username, password)
+        except Exception as e:
+            show(f"HTTP login failed ({e}). Launching browser...")
+            app.runISMISBrowser(username, password, show)
+            return
+
+        if session is None:
+            raise Exception("Wrong username/password. Please try again.")
+        app.session = session
+
+        show("Login successful! Launching dashboard...")
+
+    def runISMISBrowser(app, username, password, show):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from ismisSession import BASE_URL
+
+        show("Launching browser...")
+        browser = app.get_browser()
+
+        show("Opening ISMIS...")
+        browser.get(BASE_URL)
 
         while True:
             try:
@@ -79,10 +148,10 @@ class ISMISCrawler(MDApp):
         try:
             self.runISMIS()
         except Exception as e:
-            Clock.schedule_once(lambda dt: self.show_dialog("Login Failed", str(e), auto_dismiss=True), 0)
+            self.progress.post("Login Failed", str(e), auto_dismiss=True)
             return
 
-        Clock.schedule_once(lambda dt: self.dialog.dismiss() if self.dialog else None, 0.1)
+        self.progress.dismiss()
 
         Clock.schedule_once(lambda dt: self.goto_home(), 0.5)
 
@@ -94,23 +163,78 @@ class ISMISCrawler(MDApp):
         Window.maximum_height = 768
         Window.resizable = False 
         Window.set_title("ISMIS Crawler")
+        # Worker threads post progress here; the UI applies at most one update per tick
+        self.progress = ProgressChannel()
+        Clock.schedule_interval(self.drain_progress, PROGRESS_TICK)
         self.theme_cls.primary_palette = "Green"
         self.theme_cls.primary_hue = "700"
         self.theme_cls.theme_style = "Dark"
             
-        Builder.load_file('kv/home.kv')
+        # Only the login screen is built up front. kv/home.kv is loaded by ensure_home_screen
         Builder.load_file('kv/login.kv')
         
         self.sm = ScreenManager()
         self.login_screen = LoginScreen(name="login")
-        self.home_screen = HomeScreen(name="home")
 
         self.sm.add_widget(self.login_screen)
-        self.sm.add_widget(self.home_screen)
-            
-        self.check_credentials()
+        self.sm.current = "login"
+        mark_startup("build")
 
         return self.sm
+
+    def on_start(self):
+        # Runs on the frame after the login screen was first drawn
+        Clock.schedule_once(self.after_first_frame, 0)
+
+    def after_first_frame(self, dt):
+        mark_startup("first_frame")
+        save_startup_timings()
+        if PREWARM_SELENIUM:
+            self.prewarm_selenium()
+        self.check_credentials()
+
+    def prewarm_selenium(self):
+        # Pays for the Selenium import while the user types, without opening a window nobody asked for
+        def load():
+            try:
+                from selenium import webdriver
+                from selenium.webdriver.chrome.service import Service
+                from selenium.webdriver.chrome.options import Options
+            except ImportError as e:
+                print(f"Selenium is not available ({e}). The browser login fallback will not work.")
+                return
+            print(f"Selenium loaded {(time.perf_counter() - STARTUP_START) * 1000:.0f} ms after start.")
+
+        threading.Thread(target=load, name="selenium-prewarm", daemon=True).start()
+
+    def get_browser(self):
+        # Chrome is only started once HTTP login has failed and the browser fallback needs it
+        if self.browser is None:
+            from ismisDriver import create_driver
+
+            self.browser = create_driver()
+        return self.browser
+
+    def ensure_home_screen(self):
+        if self.home_screen is None:
+            start = time.perf_counter()
+            Builder.load_file('kv/home.kv')
+            self.home_screen = HomeScreen(name="home")
+            self.sm.add_widget(self.home_screen)
+            print(f"Home screen built in {(time.perf_counter() - start) * 1000:.0f} ms.")
+        return self.home_screen
+
+    def ensure_results_screen(self):
+        from ismisResults import ResultFeed
+
+        if self.results_screen is None:
+            Builder.load_file('kv/results.kv')
+            self.results_screen = ResultsScreen(name="results")
+            self.sm.add_widget(self.results_screen)
+            # Crawls push rows from their threads; the view takes them in batches every tick
+            self.results_feed = ResultFeed()
+            Clock.schedule_interval(self.drain_results, PROGRESS_TICK)
+        return self.results_screen
     
     def check_credentials(self):
         if os.path.exists("credentials.txt"):
@@ -122,12 +246,9 @@ class ISMISCrawler(MDApp):
 
                     self.show_dialog("Auto Login", "Logging you in automatically...", auto_dismiss=False)
 
-                    import threading
                     threading.Thread(target=self._run_ismis_and_continue).start()
                     return
 
-        self.sm.current = "login"
-
             
     def on_login(self):
         username = self.login_screen.ids.username.text.strip()
@@ -149,21 +270,146 @@ class ISMISCrawler(MDApp):
 
         self.show_dialog("Logging in...", "Please wait while we log you into ISMIS.", auto_dismiss=False)
 
-        import threading
         threading.Thread(target=self._run_ismis_and_continue).start()
 
     def goto_home(self, *args):
+        self.ensure_home_screen()
         self.sm.current = "home"
 
+    def on_crawl_grades(self):
+        self.show_results("grades")
+
+    def show_results(self, kind):
+        self.ensure_results_screen()
+        generation = self.results_feed.start(f"Loading {kind}...")
+        threading.Thread(target=self._stream_results, args=(kind, generation), daemon=True).start()
+        self.sm.current = "results"
+
+    def _stream_results(self, kind, generation):
+        from ismisGrades import GradeStore, grade_store_path
+        from ismisJobs import AUTO_ENROLL_COURSES
+        from ismisResults import stream_grades, stream_schedules, stream_catalog
+        from ismisSession import cached_login
+
+        feed = self.results_feed
+        try:
+            if self.session is None:
+                self.session = cached_login(self.username, self.password)
+            if self.session is None:
+                raise Exception("Wrong username/password. Please log in again.")
+            if not feed.is_current(generation):
+                return  # Another view was opened while logging in
+            if kind == "grades":
+                store = GradeStore(grade_store_path(self.username or "default"))
+                stream_grades(feed, generation, self.session, store)
+            elif kind == "schedules":
+                stream_schedules(feed, generation, self.session, AUTO_ENROLL_COURSES)
+            else:
+                stream_catalog(feed, generation, self.session)
+        except Exception as e:
+            feed.put(generation, [], f"Could not load {kind} ({e}).")
+
+    def drain_results(self, dt):
+        reset, rows, status = self.results_feed.drain()
+        view = self.results_screen.ids.results
+        if reset:
+            view.data = []
+        if rows:
+            view.data.extend(rows)
+        if status is not None:
+            self.results_screen.ids.status.text = status
+
+    def get_job_runner(self):
+        from ismisJobs import JobRunner
+        from ismisSession import cached_login
+
+        # One worker and one ISMIS session for every background job, however long it runs
+        if self.runner is None:
+            self.runner = JobRunner(
+                lambda: self.session or cached_login(self.username, self.password),
+                credentials=(self.username, self.password),
+                post=lambda callback, *args: Clock.schedule_once(lambda dt: callback(*args), 0),
+                on_progress=self.on_job_progress,
+                on_status=self.on_job_status,
+            )
+        return self.runner
+
+    def on_auto_enroll(self):
+        from ismisJobs import queue_auto_enroll
+
+        runner = self.get_job_runner()
+        if not runner.busy:
+            queue_auto_enroll(runner)
+        elif runner.paused.is_set():
+            runner.resume()
+        else:
+            runner.pause()
+        self.update_enroll_buttons()
+
+    def on_cancel_auto_enroll(self):
+        if self.runner is not None:
+            self.runner.cancel()
+        self.update_enroll_buttons()
+
+    def on_job_progress(self, job, message):
+        # Called on the worker thread
+        self.progress.post(f"Auto Enroll: {job.name}", message, auto_dismiss=True, append=True)
+
+    def on_job_status(self, job):
+        self.update_enroll_buttons()
+
+    def update_enroll_buttons(self):
+        runner = self.runner
+        busy = runner is not None and runner.busy
+        if not busy:
+            text = "Run"
+        elif runner.paused.is_set():
+            text = "Resume"
+        else:
+            text = "Pause"
+        self.home_screen.ids.enroll_text.text = text
+        self.home_screen.ids.enroll_cancel.disabled = not busy
+
+    def on_stop(self):
+        if self.runner is not None:
+            self.runner.cancel()
+        if self.browser is not None:
+            self.browser.quit()
+            self.browser = None
+
+    def drain_progress(self, dt):
+        update = self.progress.drain()
+        if update is None:
+            return
+        if update.dismiss:
+            if self.dialog:
+                self.dialog.dismiss()
+        else:
+            self.show_dialog(update.title, update.text, auto_dismiss=update.auto_dismiss)
+
     def show_dialog(self, title, text, on_dismiss=None, auto_dismiss=False):
+        from kivymd.uix.dialog import MDDialog, MDDialogHeadlineText, MDDialogSupportingText
+
+        # A plain open dialog is updated in place instead of being rebuilt
+        if self.dialog and self.dialog_reusable and not on_dismiss:
+            self.dialog_title.text = title
+            self.dialog_text.text = text
+            self.dialog.auto_dismiss = auto_dismiss
+            return
+
         if self.dialog:
             self.dialog.dismiss()
 
+        self.dialog_title = MDDialogHeadlineText(text=title)
+        self.dialog_text = MDDialogSupportingText(text=text)
         self.dialog = MDDialog(
-        MDDialogHeadlineText(text=title),
-        MDDialogSupportingText(text=text),
+        self.dialog_title,
+        self.dialog_text,
         auto_dismiss=auto_dismiss,
         )
+        self.dialog_reusable = not on_dismiss
+        dialog = self.dialog
+        self.dialog.bind(on_dismiss=lambda x: self.forget_dialog(dialog))
 
         if on_dismiss:
             self.dialog.bind(on_dismiss=lambda x: on_dismiss())
@@ -174,6 +420,10 @@ class ISMISCrawler(MDApp):
             Clock.schedule_once(lambda dt: self.dialog.dismiss(), 1)
             Clock.schedule_once(lambda dt: on_dismiss(), 1.1) 
         
+    def forget_dialog(self, dialog):
+        if self.dialog is dialog:
+            self.dialog = None
+
     def on_logout(self):
         if self.dialog:
             self.dialog.dismiss()
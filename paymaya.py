@@ -1,21 +1,21 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 
-# Path to your ChromeDriver
-service = Service('./chromedriver.exe')
-options = webdriver.ChromeOptions()
-# options.add_argument("--headless")  # Optional: Run in headless mode
+from ismisDriver import LazyDriver
+from ismisSession import BASE_URL
 
-# Start WebDriver
-driver = webdriver.Chrome(service=service, options=options)
+# Configurations
+REDIRECT_LINKS_FILE = "redirect_links.txt"
+browser = LazyDriver()  # Chrome is only launched the first time a function uses the browser
 
-try:
+
+# Functions
+def fill_payment_form(driver):
+    """Opens the Paymaya page and submits the payment form."""
     # Open the target URL
-    driver.get("https://ismis.usc.edu.ph/Paymaya")
+    driver.get(f"{BASE_URL}/Paymaya")
 
     # Wait for the form to load
     WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.NAME, "__RequestVerificationToken")))
@@ -34,6 +34,9 @@ try:
     # Submit the form
     driver.find_element(By.CSS_SELECTOR, "button.btn").click()
 
+
+def read_redirect_links(driver):
+    """Returns (href link, meta redirect URL, final redirected URL) of the page after the form was submitted."""
     # Wait for the next page to load
     time.sleep(5)  # Adjust based on network speed
 
@@ -52,21 +55,32 @@ try:
 
     # Wait for the final redirection and capture the redirected URL
     WebDriverWait(driver, 10).until(lambda d: "payments.maya.ph" in d.current_url)
-    final_redirected_url = driver.current_url
+    return href_link, meta_url, driver.current_url
 
-    # Print the URLs
+
+def save_redirect_links(href_link, meta_url, final_redirected_url, path=REDIRECT_LINKS_FILE):
+    """Prints the links and saves them to a file."""
     print("Href link (if present):", href_link)
     print("Meta redirect URL (if present):", meta_url)
     print("Final redirected URL:", final_redirected_url)
 
-    # Save the links to a file
-    with open("redirect_links.txt", "w") as file:
+    with open(path, "w") as file:
         file.write(f"Href link: {href_link}\n")
         file.write(f"Meta Redirect URL: {meta_url}\n")
         file.write(f"Final Redirected URL: {final_redirected_url}\n")
 
-except Exception as e:
-    print("An error occurred:", str(e))
-finally:
-    # Close the browser
-    driver.quit()
+
+def main(driver=browser):
+    """Submits the Paymaya form and records where ISMIS redirects to."""
+    try:
+        fill_payment_form(driver)
+        save_redirect_links(*read_redirect_links(driver))
+    except Exception as e:
+        print("An error occurred:", str(e))
+    finally:
+        # Close the browser
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()